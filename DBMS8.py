@@ -1,6 +1,4 @@
-import sqlparse
-
-from sqlparse.sql import IdentifierList, Identifier, Parenthesis
+from sqlparse.engine import FilterStack, grouping
 
 from sqlparse.tokens import Keyword, DML, Whitespace, Literal, Punctuation, Name, Operator
 
@@ -10,1145 +8,5535 @@ from sorting_techniques import pysort
 
 from BTrees.OOBTree import OOBTree
 
+from BTrees.LOBTree import LOBTree
 
-class RDBMS:
+from array import array
 
-    def __init__(self):
+from bisect import bisect_left, bisect_right, insort
 
-        self.tables = {}
+from collections import Counter, OrderedDict
 
-        self.relationships = {}
+from contextlib import contextmanager, redirect_stdout
 
-        # Additional structures for indexing, query optimization, etc.
+from itertools import accumulate, chain, compress, count, dropwhile, islice, repeat, takewhile
 
-    def parse_sql(self, sql_query):
+import csv
 
-        parsed_statement = sqlparse.parse(sql_query)
+import gc
 
-        self.execute(parsed_statement)
+import io
 
-    def execute(self, parsed_statements):
+import json
 
-        # Parse the SQL query
+import math
 
-        # Handle each parsed statement
+import mmap
 
-        start_time = time.perf_counter()
+import operator
 
+import os
 
-        for statement in parsed_statements:
+import random
 
-            # Tokenize the statement to extract the command type
+import struct
 
-            tokens = statement.tokens
+import sys
 
-            first_token = tokens[0]
+import threading
 
-            if first_token.ttype is Keyword.DML:
+import tracemalloc
 
-                # Handle DML commands (INSERT, SELECT)
+import zlib
 
-                if statement.get_type() == 'INSERT':
 
-                    self.extract_insert_data(statement)
+# Comparison operators shared by the condition evaluators and the columnar scans
 
+COMPARISONS = {
 
+    "=": operator.eq,
 
-                elif statement.get_type() == 'SELECT':
+    "<": operator.lt,
 
-                    # print("Calling Select properly!")
+    ">": operator.gt,
 
-                    self.extract_select_data(statement)
+    "<=": operator.le,
 
+    ">=": operator.ge,
 
+    "!=": operator.ne
 
-                elif statement.get_type() == 'DELETE':
+}
 
-                    self.extract_delete_data(statement)
 
+def parse_statements(sql_query, ungrouped=()):
+    # Same as sqlparse.parse, except that statements of the types in ungrouped are left as a flat token
+    # stream. FilterStack and grouping are sqlparse internals rather than its public API: this is checked
+    # against sqlparse 0.4.4, and a release that moves them needs only this function adjusted.
+    for statement in FilterStack().run(sql_query):
+        yield statement if statement.get_type() in ungrouped else grouping.group(statement)
 
 
-                elif statement.get_type() == 'UPDATE':
+class Bitmap:
 
-                    self.extract_update_data(statement)
+    # A set of row ids held as the bits of one Python int, the posting list of a bitmap index. Whole
+    # bitmaps are combined with &, | and ~ in a single operation each; iterating yields row ids in order.
 
+    __slots__ = ('bits',)
 
+    def __init__(self, row_ids=()):
+        row_ids = list(row_ids)
+        data = bytearray((max(row_ids) >> 3) + 1 if row_ids else 0)
+        for row_id in row_ids:
+            data[row_id >> 3] |= 1 << (row_id & 7)
+        self.bits = int.from_bytes(data, 'little')
 
+    @classmethod
+    def from_bits(cls, bits):
+        bitmap = cls()
+        bitmap.bits = bits
+        return bitmap
 
+    def append(self, row_id):
+        self.bits |= 1 << row_id
 
+    def extend(self, row_ids):
+        self.bits |= Bitmap(row_ids).bits
 
+    def discard(self, row_id):
+        self.bits &= ~(1 << row_id)
 
+    def __contains__(self, row_id):
+        return self.bits >> row_id & 1 == 1
 
+    def __len__(self):
+        return self.bits.bit_count()
 
+    def __iter__(self):
+        # Walk the binary digits least significant first, jumping from one set bit to the next
+        digits = bin(self.bits)[:1:-1]
+        row_id = digits.find('1')
+        while row_id >= 0:
+            yield row_id
+            row_id = digits.find('1', row_id + 1)
 
 
-            elif first_token.ttype is Keyword.DDL:
+class BitmapIndex(dict):
 
-                # Handle DDL commands (CREATE TABLE, DROP TABLE)
+    # A bitmap index maps each key to the Bitmap of the rows holding it. It suits columns with few
+    # distinct values, where ANDs and ORs of conditions become operations on whole bitmaps.
 
-                if statement.get_type() == 'CREATE':
+    pass
 
-                    self.create_manager(statement)
 
+def integer_key(key):
+    # The integer a one-element key stands for; an integral float such as 5.0 finds the key 5
+    value = key[0]
+    return int(value) if isinstance(value, float) and value.is_integer() else value
 
 
+class IntegerBTree(LOBTree):
 
+    # The B-tree of an index on a single Integer column. The C tree is keyed by the integers themselves,
+    # so a probe compares machine integers rather than one-element tuples of Python objects, but the
+    # index keeps the (value,) key interface of the other index types.
 
+    def get(self, key, default=None):
+        return LOBTree.get(self, integer_key(key), default)
 
+    def __getitem__(self, key):
+        return LOBTree.__getitem__(self, integer_key(key))
 
-                elif statement.get_type() == 'DROP':
+    def __setitem__(self, key, posting):
+        LOBTree.__setitem__(self, key[0], posting)
 
-                    self.drop_manager(statement)
+    def __delitem__(self, key):
+        LOBTree.__delitem__(self, integer_key(key))
 
+    def __contains__(self, key):
+        return LOBTree.__contains__(self, integer_key(key))
 
+    def __iter__(self):
+        return self.keys()
 
-            else:
+    def keys(self):
+        return ((key,) for key in LOBTree.keys(self))
 
-                print("Invalid SQL Argument")
+    def items(self, min=None, max=None, excludemin=False, excludemax=False):
+        low = None if min is None else integer_key(min)
+        high = None if max is None else integer_key(max)
+        return (((key,), posting) for key, posting in LOBTree.items(self, low, high, excludemin, excludemax))
 
-                return
+    def minKey(self):
+        return (LOBTree.minKey(self),)
 
-        end_time = time.perf_counter()
+    def maxKey(self):
+        return (LOBTree.maxKey(self),)
 
-        execution_time = end_time - start_time
 
-        print(f"The query: took {execution_time} seconds to execute.")
+# Index structures by USING name. All map key tuples to posting lists and share the mapping interface;
+# only a B-tree can walk a key range.
 
-    # Database Definition Language (DDL) Methods
+INDEX_TYPES = {
 
-    def create_manager(self, statement):
+    "btree": OOBTree,
 
-        # Determine whether it's a table or index creation
+    "hash": dict,
 
-        create_table = False
+    "bitmap": BitmapIndex
 
-        create_index = False
+}
 
-        for token in statement.tokens:
 
-            if token.ttype is Keyword.DDL and token.value.upper() == 'CREATE':
-                continue
+def new_index(using, key_types):
+    # An empty index structure; a B-tree on one Integer column is an IntegerBTree
+    if using == "btree" and [key_type.lower() for key_type in key_types] == ["integer"]:
+        return IntegerBTree()
+    return INDEX_TYPES[using]()
 
-            if token.ttype is Keyword and token.value.upper() == 'TABLE':
-                create_table = True
 
-                break
+def new_posting(index, row_ids=()):
+    # An empty or filled posting list of the kind the index holds: a Bitmap, or an array('q') of row ids
+    return Bitmap(row_ids) if isinstance(index, BitmapIndex) else array('q', row_ids)
 
-            if token.ttype is Keyword and token.value.upper() == 'INDEX':
-                create_index = True
 
-                break
+# The key range an index scan walks for each comparison: whether the low and the high end are inclusive,
+# with None for an open end. BETWEEN compares against a (low, high) pair.
 
-        if create_table:
+INDEX_RANGES = {
 
-            self.extract_create_table_data(statement)
+    "=": (True, True),
 
+    "<": (None, False),
 
+    "<=": (None, True),
 
+    ">": (False, None),
 
+    ">=": (True, None),
 
+    "BETWEEN": (True, True)
 
+}
 
-        elif create_index:
+# Aggregates a column can compute over its own storage (see ColumnStore.aggregate)
 
-            self.extract_create_index_data(statement)  # Pass the original statement
+AGGREGATES = {
 
-    def drop_manager(self, statement):
+    "sum": sum,
 
-        # Determine whether it's a table or index drop
+    "min": lambda values: min(values, default=None),
 
-        drop_table = False
+    "max": lambda values: max(values, default=None)
 
-        drop_index = False
+}
 
-        for token in statement.tokens:
+# Columnar Storage Engine
 
-            if token.ttype is Keyword.DDL and token.value.upper() == 'DROP':
-                continue
 
-            if token.ttype is Keyword and token.value.upper() == 'TABLE':
-                drop_table = True
+class ArrayColumn:
 
-                break
+    # A column kept in one contiguous typed buffer (array('q') for Integer, array('d') for Float)
 
-            if token.ttype is Keyword and token.value.upper() == 'INDEX':
-                drop_index = True
+    typecode = None
 
-                break
+    def __init__(self, values=()):
+        self.values = self.new_buffer(values)
 
-        if drop_table:
+    def new_buffer(self, values=()):
+        return array(self.typecode, values)
 
-            self.extract_drop_table_data(statement)
+    def append(self, value):
+        self.values.append(value)
 
+    def extend(self, values):
+        self.values.extend(values)
 
+    def __getitem__(self, row_id):
+        return self.values[row_id]
 
+    def __setitem__(self, row_id, value):
+        self.values[row_id] = value
 
+    def __len__(self):
+        return len(self.values)
 
+    def __iter__(self):
+        return iter(self.values)
 
+    def __contains__(self, value):
+        return value in self.values
 
-        elif drop_index:
+    def take(self, row_ids):
+        # Build a new column holding only the given rows, in order
+        values = self.values
+        return type(self)(values[i] for i in row_ids)
 
-            self.extract_drop_index_data(statement)  # Pass the original statement
+    def select(self, compare, value, row_ids):
+        # The row ids among row_ids whose value satisfies compare(row value, value)
+        values = self.values
+        return [row_id for row_id in row_ids if compare(values[row_id], value)]
 
-    def extract_create_table_data(self, statement):
+    def aggregate(self, function):
+        return AGGREGATES[function](self.values)
 
-        table_name = None
 
-        schema = {}
+class IntegerColumn(ArrayColumn):
 
-        create_found = False
+    typecode = 'q'
 
-        table_found = False
 
-        schema_next = False
+class FloatColumn(ArrayColumn):
 
-        column_names = []
+    typecode = 'd'
 
-        column_types = []
 
-        type_next = False
+class ObjectColumn(ArrayColumn):
 
-        column_next = False
+    # Fallback for column types the engine does not know how to pack
 
-        primary_found = False
+    def new_buffer(self, values=()):
+        return list(values)
 
-        primary_key_next = False
 
-        primary_key_found = False
+class StringColumn:
 
-        primary_key = None
+    # Strings kept as UTF-8 bytes in one buffer, located through start offsets and lengths.
+    # Updates append the new bytes at the end; take() rewrites the buffer without the dead bytes.
 
-        foreign_key_found = False
+    def __init__(self, values=()):
+        self.offsets = array('q')
 
-        foreign_table_next = False
+        self.lengths = array('q')
 
-        foreign_table_name = None
+        self.data = bytearray()
 
-        key_found = False
+        for value in values:
+            self.append(value)
 
-        current_table_reference = None
+    def append(self, value):
+        encoded = value.encode('utf-8')
+        self.offsets.append(len(self.data))
+        self.lengths.append(len(encoded))
+        self.data += encoded
 
-        foreign_column_found = False
+    def extend(self, values):
+        for value in values:
+            self.append(value)
 
-        foreign_reference_found = False
+    def __getitem__(self, row_id):
+        start = self.offsets[row_id]
+        return self.data[start:start + self.lengths[row_id]].decode('utf-8')
 
-        foreign_key = None
+    def __setitem__(self, row_id, value):
+        encoded = value.encode('utf-8')
+        if len(encoded) <= self.lengths[row_id]:
+            # Overwrite in place when the new value fits in the old slot
+            start = self.offsets[row_id]
+            self.data[start:start + len(encoded)] = encoded
+        else:
+            self.offsets[row_id] = len(self.data)
+            self.data += encoded
+        self.lengths[row_id] = len(encoded)
 
-        foreign_table_found = False
+    def __len__(self):
+        return len(self.offsets)
 
-        for token in statement.flatten():
+    def __iter__(self):
+        data = self.data
+        for start, length in zip(self.offsets, self.lengths):
+            yield data[start:start + length].decode('utf-8')
 
-            if token.ttype is Keyword.DDL and token.value.upper() == 'CREATE':
-                create_found = True
+    def __contains__(self, value):
+        return any(existing == value for existing in self)
 
-                continue
+    def take(self, row_ids):
+        return StringColumn(self[i] for i in row_ids)
 
-            if create_found and not schema_next and token.ttype is Keyword and token.value.upper() == 'TABLE':
-                table_found = True
+    def select(self, compare, value, row_ids):
+        return [row_id for row_id in row_ids if compare(self[row_id], value)]
 
-                continue
+    def aggregate(self, function):
+        return AGGREGATES[function](iter(self))
 
-            if not primary_found and token.ttype is not Punctuation and not token.is_whitespace and token.value.upper() == "PRIMARY":
-                primary_found = True
 
-                continue
+DICTIONARY_MAX_SIZE = 1024  # distinct strings a dictionary-encoded column takes before it stores plain strings
 
-            if foreign_key_found and not key_found and token.value.upper() == "KEY":
-                key_found = True
 
-                foreign_table_next = True
+class DictionaryColumn:
 
-                continue
+    # Strings stored as 2-byte codes into a per-column dictionary of the distinct values, so repeated
+    # values are kept once and predicates test each distinct value once instead of once per row.
+    # A column whose dictionary would grow past DICTIONARY_MAX_SIZE turns into a plain StringColumn.
 
-            if primary_found and token.value.upper() == "KEY":
-                primary_key_next = True
+    def __init__(self, values=()):
+        self.codes = array('H')
 
-                continue
+        self.dictionary = []
 
-            if not foreign_key_found and token.value.upper() == "FOREIGN":
-                foreign_key_found = True
+        self.lookup = {}
 
-                continue
+        for value in values:
+            self.append(value)
 
-            if foreign_key_found and foreign_table_next and token.ttype is not Punctuation and not token.is_whitespace:
-                current_table_reference = token.value
+    def encode(self, value):
+        # The code for value, added to the dictionary if needed; None once the dictionary is full
+        code = self.lookup.get(value)
+        if code is None:
+            if len(self.dictionary) >= DICTIONARY_MAX_SIZE:
+                return None
+            code = len(self.dictionary)
+            self.dictionary.append(value)
+            self.lookup[value] = code
+        return code
 
-                foreign_column_found = True
+    def fall_back(self):
+        values = list(self)
+        self.__dict__.clear()
+        self.__class__ = StringColumn
+        StringColumn.__init__(self, values)
 
-                foreign_table_next = False
+    def append(self, value):
+        code = self.encode(value)
+        if code is None:
+            self.fall_back()
+            self.append(value)
+        else:
+            self.codes.append(code)
 
-                continue
+    def extend(self, values):
+        for value in values:
+            self.append(value)
 
-            if foreign_column_found and token.value.upper() == "REFERENCES":
-                foreign_reference_found = True
+    def __getitem__(self, row_id):
+        return self.dictionary[self.codes[row_id]]
 
-                continue
+    def __setitem__(self, row_id, value):
+        code = self.encode(value)
+        if code is None:
+            self.fall_back()
+            self[row_id] = value
+        else:
+            self.codes[row_id] = code
 
-            if foreign_column_found and not foreign_table_found and foreign_reference_found and token.ttype is not Punctuation and not token.is_whitespace:
-                foreign_table_name = token.value
+    def __len__(self):
+        return len(self.codes)
 
-                foreign_table_found = True
+    def __iter__(self):
+        return map(self.dictionary.__getitem__, self.codes)
 
-                continue
+    def __contains__(self, value):
+        code = self.lookup.get(value)
+        return code is not None and code in self.codes
 
-            if foreign_table_found and token.ttype is not Punctuation and not token.is_whitespace:
-                reference_column = token.value
+    def take(self, row_ids):
+        # Re-encoding also drops dictionary entries no remaining row uses
+        return DictionaryColumn(self[i] for i in row_ids)
 
-                continue
+    def select(self, compare, value, row_ids):
+        # Evaluate the predicate once per distinct string, then filter the rows by code
+        matches = [compare(entry, value) for entry in self.dictionary]
+        if not any(matches):
+            return []
+        codes = self.codes
+        return [row_id for row_id in row_ids if matches[codes[row_id]]]
 
-            if not primary_key_found and primary_key_next and token.ttype is not Punctuation and not token.is_whitespace:
-                primary_key_next = False
+    def aggregate(self, function):
+        # Only the distinct strings still in use take part
+        return AGGREGATES[function](self.dictionary[code] for code in set(self.codes))
 
-                primary_key = token.value
 
-                primary_key_found = True
+# Compressed Integer Segments
 
-            if table_found and not schema_next and not token.is_whitespace and token.ttype is not Punctuation:
+SEGMENT_ROWS = 1024  # rows per integer column segment
 
-                if table_name is None:
-                    table_name = token.value
+DELTA_CHECKPOINT = 128  # a delta segment keeps every 128th value in full so lookups add at most 127 deltas
 
-                    schema_next = True
 
-                    continue
+def narrowest_typecode(low, high, signed=True):
+    # The smallest array typecode that holds every integer in [low, high]
+    for typecode in ('b', 'h', 'i', 'q') if signed else ('B', 'H', 'I', 'Q'):
+        bits = array(typecode).itemsize * 8
+        if signed and -(1 << (bits - 1)) <= low and high < 1 << (bits - 1):
+            return typecode
+        if not signed and 0 <= low and high < 1 << bits:
+            return typecode
+    return None
 
-            if schema_next and token.ttype is not Whitespace and token.ttype is not Punctuation:
 
-                # Parsing column definitions for the schema
+class PlainSegment:
 
-                if not type_next and token.ttype is not Punctuation and not token.is_whitespace:
+    # Values kept as they are, in an array('q')
 
-                    column_name = token.value
+    def __init__(self, values):
+        self.values = values
 
-                    column_names.append(column_name)
+    def __len__(self):
+        return len(self.values)
 
-                    type_next = True
+    def __getitem__(self, offset):
+        return self.values[offset]
 
-                    continue
+    def __setitem__(self, offset, value):
+        self.values[offset] = value
 
+    def __iter__(self):
+        return iter(self.values)
 
+    def __contains__(self, value):
+        return value in self.values
 
-                elif token.ttype is Name.Builtin:
+    def aggregate(self, function):
+        return AGGREGATES[function](self.values)
 
-                    column_type = token.value
+    def select(self, compare, value):
+        return [offset for offset, row_value in enumerate(self.values) if compare(row_value, value)]
 
-                    column_types.append(column_type)
 
-                    type_next = False
+class RunLengthSegment:
 
-                    continue
+    # Runs of repeated values: values[k] fills the rows up to (not including) run_ends[k]
 
-        schema = {name: type for name, type in zip(column_names, column_types)}
+    def __init__(self, values, run_ends):
+        self.values = values
 
-        # print(schema)
+        self.run_ends = run_ends
 
-        # Once table name and schema are extracted, create the table
+    def __len__(self):
+        return self.run_ends[-1]
 
-        if table_name and schema:
+    def __getitem__(self, offset):
+        if not 0 <= offset < self.run_ends[-1]:
+            raise IndexError("segment offset out of range")
+        return self.values[bisect_right(self.run_ends, offset)]
 
-            self.create_table(table_name, schema)
+    def runs(self):
+        # (value, start, end) for every run
+        return zip(self.values, chain((0,), self.run_ends), self.run_ends)
 
+    def __iter__(self):
+        for value, start, end in self.runs():
+            yield from repeat(value, end - start)
 
+    def __contains__(self, value):
+        return value in self.values
 
-        else:
+    def aggregate(self, function):
+        if function == "sum":
+            # value x run length, once per run
+            return sum(value * (end - start) for value, start, end in self.runs())
+        return AGGREGATES[function](self.values)
 
-            print("Error creating table")
+    def select(self, compare, value):
+        offsets = []
+        for run_value, start, end in self.runs():
+            if compare(run_value, value):
+                offsets.extend(range(start, end))
+        return offsets
 
-        if primary_key_found:
-            self.create_index(primary_key, table_name, primary_key)
 
-        if foreign_key_found:
-            self.create_foreign_key(table_name, current_table_reference, foreign_table_name, reference_column)
+class DeltaSegment:
 
-    def create_foreign_key(self, table_name, curr_table_column, foreign_table, foreign_column):
+    # Each value stored as its difference from the previous one, in the narrowest signed type that
+    # fits, with a full value every DELTA_CHECKPOINT rows. Ascending runs such as generated keys
+    # compress to one byte per row and are searched by bisection.
 
-        # Check if both tables exist
+    def __init__(self, checkpoints, deltas, ascending):
+        self.checkpoints = checkpoints
 
-        if table_name not in self.tables:
-            raise Exception(f"Table {table_name} does not exist.")
+        self.deltas = deltas
 
-        if foreign_table not in self.tables:
-            raise Exception(f"Referenced table {foreign_table} does not exist.")
+        self.ascending = ascending
 
-        # Check if the foreign key column exists in the current table
+    def __len__(self):
+        return len(self.deltas)
 
-        if curr_table_column not in self.tables[table_name]["columns"]:
-            raise Exception(f"Column {curr_table_column} does not exist in table {table_name}.")
+    def __getitem__(self, offset):
+        if not 0 <= offset < len(self.deltas):
+            raise IndexError("segment offset out of range")
+        checkpoint = offset - offset % DELTA_CHECKPOINT
+        return self.checkpoints[offset // DELTA_CHECKPOINT] + sum(self.deltas[checkpoint + 1:offset + 1])
 
-        # Check if the referenced column exists in the foreign table
+    def __iter__(self):
+        return accumulate(islice(self.deltas, 1, None), initial=self.checkpoints[0])
 
-        if foreign_column not in self.tables[foreign_table]["columns"]:
-            raise Exception(f"Referenced column {foreign_column} does not exist in table {foreign_table}.")
+    def __contains__(self, value):
+        if not isinstance(value, (int, float)):
+            return False
+        if self.ascending:
+            offset = bisect_left(self, value)
+            return offset < len(self) and self[offset] == value
+        return value in iter(self)
+
+    def aggregate(self, function):
+        if self.ascending and function == "min":
+            return self.checkpoints[0]
+        if self.ascending and function == "max":
+            return self[len(self) - 1]
+        return AGGREGATES[function](iter(self))
+
+    def select(self, compare, value):
+        if not self.ascending:
+            return [offset for offset, row_value in enumerate(self) if compare(row_value, value)]
+        # Sorted values: every comparison matches one or two contiguous ranges
+        low, high, end = bisect_left(self, value), bisect_right(self, value), len(self)
+        if compare is operator.eq:
+            return range(low, high)
+        if compare is operator.lt:
+            return range(0, low)
+        if compare is operator.le:
+            return range(0, high)
+        if compare is operator.gt:
+            return range(high, end)
+        if compare is operator.ge:
+            return range(low, end)
+        return [offset for offset, row_value in enumerate(self) if compare(row_value, value)]
+
+
+class FrameOfReferenceSegment:
+
+    # Values stored as unsigned offsets from the segment minimum, in the narrowest type that fits
+
+    def __init__(self, base, offsets):
+        self.base = base
+
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __getitem__(self, offset):
+        return self.base + self.offsets[offset]
+
+    def __iter__(self):
+        return map(self.base.__add__, self.offsets)
+
+    def __contains__(self, value):
+        return isinstance(value, (int, float)) and 0 <= value - self.base and value - self.base in self.offsets
+
+    def aggregate(self, function):
+        if function == "sum":
+            return self.base * len(self.offsets) + sum(self.offsets)
+        return self.base + AGGREGATES[function](self.offsets)
+
+    def select(self, compare, value):
+        # Compare in offset space so the stored values are never rebuilt
+        target = value - self.base
+        return [offset for offset, row_offset in enumerate(self.offsets) if compare(row_offset, target)]
+
+
+def encode_segment(values):
+    # Seal a full segment with whichever encoding is smallest for its values
+    count = len(values)
+    low, high = min(values), max(values)
+    # Deltas are Python ints: two int64 values can be further apart than an int64 holds, and then the
+    # segment is not delta encoded
+    deltas = [0]
+    deltas.extend(map(operator.sub, islice(values, 1, None), values))
+    runs = 1 + count - deltas.count(0)
+    reference_typecode = narrowest_typecode(0, high - low, signed=False)
+    delta_typecode = narrowest_typecode(min(deltas), max(deltas))
+    sizes = {"plain": count * 8, "run_length": runs * 16}
+    if reference_typecode is not None:
+        sizes["frame_of_reference"] = count * array(reference_typecode).itemsize + 8
+    if delta_typecode is not None:
+        sizes["delta"] = count * array(delta_typecode).itemsize + (count // DELTA_CHECKPOINT + 1) * 8
+    encoding = min(sizes, key=sizes.get)
+    if encoding == "run_length":
+        run_values, run_ends = array('q'), array('q')
+        for offset, value in enumerate(values):
+            if offset and value == run_values[-1]:
+                run_ends[-1] = offset + 1
+            else:
+                run_values.append(value)
+                run_ends.append(offset + 1)
+        return RunLengthSegment(run_values, run_ends)
+    if encoding == "frame_of_reference":
+        return FrameOfReferenceSegment(low, array(reference_typecode, (value - low for value in values)))
+    if encoding == "delta":
+        return DeltaSegment(values[::DELTA_CHECKPOINT], array(delta_typecode, deltas), min(deltas[1:], default=0) >= 0)
+    return PlainSegment(values)
+
+
+class SegmentedIntegerColumn:
+
+    # Integer column split into segments of SEGMENT_ROWS rows. Appends go to a plain array('q') tail;
+    # a full tail is sealed with run-length, delta or frame-of-reference encoding, whichever is
+    # smallest. Sums, minimums, maximums and comparisons run segment by segment on the encoded form.
+    # Writing into an encoded segment turns it back into a plain one.
+
+    typecode = 'q'
+
+    def __init__(self, values=()):
+        self.segments = []
+
+        self.tail = array('q')
+
+        for value in values:
+            self.append(value)
+
+    def append(self, value):
+        tail = self.tail
+        tail.append(value)
+        if len(tail) == SEGMENT_ROWS:
+            self.segments.append(encode_segment(tail))
+            self.tail = array('q')
+
+    def extend(self, values):
+        # Fill the tail a slice at a time, sealing each segment as it fills up
+        start = 0
+        while start < len(values):
+            room = SEGMENT_ROWS - len(self.tail)
+            self.tail.extend(values[start:start + room])
+            start += room
+            if len(self.tail) == SEGMENT_ROWS:
+                self.segments.append(encode_segment(self.tail))
+                self.tail = array('q')
+
+    def __getitem__(self, row_id):
+        if row_id < 0:
+            row_id += len(self)
+        segment_index, offset = divmod(row_id, SEGMENT_ROWS)
+        if segment_index < len(self.segments):
+            return self.segments[segment_index][offset]
+        if segment_index > len(self.segments):
+            raise IndexError("row id out of range")
+        return self.tail[offset]
+
+    def __setitem__(self, row_id, value):
+        segment_index, offset = divmod(row_id, SEGMENT_ROWS)
+        if segment_index < len(self.segments):
+            segment = self.segments[segment_index]
+            if not isinstance(segment, PlainSegment):
+                segment = self.segments[segment_index] = PlainSegment(array('q', segment))
+            segment[offset] = value
+        elif segment_index == len(self.segments):
+            self.tail[offset] = value
+        else:
+            raise IndexError("row id out of range")
 
-        # Add foreign key information to the current table's schema
+    def __len__(self):
+        return len(self.segments) * SEGMENT_ROWS + len(self.tail)
 
-        self.tables[table_name]["foreign_keys"][curr_table_column] = (foreign_table, foreign_column)
+    def __iter__(self):
+        return chain(chain.from_iterable(self.segments), self.tail)
 
-        print(f"Foreign key added to {table_name}: {curr_table_column} references {foreign_table}({foreign_column})")
+    def __contains__(self, value):
+        return any(value in segment for segment in self.segments) or value in self.tail
 
-    def create_table(self, table_name, schema, primary_key=None, foreign_keys=None):
+    def take(self, row_ids):
+        return SegmentedIntegerColumn(self[i] for i in row_ids)
 
-        if table_name in self.tables:
+    def aggregate(self, function):
+        parts = [segment.aggregate(function) for segment in self.segments]
+        if self.tail:
+            parts.append(AGGREGATES[function](self.tail))
+        return AGGREGATES[function](parts)
 
-            raise Exception(f"Table {table_name} already exists.")
+    def select(self, compare, value, row_ids):
+        if not (isinstance(row_ids, range) and row_ids.start == 0 and row_ids.step == 1 and row_ids.stop == len(self)):
+            return [row_id for row_id in row_ids if compare(self[row_id], value)]
+        # A full scan asks each segment for its matching offsets
+        row_ids = []
+        for segment_index, segment in enumerate(self.segments + [PlainSegment(self.tail)]):
+            start = segment_index * SEGMENT_ROWS
+            row_ids.extend(map(start.__add__, segment.select(compare, value)))
+        return row_ids
 
-        else:
 
-            self.tables[table_name] = {
+COLUMN_TYPES = {
 
-                "columns": schema,
+    "integer": SegmentedIntegerColumn,
 
-                "data": [],
+    "float": FloatColumn,
 
-                "primary_key": primary_key if primary_key else [],
+    "string": DictionaryColumn
 
-                "foreign_keys": foreign_keys if foreign_keys else {}  # Initialize as empty dict if not provided
+}
 
-            }
 
-        print(f"Table {table_name} created with schema {schema}")
+def make_column(column_type):
+    return COLUMN_TYPES.get(column_type.lower(), ObjectColumn)()
 
-    def extract_drop_table_data(self, statement):
 
-        table_name = None
+class RowView:
 
-        drop_found = False
+    # Thin dict-like view of one row of a ColumnStore, so row-at-a-time code paths keep working.
+    # Column names are resolved to positions through the table catalog.
 
-        table_found = False
+    __slots__ = ('store', 'row_id')
 
-        for token in statement.flatten():
+    def __init__(self, store, row_id):
+        self.store = store
+        self.row_id = row_id
 
-            if token.ttype is Keyword.DDL and token.value.upper() == 'DROP':
-                drop_found = True
+    def __getitem__(self, column):
+        return self.store.value(self.row_id, self.store.catalog[column])
 
-                continue
+    def __setitem__(self, column, value):
+        self.store.set_value(self.row_id, self.store.catalog[column], value)
 
-            if drop_found and token.ttype is Keyword and token.value.upper() == 'TABLE':
-                table_found = True
+    def __contains__(self, column):
+        return column in self.store.catalog
 
-                continue
+    def __iter__(self):
+        return iter(self.store.catalog)
 
-            if table_found and not token.is_whitespace and token.ttype is not Punctuation:
+    def get(self, column, default=None):
+        position = self.store.catalog.get(column)
+        if position is None:
+            return default
+        return self.store.value(self.row_id, position)
 
-                if table_name is None:
-                    table_name = token.value
+    def keys(self):
+        return self.store.catalog.keys()
 
-                    # print("WE HAVE FOUND THE TABLE NAME AND IT IS  :  ", table_name)
+    def values(self):
+        return self.store.row(self.row_id)
 
-                    continue
+    def items(self):
+        return list(zip(self.store.catalog, self.store.row(self.row_id)))
 
-        if table_name:
+    def to_dict(self):
+        return dict(self.items())
 
-            self.drop_table(table_name)
+    def __repr__(self):
+        return repr(self.to_dict())
 
 
+class Tombstones:
 
-        else:
+    # Bitmap of deleted row ids. Deleting a row only sets its bit, so the row ids of the rows around it
+    # (and the row ids stored in the indexes) stay valid until the table is compacted.
 
-            print("Error dropping table")
+    def __init__(self, bits=b''):
+        self.bits = bytearray(bits)
 
-    def drop_table(self, table_name):
+        self.count = int.from_bytes(self.bits, 'little').bit_count()
 
-        # Check if the table exists
+    def __contains__(self, row_id):
+        byte = row_id >> 3
+        return byte < len(self.bits) and self.bits[byte] >> (row_id & 7) & 1 == 1
 
-        if table_name in self.tables:
+    def add(self, row_id):
+        # Returns False when the row was already deleted
+        byte = row_id >> 3
+        if byte >= len(self.bits):
+            self.bits.extend(bytes(byte + 1 - len(self.bits)))
+        mask = 1 << (row_id & 7)
+        if self.bits[byte] & mask:
+            return False
+        self.bits[byte] |= mask
+        self.count += 1
+        return True
 
-            # Remove the table from the dictionary
+    def live(self, row_count):
+        # Row ids below row_count that are not deleted
+        if not self.count:
+            return range(row_count)
+        return [row_id for row_id in range(row_count) if row_id not in self]
 
-            del self.tables[table_name]
+    def remap(self, row_count):
+        # New row id of every row once the deleted ones are squeezed out, -1 for deleted rows
+        mapping = array('q', [-1]) * row_count
+        for new_row_id, row_id in enumerate(self.live(row_count)):
+            mapping[row_id] = new_row_id
+        return mapping
 
-            print(f"Table {table_name} has been dropped.")
 
-        else:
+# Zone Maps
 
-            # If the table does not exist, print an error message
+ZONE_ROWS = 1024  # consecutive row ids per zone map block
 
-            print(f"Table {table_name} does not exist and cannot be dropped.")
+# Whether a block whose values lie in [low, high] can hold a value satisfying each comparison.
+# != is left out: it rules out a block only when every value in it is equal, and NaN never equals itself.
 
-    # Indexing Methods
+ZONE_CHECKS = {
 
-    def extract_create_index_data(self, statement):
+    operator.eq: lambda low, high, value: low <= value <= high,
 
-        index_name = None
+    operator.lt: lambda low, high, value: low < value,
 
-        index_found = False
+    operator.le: lambda low, high, value: low <= value,
 
-        index_name_found = False
+    operator.gt: lambda low, high, value: high > value,
 
-        column_next = False
+    operator.ge: lambda low, high, value: high >= value
 
-        table_name = None
+}
 
-        columns = []
 
-        create_index_found = False
+class ZoneMap:
 
-        on_found = False
+    # Minimum and maximum of one column over every block of ZONE_ROWS row ids, so a full scan can skip the
+    # blocks whose range cannot satisfy its comparison. Bounds only widen: updated values are added to
+    # their block and deleted rows keep theirs until compaction rebuilds the map, so a block's range
+    # always holds its live values. A block whose values do not order against each other has None bounds
+    # and is always scanned. Nothing in a column is ever NULL, so there is no null count to keep.
 
-        for token in statement.flatten():
+    def __init__(self, values=()):
+        self.lows = []
+        self.highs = []
+        self.extend(0, values)
 
-            if create_index_found and token.ttype is Name and index_name is None:
-                index_name = token.value
+    def __len__(self):
+        return len(self.lows)
 
-                continue
+    def widen(self, block, low, high):
+        if low != low or high != high:
+            # NaN compares false against everything, so it cannot bound a block
+            low = high = None
+        if block == len(self.lows):
+            self.lows.append(low)
+            self.highs.append(high)
+            return
+        if self.lows[block] is None:
+            return
+        if low is None:
+            self.lows[block] = self.highs[block] = None
+            return
+        try:
+            if low < self.lows[block]:
+                self.lows[block] = low
+            if high > self.highs[block]:
+                self.highs[block] = high
+        except TypeError:
+            self.lows[block] = self.highs[block] = None
+
+    def add(self, row_id, value):
+        self.widen(row_id // ZONE_ROWS, value, value)
+
+    def extend(self, row_id, values):
+        # Add the values of consecutive rows starting at row_id, a block at a time
+        values = iter(values)
+        while True:
+            chunk = list(islice(values, ZONE_ROWS - row_id % ZONE_ROWS))
+            if not chunk:
+                return
+            try:
+                low, high = min(chunk), max(chunk)
+            except TypeError:
+                low = high = None
+            self.widen(row_id // ZONE_ROWS, low, high)
+            row_id += len(chunk)
+
+    def blocks(self, compare, value):
+        # Indexes of the blocks that may hold a value satisfying compare(row value, value)
+        check = ZONE_CHECKS.get(compare)
+        if check is None:
+            return range(len(self.lows))
+        blocks = []
+        for block, (low, high) in enumerate(zip(self.lows, self.highs)):
+            try:
+                if low is None or check(low, high, value):
+                    blocks.append(block)
+            except TypeError:
+                blocks.append(block)
+        return blocks
+
+
+# Column Statistics
+
+STATISTICS_EXACT_DISTINCT = 4096  # distinct values a column's statistics count exactly, at least, before switching to HyperLogLog
+
+HYPERLOGLOG_BITS = 14  # a HyperLogLog sketch has 2 ** 14 one-byte registers, about 0.8% standard error
+
+HYPERLOGLOG_MASK = (1 << 64) - 1
+
+
+def hyperloglog_hash(value):
+    # Spread Python's hash over 64 bits; equal values, 1 and 1.0 included, hash alike as they do in a set
+    hashed = (hash(value) * 0x9E3779B97F4A7C15) & HYPERLOGLOG_MASK
+    hashed ^= hashed >> 32
+    return (hashed * 0xBF58476D1CE4E5B9) & HYPERLOGLOG_MASK
+
+
+class ColumnStatistics:
+
+    # Distinct count, minimum and maximum of one column's values, kept current as rows change so the
+    # optimizer reads them in constant time. Up to STATISTICS_EXACT_DISTINCT distinct values each value's
+    # row count is kept, which deletes and updates can take back exactly. Past that the distinct count is
+    # a HyperLogLog estimate that only grows; it is capped at the live row count, and compaction rebuilds it.
+    # The values a column is seeded with are counted exactly however many distinct ones there are, in one
+    # C-level pass, so the first estimate on a column costs about what a set of its values would. Counting
+    # then stays exact until the distinct values have doubled, which spreads the cost of folding the counts
+    # into a sketch over the additions that led up to it.
+    # The bounds only widen and are None once the values do not order against each other.
+
+    def __init__(self, values=()):
+        self.counts = Counter()
+        self.registers = None
+        self.harmonic_sum = 0.0
+        self.zero_registers = 0
+        self.ordered = True
+        self.low = self.high = None
+        self.update(values)
+        self.exact_limit = max(STATISTICS_EXACT_DISTINCT, 2 * len(self.counts))
+
+    def add(self, value):
+        self.extend((value,))
+
+    def extend(self, values):
+        self.update(values)
+        if self.counts is not None and len(self.counts) > self.exact_limit:
+            self.registers = bytearray(1 << HYPERLOGLOG_BITS)
+            self.harmonic_sum = float(len(self.registers))
+            self.zero_registers = len(self.registers)
+            self.sketch(self.counts)
+            self.counts = None
+
+    def update(self, values):
+        if not isinstance(values, (list, array)):
+            values = list(values)
+        if not values:
+            return
+        if self.ordered:
+            try:
+                low, high = min(values), max(values)
+                if low != low or high != high:
+                    raise TypeError("NaN does not order")
+                if self.low is None or low < self.low:
+                    self.low = low
+                if self.high is None or high > self.high:
+                    self.high = high
+            except TypeError:
+                self.ordered = False
+                self.low = self.high = None
+        if self.registers is not None:
+            self.sketch(values)
+        else:
+            self.counts.update(values)
+
+    def sketch(self, values):
+        # Add values to the HyperLogLog registers, keeping the sum of 2 ** -register and the number of
+        # empty registers the estimate needs
+        registers = self.registers
+        rank_bits = 64 - HYPERLOGLOG_BITS
+        rank_mask = (1 << rank_bits) - 1
+        for value in values:
+            hashed = hyperloglog_hash(value)
+            register = hashed >> rank_bits
+            rank = rank_bits + 1 - (hashed & rank_mask).bit_length()
+            old_rank = registers[register]
+            if rank > old_rank:
+                registers[register] = rank
+                self.harmonic_sum += 2.0 ** -rank - 2.0 ** -old_rank
+                if not old_rank:
+                    self.zero_registers -= 1
+
+    def discard(self, values):
+        # Take back the values of deleted or overwritten rows; a sketch cannot forget them
+        if self.counts is not None:
+            counts = self.counts
+            for value in values:
+                counts[value] -= 1
+                if counts[value] <= 0:
+                    del counts[value]
+
+    def distinct(self):
+        if self.counts is not None:
+            return len(self.counts)
+        registers = len(self.registers)
+        estimate = 0.7213 / (1 + 1.079 / registers) * registers * registers / self.harmonic_sum
+        if estimate <= 2.5 * registers and self.zero_registers:
+            # Small range correction: count the empty registers instead
+            estimate = registers * math.log(registers / self.zero_registers)
+        return round(estimate)
+
+    def histogram(self, row_count):
+        # The distinct count and bounds as a one-bucket histogram, for columns ANALYZE has not described
+        bounds = None if not self.ordered else [] if self.low is None else [self.low, self.high]
+        return Histogram({}, bounds, min(self.distinct(), row_count))
+
+
+HISTOGRAM_BUCKETS = 100  # equi-depth buckets ANALYZE splits a column's values into
+
+HISTOGRAM_MOST_COMMON = 100  # most common values ANALYZE keeps a frequency for
+
+ANALYZE_SAMPLE_ROWS = 30000  # rows ANALYZE reads from a larger table, chosen at random
+
+DEFAULT_RANGE_SELECTIVITY = 1 / 3  # fraction of rows a comparison is assumed to keep when the values do not order
+
+
+class Histogram:
+
+    # Estimated fraction of a column's rows satisfying each comparison. most_common maps the column's most
+    # common values to the fraction of rows holding them; bounds splits the remaining values into
+    # len(bounds) - 1 buckets of equally many rows, interpolating linearly inside a bucket. bounds is
+    # None when the values do not order against each other. A bucket of integers is spread over the unit
+    # intervals [k, k + 1) of its values, so it ends one past its upper bound.
+
+    def __init__(self, most_common, bounds, distinct):
+        self.most_common = most_common
+        self.bounds = bounds
+        self.rest = max(1 - sum(most_common.values()), 0)
+        self.rest_distinct = max(distinct - len(most_common), 1)
+        self.discrete = bool(bounds) and all(type(bound) is int for bound in bounds)
+
+    def equal(self, value):
+        if value in self.most_common:
+            return self.most_common[value]
+        if self.discrete and isinstance(value, float) and not value.is_integer():
+            return 0.0
+        return self.rest / self.rest_distinct
+
+    def position(self, value):
+        # Fraction of the values outside most_common that are below value
+        bounds = self.bounds
+        if bounds is None:
+            raise TypeError("the column's values do not order")
+        bucket = bisect_left(bounds, value)
+        if bucket == 0:
+            return 0.0
+        if bucket == len(bounds):
+            return 1.0
+        low, high = bounds[bucket - 1], bounds[bucket]
+        try:
+            if self.discrete:
+                within = (value - low) / (high + 1 - low)
+            else:
+                within = (value - low) / (high - low) if high > low else 0.5
+        except TypeError:
+            within = 0.5
+        return (bucket - 1 + within) / (len(bounds) - 1)
+
+    def below(self, value, inclusive):
+        # Fraction of the rows whose value is below value, or equal to it when inclusive
+        compare = operator.le if inclusive else operator.lt
+        fraction = sum(share for common, share in self.most_common.items() if compare(common, value))
+        if self.discrete and isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value):
+            # The integers below value, or up to it, are those below ceil(value), or below floor(value) + 1
+            return fraction + self.rest * self.position(math.floor(value) + 1 if inclusive else math.ceil(value))
+        fraction += self.rest * self.position(value)
+        if inclusive and value not in self.most_common and self.bounds and self.bounds[0] <= value <= self.bounds[-1]:
+            fraction += self.rest / self.rest_distinct
+        return fraction
+
+    def selectivity(self, comparison, value):
+        try:
+            if comparison == '=':
+                fraction = self.equal(value)
+            elif comparison == '!=':
+                fraction = 1 - self.equal(value)
+            elif comparison == '<':
+                fraction = self.below(value, False)
+            elif comparison == '<=':
+                fraction = self.below(value, True)
+            elif comparison == '>':
+                fraction = 1 - self.below(value, True)
+            elif comparison == '>=':
+                fraction = 1 - self.below(value, False)
+            elif comparison == 'BETWEEN':
+                fraction = self.below(value[1], True) - self.below(value[0], False)
+            else:
+                return DEFAULT_RANGE_SELECTIVITY
+        except TypeError:
+            if comparison == '=':
+                return self.rest / self.rest_distinct
+            return DEFAULT_RANGE_SELECTIVITY
+        return min(max(fraction, 0.0), 1.0)
+
+
+def build_histogram(values, distinct):
+    # Most common values and equi-depth bucket bounds of a list of values (all of a column, or a sample)
+    counts = Counter(values)
+    if not counts:
+        return Histogram({}, [], distinct)
+    average = len(values) / len(counts)
+    most_common = {value: count / len(values) for value, count in counts.most_common(HISTOGRAM_MOST_COMMON)
+                   if count > 1 and count > average}
+    rest = [value for value in values if value not in most_common]
+    try:
+        rest.sort()
+    except TypeError:
+        return Histogram(most_common, None, distinct)
+    bounds = [rest[(len(rest) - 1) * bucket // HISTOGRAM_BUCKETS] for bucket in range(HISTOGRAM_BUCKETS + 1)] if rest else []
+    return Histogram(most_common, bounds, distinct)
+
+
+class ColumnStore:
+
+    # Table data stored column by column; scans and aggregates read a single column buffer.
+    # Columns are kept in schema order and catalog maps each column name to its position.
+    # Deleted rows stay in the buffers behind a tombstone until compact() removes them.
+    # zones holds a ZoneMap for each column position a full scan has compared, built by that first scan,
+    # and statistics the ColumnStatistics of each column the optimizer has asked about. changes counts the
+    # rows appended, updated and deleted, so the optimizer can tell when its histograms have gone stale.
+
+    def __init__(self, schema, catalog=None):
+        self.catalog = catalog if catalog is not None else {name: position for position, name in enumerate(schema)}
+
+        self.columns = [make_column(column_type) for column_type in schema.values()]
+
+        self.row_count = 0
+
+        self.deleted = Tombstones()
+
+        self.zones = {}
+
+        self.statistics = {}
+
+        self.changes = 0
+
+    def __len__(self):
+        return self.row_count - self.deleted.count
+
+    def __iter__(self):
+        for row_id in self.row_ids():
+            yield RowView(self, row_id)
+
+    def __getitem__(self, row_id):
+        if row_id < 0:
+            row_id += self.row_count
+        if not 0 <= row_id < self.row_count:
+            raise IndexError("row id out of range")
+        return RowView(self, row_id)
+
+    def row_ids(self):
+        return self.deleted.live(self.row_count)
+
+    def column(self, name):
+        # The whole column buffer, indexed by row id; deleted rows are still in it
+        return self.columns[self.catalog[name]]
+
+    def column_items(self, name):
+        # (row id, value) for every live row
+        column = self.columns[self.catalog[name]]
+        if not self.deleted.count:
+            return enumerate(column)
+        return ((row_id, column[row_id]) for row_id in self.row_ids())
+
+    def column_values(self, name):
+        # Values of the live rows only
+        if not self.deleted.count:
+            return self.columns[self.catalog[name]]
+        return [value for row_id, value in self.column_items(name)]
+
+    def zone_map(self, position):
+        if position not in self.zones:
+            self.zones[position] = ZoneMap(self.columns[position])
+        return self.zones[position]
+
+    def column_statistics(self, name):
+        # Statistics of a column's live values, gathered by the first call and kept current from then on
+        position = self.catalog[name]
+        if position not in self.statistics:
+            self.statistics[position] = ColumnStatistics(self.column_values(name))
+        return self.statistics[position]
+
+    def zone_rows(self, position, compare, value):
+        # Live row ids of the blocks the column's zone map cannot rule out for the comparison
+        zone_map = self.zone_map(position)
+        blocks = zone_map.blocks(compare, value)
+        if len(blocks) == len(zone_map):
+            return self.row_ids()
+        row_ids = chain.from_iterable(range(block * ZONE_ROWS, min(block * ZONE_ROWS + ZONE_ROWS, self.row_count))
+                                      for block in blocks)
+        if not self.deleted.count:
+            return list(row_ids)
+        deleted = self.deleted
+        return [row_id for row_id in row_ids if row_id not in deleted]
+
+    def select(self, name, compare, value, row_ids=None):
+        # Live row ids (or those of row_ids) whose value in the named column satisfies the comparison.
+        # A full scan only visits the blocks the zone map cannot rule out.
+        position = self.catalog[name]
+        if row_ids is None:
+            row_ids = self.zone_rows(position, compare, value)
+        return self.columns[position].select(compare, value, row_ids)
+
+    def aggregate(self, name, function):
+        # Sum, minimum or maximum of a column's live values; a column without deleted rows computes it
+        # over its own storage, which for compressed integer segments means without decoding them
+        if self.deleted.count:
+            return AGGREGATES[function](self.column_values(name))
+        return self.columns[self.catalog[name]].aggregate(function)
+
+    def distinct(self, names):
+        # Distinct combinations of the named columns' live values, in order of first appearance.
+        # Dictionary-encoded columns are compared by code and only the distinct combinations are decoded.
+        columns = [self.columns[self.catalog[name]] for name in names]
+        keys = zip(*[column.codes if isinstance(column, DictionaryColumn) else column for column in columns])
+        if self.deleted.count:
+            deleted = self.deleted
+            keys = (key for row_id, key in enumerate(keys) if row_id not in deleted)
+        decoders = [column.dictionary if isinstance(column, DictionaryColumn) else None for column in columns]
+        return [tuple(part if decoder is None else decoder[part] for part, decoder in zip(key, decoders))
+                for key in dict.fromkeys(keys)]
+
+    def value(self, row_id, position):
+        return self.columns[position][row_id]
+
+    def set_value(self, row_id, position, value):
+        if position in self.statistics:
+            self.statistics[position].discard((self.columns[position][row_id],))
+            self.statistics[position].add(value)
+        self.columns[position][row_id] = value
+        self.changes += 1
+        if position in self.zones:
+            self.zones[position].add(row_id, value)
+
+    def row(self, row_id):
+        # Materialize one row as a tuple in schema order
+        return tuple(column[row_id] for column in self.columns)
+
+    def rows(self):
+        # Materialize every live row as a positional tuple, one column buffer at a time
+        if not self.columns:
+            return []
+        if not self.deleted.count:
+            return list(zip(*self.columns))
+        deleted = self.deleted
+        return [row for row_id, row in enumerate(zip(*self.columns)) if row_id not in deleted]
 
-            if token.ttype is Keyword.DML and token.value.upper() == 'CREATE':
-                create_index_found = True
+    def append(self, values):
+        # values are already converted and ordered like the schema
+        for column, value in zip(self.columns, values):
+            column.append(value)
+        for position, zone_map in self.zones.items():
+            zone_map.add(self.row_count, values[position])
+        for position, statistics in self.statistics.items():
+            statistics.add(values[position])
+        self.changes += 1
+        self.row_count += 1
+        return self.row_count - 1
 
-                continue
+    def extend(self, columns):
+        # Append a batch given column by column, as equally long lists in schema order
+        for column, values in zip(self.columns, columns):
+            column.extend(values)
+        for position, zone_map in self.zones.items():
+            zone_map.extend(self.row_count, columns[position])
+        for position, statistics in self.statistics.items():
+            statistics.extend(columns[position])
+        self.changes += len(columns[0]) if columns else 0
+        self.row_count += len(columns[0]) if columns else 0
+
+    def delete_rows(self, row_ids):
+        # Tombstone the given rows and return how many were live
+        deleted = [row_id for row_id in row_ids if 0 <= row_id < self.row_count and self.deleted.add(row_id)]
+        for position, statistics in self.statistics.items():
+            column = self.columns[position]
+            statistics.discard([column[row_id] for row_id in deleted])
+        self.changes += len(deleted)
+        return len(deleted)
+
+    def compact(self):
+        # Rebuild every column without the deleted rows; returns the old-to-new row id mapping
+        mapping = self.deleted.remap(self.row_count)
+        keep = self.row_ids()
+        self.columns = [column.take(keep) for column in self.columns]
+        self.row_count = len(keep)
+        self.deleted = Tombstones()
+        self.zones = {}
+        self.statistics = {}
+        return mapping
+
+
+# Memory-Mapped Snapshots
+
+SNAPSHOT_HEADER = struct.Struct('<8sQQ')  # magic, metadata offset, metadata length
+
+SNAPSHOT_MAGIC = b'RDBSNAP1'
+
+SNAPSHOT_ALIGNMENT = 8
+
+
+class MappedColumn:
+
+    # A column whose buffers are read in place from a snapshot mapping. The mapping is read-only,
+    # so the first write copies the buffers into ordinary ones and the column becomes its base class.
+
+    base = None
+
+    def materialize(self):
+        raise NotImplementedError
+
+    def append(self, value):
+        self.materialize()
+        self.append(value)
+
+    def extend(self, values):
+        self.materialize()
+        self.extend(values)
+
+    def __setitem__(self, row_id, value):
+        self.materialize()
+        self[row_id] = value
+
+    def take(self, row_ids):
+        self.materialize()
+        return self.take(row_ids)
+
+
+class MappedArrayColumn(MappedColumn):
+
+    def __init__(self, values):
+        self.values = values
+
+    def materialize(self):
+        values = self.new_buffer()
+        values.frombytes(self.values.cast('B'))
+        self.values = values
+        self.__class__ = self.base
+
+
+class MappedIntegerColumn(MappedArrayColumn, IntegerColumn):
+
+    base = SegmentedIntegerColumn
+
+    def materialize(self):
+        values = self.values.tolist()
+        self.__dict__.clear()
+        self.__class__ = self.base
+        self.__init__(values)
+
+
+class MappedFloatColumn(MappedArrayColumn, FloatColumn):
+
+    base = FloatColumn
+
+
+class MappedStringColumn(MappedColumn, StringColumn):
+
+    base = StringColumn
+
+    def __init__(self, offsets, lengths, data):
+        self.offsets = offsets
+
+        self.lengths = lengths
+
+        self.data = data
+
+    def __getitem__(self, row_id):
+        start = self.offsets[row_id]
+        return str(self.data[start:start + self.lengths[row_id]], 'utf-8')
+
+    def __iter__(self):
+        data = self.data
+        for start, length in zip(self.offsets, self.lengths):
+            yield str(data[start:start + length], 'utf-8')
+
+    def materialize(self):
+        offsets, lengths = array('q'), array('q')
+        offsets.frombytes(self.offsets.cast('B'))
+        lengths.frombytes(self.lengths.cast('B'))
+        self.offsets, self.lengths, self.data = offsets, lengths, bytearray(self.data)
+        self.__class__ = self.base
+
+
+class MappedDictionaryColumn(MappedColumn, DictionaryColumn):
+
+    base = DictionaryColumn
+
+    def __init__(self, codes, dictionary):
+        self.codes = codes
+
+        self.dictionary = dictionary
+
+        self.lookup = {value: code for code, value in enumerate(dictionary)}
+
+    def materialize(self):
+        codes = array('H')
+        codes.frombytes(self.codes.cast('B'))
+        self.codes = codes
+        self.__class__ = self.base
+
+
+class SnapshotWriter:
+
+    # Writes tables and their index contents as one file: a fixed header, then 8-byte aligned
+    # column buffers in their in-memory layout, then a JSON metadata block that locates them
+
+    def __init__(self, path):
+        self.path = path
+
+        self.file = open(path + ".tmp", "wb")
+
+        self.file.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, 0, 0))
+
+    def segment(self, buffer):
+        padding = -self.file.tell() % SNAPSHOT_ALIGNMENT
+        self.file.write(b'\0' * padding)
+        offset = self.file.tell()
+        data = memoryview(buffer).cast('B')
+        self.file.write(data)
+        return [offset, len(data)]
+
+    def write_column(self, column_type, values):
+        # Describe one column: a typed buffer for numbers, codes plus their dictionary for
+        # dictionary-encoded strings, offsets/lengths/bytes for other strings
+        if isinstance(values, DictionaryColumn):
+            return {"kind": "dictionary", "codes": self.segment(values.codes), "dictionary": values.dictionary}
+        column_class = COLUMN_TYPES.get(column_type.lower())
+        if column_class is None:
+            return {"kind": "json", "values": list(values)}
+        if column_class is DictionaryColumn:
+            column_class = StringColumn
+        if column_class is SegmentedIntegerColumn:
+            # Mapped columns are read in place, so integers are written out decoded
+            column_class = IntegerColumn
+        if not isinstance(values, column_class):
+            column = column_class()
+            for value in values:
+                column.append(value)
+            values = column
+        if column_class is StringColumn:
+            if sum(values.lengths) < len(values.data):
+                # Leave the bytes of overwritten strings behind
+                values = StringColumn(values)
+            return {"kind": "string", "offsets": self.segment(values.offsets),
+                    "lengths": self.segment(values.lengths), "data": self.segment(values.data)}
+        return {"kind": column_class.typecode, "values": self.segment(values.values)}
+
+    def write_index(self, table, index_info):
+        # Keys are stored column by column and row id lists as one flat buffer with start offsets
+        index = index_info['index']
+        index_columns = index_info['columns'] if isinstance(index_info['columns'], list) else [index_info['columns']]
+        keys = list(index.keys())
+        key_columns = [self.write_column(table["columns"].get(column, "object"), [key[part] for key in keys])
+                       for part, column in enumerate(index_columns)]
+        starts = array('q', [0])
+        row_ids = array('q')
+        for posting in index.values():
+            row_ids.extend(posting)
+            starts.append(len(row_ids))
+        index_data = {"columns": index_info['columns'], "unique": index_info['unique'], "using": index_info['using'],
+                      "include": index_info['include'], "keys": key_columns, "starts": self.segment(starts),
+                      "row_ids": self.segment(row_ids)}
+        if index_info['include']:
+            # A covering index's entries go column by column too: key parts, row id, then included values
+            entries = list(index_info['entries'].items())
+            entry_types = [table["columns"].get(column, "object") for column in index_columns] + ["integer"] + \
+                [table["columns"][column] for column in index_info['include']]
+            entry_values = [key + values for key, values in entries]
+            index_data["entries"] = [self.write_column(column_type, [entry[part] for entry in entry_values])
+                                     for part, column_type in enumerate(entry_types)]
+        return index_data
+
+    def write_table(self, table):
+        store = table["data"]
+        table_info = {
+            "columns": table["columns"],
+            "primary_key": table["primary_key"],
+            "foreign_keys": table["foreign_keys"],
+            "rows": store.row_count,
+            "deleted": self.segment(store.deleted.bits),
+            "data": [self.write_column(column_type, store.column(column))
+                     for column, column_type in table["columns"].items()]
+        }
+        if 'indexes' in table:
+            table_info["indexes"] = {index_name: self.write_index(table, index_info)
+                                     for index_name, index_info in table['indexes'].items()}
+        return table_info
+
+    def finish(self, metadata):
+        metadata["byteorder"] = sys.byteorder
+        encoded = json.dumps(metadata).encode('utf-8')
+        metadata_offset = self.file.tell()
+        self.file.write(encoded)
+        self.file.seek(0)
+        self.file.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, metadata_offset, len(encoded)))
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+        os.replace(self.path + ".tmp", self.path)
+
+
+class SnapshotReader:
+
+    # Maps a snapshot file read-only. Columns are memoryviews over the mapping, so opening a snapshot
+    # does not decode any rows and processes that open the same file share its pages.
+
+    def __init__(self, path):
+        with open(path, "rb") as snapshot_file:
+            self.map = mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self.view = memoryview(self.map)
+
+        magic, metadata_offset, metadata_length = SNAPSHOT_HEADER.unpack_from(self.map)
+
+        if magic != SNAPSHOT_MAGIC:
+            raise Exception(f"{path} is not a database snapshot.")
+
+        self.metadata = json.loads(self.view[metadata_offset:metadata_offset + metadata_length].tobytes())
+
+        if self.metadata["byteorder"] != sys.byteorder:
+            raise Exception(f"Snapshot {path} was written on a machine with a different byte order.")
+
+    def buffer(self, segment, typecode='B'):
+        offset, length = segment
+        return self.view[offset:offset + length].cast(typecode)
+
+    def read_column(self, column_info):
+        kind = column_info["kind"]
+        if kind == "string":
+            return MappedStringColumn(self.buffer(column_info["offsets"], 'q'), self.buffer(column_info["lengths"], 'q'),
+                                      self.buffer(column_info["data"]))
+        if kind == "dictionary":
+            return MappedDictionaryColumn(self.buffer(column_info["codes"], 'H'), column_info["dictionary"])
+        if kind == "json":
+            return ObjectColumn(column_info["values"])
+        if kind == IntegerColumn.typecode:
+            return MappedIntegerColumn(self.buffer(column_info["values"], kind))
+        return MappedFloatColumn(self.buffer(column_info["values"], kind))
+
+    def read_index(self, index_info, schema):
+        index_columns = index_info["columns"] if isinstance(index_info["columns"], list) else [index_info["columns"]]
+        index = new_index(index_info.get("using", "btree"), [schema.get(column, "object") for column in index_columns])
+        keys = zip(*[self.read_column(key_column) for key_column in index_info["keys"]])
+        starts = self.buffer(index_info["starts"], 'q')
+        row_ids = self.buffer(index_info["row_ids"], 'q')
+        index.update([(key, new_posting(index, row_ids[starts[position]:starts[position + 1]]))
+                      for position, key in enumerate(keys)])
+        return index
+
+    def read_entries(self, index_info):
+        if not index_info.get("include"):
+            return None
+        key_length = len(index_info["keys"]) + 1
+        entries = OOBTree()
+        entries.update([(entry[:key_length], entry[key_length:])
+                        for entry in zip(*[self.read_column(entry_column) for entry_column in index_info["entries"]])])
+        return entries
+
+    def read_table(self, table_info):
+        schema = table_info["columns"]
+        catalog = {column: position for position, column in enumerate(schema)}
+        store = ColumnStore(schema, catalog)
+        store.columns = [self.read_column(column_info) for column_info in table_info["data"]]
+        store.row_count = table_info["rows"]
+        store.deleted = Tombstones(self.buffer(table_info["deleted"]))
+        table = {
+            "columns": schema,
+            "catalog": catalog,
+            "data": store,
+            "primary_key": table_info["primary_key"],
+            "foreign_keys": {column: tuple(reference) for column, reference in table_info["foreign_keys"].items()}
+        }
+        if "indexes" in table_info:
+            # Snapshots written before non-unique indexes existed hold unique ones only
+            table["indexes"] = {index_name: {'index': self.read_index(index_info, schema), 'columns': index_info["columns"],
+                                             'unique': index_info.get("unique", True), 'using': index_info.get("using", "btree"),
+                                             'include': index_info.get("include", []), 'entries': self.read_entries(index_info)}
+                                for index_name, index_info in table_info["indexes"].items()}
+        return table
+
+
+# Paged On-Disk Storage
+
+PAGE_SIZE = 8192
+
+PAGE_HEADER = struct.Struct('<II')  # row count, bytes used
+
+DEFAULT_BUFFER_POOL_BYTES = 32 * 1024 * 1024
+
+NESTED_LOOP_BLOCK_ROWS = 4096
+
+# Join costs are counted in nested loop key comparisons. Reading a row costs about eight of them, hashing its
+# key two, and fetching a row by row id for an index nested loop about two hundred (measured on ii_100000)
+
+JOIN_SCAN_COST = 8
+
+JOIN_HASH_COST = 2
+
+JOIN_FETCH_COST = 200
+
+# Join columns whose values hash and order alike across tables; a join between two kinds never matches
+
+JOIN_KEY_KINDS = {
+
+    "integer": "number",
+
+    "float": "number",
+
+    "string": "string"
+
+}
+
+DEFAULT_COMPACTION_RATIO = 0.25
+
+DEFAULT_ANALYZE_RATIO = 0.1  # fraction of an analyzed table's rows that may change before its histograms are rebuilt
+
+BULK_CHUNK_ROWS = 8192
+
+CATALOG_FILE = "catalog.json"
+
+WAL_FILE = "wal.log"
+
+WAL_RECORD = struct.Struct('<IIQ')  # payload length, CRC32, LSN
+
+DEFAULT_ASYNC_COMMIT_DELAY = 0.005  # seconds a commit may stay unsynced after it has returned
+
+DEFAULT_ASYNC_COMMIT_BYTES = 256 * 1024
+
+DEFAULT_CHECKPOINT_BYTES = 16 * 1024 * 1024
+
+
+class RowCodec:
+
+    # Packs the rows of one table schema into bytes: Integer as 'q', Float as 'd' and
+    # String as a 4-byte length followed by its UTF-8 bytes
+
+    LENGTH = struct.Struct('<I')
+
+    def __init__(self, schema):
+        self.types = [column_type.lower() for column_type in schema.values()]
+
+        self.fields = [struct.Struct('<q') if column_type == 'integer' else struct.Struct('<d')
+                       if column_type == 'float' else None for column_type in self.types]
+
+        # Schemas without strings have a fixed row layout that struct can unpack a page at a time
+        self.row_struct = None
+
+        if all(field is not None for field in self.fields):
+            self.row_struct = struct.Struct('<' + ''.join(field.format[1:] for field in self.fields))
+
+    def encode(self, row):
+        if self.row_struct is not None:
+            return self.row_struct.pack(*row)
+        parts = []
+        for field, value in zip(self.fields, row):
+            if field is not None:
+                parts.append(field.pack(value))
+            else:
+                encoded = str(value).encode('utf-8')
+                parts.append(self.LENGTH.pack(len(encoded)))
+                parts.append(encoded)
+        return b''.join(parts)
+
+    def row_size(self, row):
+        if self.row_struct is not None:
+            return self.row_struct.size
+        return len(self.encode(row))
+
+    def decode(self, data, offset, count):
+        if self.row_struct is not None:
+            return list(self.row_struct.iter_unpack(data[offset:offset + count * self.row_struct.size]))
+        rows = []
+        for _ in range(count):
+            row = []
+            for field in self.fields:
+                if field is not None:
+                    row.append(field.unpack_from(data, offset)[0])
+                    offset += field.size
+                else:
+                    length = self.LENGTH.unpack_from(data, offset)[0]
+                    offset += self.LENGTH.size
+                    row.append(bytes(data[offset:offset + length]).decode('utf-8'))
+                    offset += length
+            rows.append(tuple(row))
+        return rows
+
+
+class Page:
+
+    # A decoded heap page: its rows as tuples and the bytes they take up on disk
+
+    __slots__ = ('rows', 'used', 'dirty')
+
+    def __init__(self, rows=None, used=PAGE_HEADER.size, dirty=False):
+        self.rows = rows if rows is not None else []
+        self.used = used
+        self.dirty = dirty
+
+
+class HeapFile:
+
+    # One table's rows on disk as fixed-size pages. The directory file records which pages hold
+    # the table's rows, in row order, with their row counts and the tombstones of deleted rows.
+
+    def __init__(self, path, codec):
+        self.path = path
+
+        self.codec = codec
+
+        self.file = open(path, 'r+b' if os.path.exists(path) else 'w+b')
+
+        self.file.seek(0, os.SEEK_END)
+
+        self.page_total = self.file.tell() // PAGE_SIZE
+
+        self.free_pages = []
+
+        # Pages referenced by the directory on disk are never overwritten (see PagedStore.modify);
+        # pages they replace are only reused once the next checkpoint no longer references them
+
+        self.checkpoint_pages = set()
+
+        self.retired_pages = []
+
+        self.checkpoint_lsn = 0
+
+    def read_page(self, page_no):
+        self.file.seek(page_no * PAGE_SIZE)
+        data = self.file.read(PAGE_SIZE)
+        if len(data) < PAGE_HEADER.size:
+            return Page()
+        count, used = PAGE_HEADER.unpack_from(data)
+        return Page(self.codec.decode(data, PAGE_HEADER.size, count), max(used, PAGE_HEADER.size))
+
+    def write_page(self, page_no, page):
+        payload = b''.join(self.codec.encode(row) for row in page.rows)
+        data = PAGE_HEADER.pack(len(page.rows), PAGE_HEADER.size + len(payload)) + payload
+        self.file.seek(page_no * PAGE_SIZE)
+        self.file.write(data.ljust(PAGE_SIZE, b'\0'))
+
+    def allocate(self):
+        if self.free_pages:
+            return self.free_pages.pop()
+        self.page_total += 1
+        return self.page_total - 1
+
+    def free(self, page_no):
+        if page_no in self.checkpoint_pages:
+            self.retired_pages.append(page_no)
+        else:
+            self.free_pages.append(page_no)
+
+    def read_directory(self):
+        page_ids = array('q')
+        counts = array('q')
+        tombstones = b''
+        if os.path.exists(self.path + '.dir'):
+            with open(self.path + '.dir', 'rb') as directory:
+                page_total, tombstone_bytes, self.checkpoint_lsn = struct.unpack('<QQQ', directory.read(24))
+                page_ids.frombytes(directory.read(8 * page_total))
+                counts.frombytes(directory.read(8 * page_total))
+                tombstones = directory.read(tombstone_bytes)
+        # Anything the directory does not reference was free at the checkpoint or written after it
+        self.checkpoint_pages = set(page_ids)
+        self.free_pages = [page_no for page_no in range(self.page_total) if page_no not in self.checkpoint_pages]
+        self.retired_pages = []
+        return page_ids, counts, tombstones
+
+    def write_directory(self, page_ids, counts, tombstones, checkpoint_lsn):
+        temp_path = self.path + '.dir.tmp'
+        with open(temp_path, 'wb') as directory:
+            directory.write(struct.pack('<QQQ', len(page_ids), len(tombstones), checkpoint_lsn))
+            directory.write(array('q', page_ids).tobytes())
+            directory.write(array('q', counts).tobytes())
+            directory.write(tombstones)
+            directory.flush()
+            os.fsync(directory.fileno())
+        os.replace(temp_path, self.path + '.dir')
+        self.checkpoint_lsn = checkpoint_lsn
+        self.checkpoint_pages = set(page_ids)
+        self.free_pages.extend(self.retired_pages)
+        self.retired_pages = []
+
+    def sync(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self):
+        self.file.close()
+
+    def remove(self):
+        self.close()
+        for path in (self.path, self.path + '.dir'):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+class BufferPool:
+
+    # LRU cache of decoded heap pages shared by every table, bounded by a memory budget.
+    # Dirty pages are written back to their heap file when they are evicted or flushed.
+
+    def __init__(self, capacity_bytes=DEFAULT_BUFFER_POOL_BYTES):
+        self.capacity = max(4, capacity_bytes // PAGE_SIZE)
+
+        self.pages = OrderedDict()
+
+        self.hits = 0
+
+        self.misses = 0
+
+    def get(self, heap, page_no):
+        key = (heap, page_no)
+        page = self.pages.get(key)
+        if page is not None:
+            self.hits += 1
+            self.pages.move_to_end(key)
+            return page
+        self.misses += 1
+        page = heap.read_page(page_no)
+        self.put(key, page)
+        return page
+
+    def new_page(self, heap, page_no):
+        page = Page(dirty=True)
+        self.put((heap, page_no), page)
+        return page
+
+    def put(self, key, page):
+        self.pages[key] = page
+        self.pages.move_to_end(key)
+        while len(self.pages) > self.capacity:
+            (heap, page_no), evicted = self.pages.popitem(last=False)
+            if evicted.dirty:
+                heap.write_page(page_no, evicted)
+
+    def move(self, heap, page_no, new_page_no):
+        self.pages[(heap, new_page_no)] = self.pages.pop((heap, page_no))
+
+    def discard(self, heap, page_no=None):
+        # Forget cached pages without writing them back (freed pages or dropped tables)
+        for key in [key for key in self.pages if key[0] is heap and (page_no is None or key[1] == page_no)]:
+            del self.pages[key]
+
+    def flush(self, heap=None):
+        for (page_heap, page_no), page in self.pages.items():
+            if page.dirty and (heap is None or page_heap is heap):
+                page_heap.write_page(page_no, page)
+                page.dirty = False
+
+
+class PagedColumn:
+
+    # One column of a PagedStore; iterating it streams the table's pages through the buffer pool
+
+    def __init__(self, store, position):
+        self.store = store
+        self.position = position
+
+    def __len__(self):
+        return self.store.row_count
+
+    def __iter__(self):
+        position = self.position
+        for rows in self.store.iter_pages():
+            for row in rows:
+                yield row[position]
+
+    def __getitem__(self, row_id):
+        return self.store.value(row_id, self.position)
+
+    def __setitem__(self, row_id, value):
+        self.store.set_value(row_id, self.position, value)
+
+    def __contains__(self, value):
+        return any(existing == value for existing in self)
+
+
+class PagedRows:
+
+    # Re-iterable source of the live rows of a PagedStore, so scans and joins stream pages instead of materializing
+
+    def __init__(self, store):
+        self.store = store
+
+    def __len__(self):
+        return len(self.store)
+
+    def __iter__(self):
+        deleted = self.store.deleted
+        if not deleted.count:
+            for rows in self.store.iter_pages():
+                yield from rows
+            return
+        row_id = 0
+        for rows in self.store.iter_pages():
+            for row in rows:
+                if row_id not in deleted:
+                    yield row
+                row_id += 1
+
+
+class PagedStore:
+
+    # Table data kept in a heap file of fixed-size pages read through the shared buffer pool.
+    # page_ids lists the heap pages in row order and page_starts holds the first row id on each.
+    # zones, statistics and changes are kept as in ColumnStore.
+
+    def __init__(self, schema, catalog, heap, pool):
+        self.catalog = catalog
+
+        self.heap = heap
+
+        self.pool = pool
+
+        self.codec = heap.codec
+
+        self.page_ids, counts, tombstones = heap.read_directory()
+
+        self.deleted = Tombstones(tombstones)
+
+        self.zones = {}
+
+        self.statistics = {}
+
+        self.changes = 0
+
+        self.page_starts = array('q')
+
+        self.row_count = 0
+
+        for rows_on_page in counts:
+            self.page_starts.append(self.row_count)
+            self.row_count += rows_on_page
+
+    def __len__(self):
+        return self.row_count - self.deleted.count
+
+    def __iter__(self):
+        for row_id in self.row_ids():
+            yield RowView(self, row_id)
+
+    def __getitem__(self, row_id):
+        if row_id < 0:
+            row_id += self.row_count
+        if not 0 <= row_id < self.row_count:
+            raise IndexError("row id out of range")
+        return RowView(self, row_id)
+
+    def page(self, page_index):
+        return self.pool.get(self.heap, self.page_ids[page_index])
+
+    def modify(self, page_index):
+        # Return a page for writing. A page that the last checkpoint's directory still references is
+        # copied to a newly allocated page first, so the checkpoint image stays intact for recovery.
+        page_no = self.page_ids[page_index]
+        page = self.pool.get(self.heap, page_no)
+        if page_no in self.heap.checkpoint_pages:
+            new_page_no = self.heap.allocate()
+            self.pool.move(self.heap, page_no, new_page_no)
+            self.page_ids[page_index] = new_page_no
+            self.heap.free(page_no)
+        page.dirty = True
+        return page
+
+    def iter_pages(self):
+        for page_index in range(len(self.page_ids)):
+            yield self.page(page_index).rows
+
+    def locate(self, row_id):
+        if not 0 <= row_id < self.row_count:
+            raise IndexError("row id out of range")
+        page_index = bisect_right(self.page_starts, row_id) - 1
+        return page_index, row_id - self.page_starts[page_index]
+
+    def row_ids(self):
+        return self.deleted.live(self.row_count)
+
+    def column(self, name):
+        return PagedColumn(self, self.catalog[name])
+
+    def column_items(self, name):
+        column = PagedColumn(self, self.catalog[name])
+        if not self.deleted.count:
+            return enumerate(column)
+        deleted = self.deleted
+        return ((row_id, value) for row_id, value in enumerate(column) if row_id not in deleted)
+
+    def column_values(self, name):
+        if not self.deleted.count:
+            return PagedColumn(self, self.catalog[name])
+        return [value for row_id, value in self.column_items(name)]
+
+    def zone_map(self, position):
+        if position not in self.zones:
+            self.zones[position] = ZoneMap(PagedColumn(self, position))
+        return self.zones[position]
+
+    def column_statistics(self, name):
+        position = self.catalog[name]
+        if position not in self.statistics:
+            self.statistics[position] = ColumnStatistics(self.column_values(name))
+        return self.statistics[position]
+
+    def block_items(self, position, blocks):
+        # (row id, value) for every live row of the given zone map blocks, reading only the pages they span
+        deleted = self.deleted
+        for block in blocks:
+            row_id, end = block * ZONE_ROWS, min(block * ZONE_ROWS + ZONE_ROWS, self.row_count)
+            page_index, slot = self.locate(row_id)
+            while row_id < end:
+                for row in self.page(page_index).rows[slot:slot + end - row_id]:
+                    if row_id not in deleted:
+                        yield row_id, row[position]
+                    row_id += 1
+                page_index += 1
+                slot = 0
+
+    def select(self, name, compare, value, row_ids=None):
+        position = self.catalog[name]
+        if row_ids is None:
+            zone_map = self.zone_map(position)
+            blocks = zone_map.blocks(compare, value)
+            items = self.column_items(name) if len(blocks) == len(zone_map) else self.block_items(position, blocks)
+            return [row_id for row_id, row_value in items if compare(row_value, value)]
+        return [row_id for row_id in row_ids if compare(self.value(row_id, position), value)]
+
+    def aggregate(self, name, function):
+        return AGGREGATES[function](self.column_values(name))
+
+    def distinct(self, names):
+        positions = [self.catalog[name] for name in names]
+        return list(dict.fromkeys(tuple(row[position] for position in positions) for row in self.rows()))
+
+    def value(self, row_id, position):
+        page_index, slot = self.locate(row_id)
+        return self.page(page_index).rows[slot][position]
+
+    def row(self, row_id):
+        page_index, slot = self.locate(row_id)
+        return self.page(page_index).rows[slot]
+
+    def rows(self):
+        return PagedRows(self)
+
+    def append(self, values):
+        row = tuple(values)
+        size = self.codec.row_size(row)
+        if PAGE_HEADER.size + size > PAGE_SIZE:
+            raise Exception("Row is too large to fit in a page.")
+        page = self.page(len(self.page_ids) - 1) if self.page_ids else None
+        if page is None or page.used + size > PAGE_SIZE:
+            page_no = self.heap.allocate()
+            page = self.pool.new_page(self.heap, page_no)
+            self.page_ids.append(page_no)
+            self.page_starts.append(self.row_count)
+        else:
+            page = self.modify(len(self.page_ids) - 1)
+        page.rows.append(row)
+        page.used += size
+        for position, zone_map in self.zones.items():
+            zone_map.add(self.row_count, row[position])
+        for position, statistics in self.statistics.items():
+            statistics.add(row[position])
+        self.changes += 1
+        self.row_count += 1
+        return self.row_count - 1
+
+    def extend(self, columns):
+        # Like append, but the page being filled is held across rows instead of fetched for each one
+        for position, zone_map in self.zones.items():
+            zone_map.extend(self.row_count, columns[position])
+        for position, statistics in self.statistics.items():
+            statistics.extend(columns[position])
+        self.changes += len(columns[0]) if columns else 0
+        page = None
+        for row in zip(*columns):
+            size = self.codec.row_size(row)
+            if PAGE_HEADER.size + size > PAGE_SIZE:
+                raise Exception("Row is too large to fit in a page.")
+            if page is None and self.page_ids and self.page(len(self.page_ids) - 1).used + size <= PAGE_SIZE:
+                page = self.modify(len(self.page_ids) - 1)
+            elif page is None or page.used + size > PAGE_SIZE:
+                page_no = self.heap.allocate()
+                page = self.pool.new_page(self.heap, page_no)
+                self.page_ids.append(page_no)
+                self.page_starts.append(self.row_count)
+            page.rows.append(row)
+            page.used += size
+            self.row_count += 1
+
+    def set_value(self, row_id, position, value):
+        page_index, slot = self.locate(row_id)
+        old_row = self.page(page_index).rows[slot]
+        new_row = old_row[:position] + (value,) + old_row[position + 1:]
+        new_size = self.codec.row_size(new_row)
+        if PAGE_HEADER.size + new_size > PAGE_SIZE:
+            raise Exception("Row is too large to fit in a page.")
+        page = self.modify(page_index)
+        page.used += new_size - self.codec.row_size(old_row)
+        page.rows[slot] = new_row
+        if position in self.zones:
+            self.zones[position].add(row_id, value)
+        if position in self.statistics:
+            self.statistics[position].discard((old_row[position],))
+            self.statistics[position].add(value)
+        self.changes += 1
+        if page.used > PAGE_SIZE:
+            self.split_page(page_index)
+
+    def split_page(self, page_index):
+        # Move the second half of an overflowing page to a new page right after it in row order,
+        # so row ids stay contiguous and unchanged
+        page = self.modify(page_index)
+        half = len(page.rows) // 2
+        moved = page.rows[half:]
+        del page.rows[half:]
+        page.used = PAGE_HEADER.size + sum(self.codec.row_size(row) for row in page.rows)
+        page_no = self.heap.allocate()
+        new_page = self.pool.new_page(self.heap, page_no)
+        new_page.rows = moved
+        new_page.used = PAGE_HEADER.size + sum(self.codec.row_size(row) for row in moved)
+        self.page_ids.insert(page_index + 1, page_no)
+        self.page_starts.insert(page_index + 1, self.page_starts[page_index] + half)
+        if new_page.used > PAGE_SIZE:
+            self.split_page(page_index + 1)
+        if page.used > PAGE_SIZE:
+            self.split_page(page_index)
+
+    def page_counts(self):
+        ends = list(self.page_starts[1:]) + [self.row_count]
+        return array('q', (end - start for start, end in zip(self.page_starts, ends)))
+
+    def delete_rows(self, row_ids):
+        # Tombstone the given rows; the pages are left alone until compact()
+        deleted = [row_id for row_id in row_ids if 0 <= row_id < self.row_count and self.deleted.add(row_id)]
+        for position, statistics in self.statistics.items():
+            statistics.discard([self.value(row_id, position) for row_id in deleted])
+        self.changes += len(deleted)
+        return len(deleted)
+
+    def compact(self):
+        # Rewrite only the pages holding deleted rows, release pages left empty and renumber the rows after them.
+        # Returns the old-to-new row id mapping.
+        mapping = self.deleted.remap(self.row_count)
+        self.zones = {}
+        self.statistics = {}
+        by_page = {}
+        for row_id in range(self.row_count):
+            if row_id in self.deleted:
+                page_index, slot = self.locate(row_id)
+                by_page.setdefault(page_index, set()).add(slot)
+        self.deleted = Tombstones()
+        if not by_page:
+            return mapping
+        counts = self.page_counts()
+        for page_index, slots in by_page.items():
+            page = self.modify(page_index)
+            page.rows = [row for slot, row in enumerate(page.rows) if slot not in slots]
+            page.used = PAGE_HEADER.size + sum(self.codec.row_size(row) for row in page.rows)
+            counts[page_index] = len(page.rows)
+        page_ids = array('q')
+        page_counts = array('q')
+        for page_no, rows_on_page in zip(self.page_ids, counts):
+            if rows_on_page:
+                page_ids.append(page_no)
+                page_counts.append(rows_on_page)
+            else:
+                self.pool.discard(self.heap, page_no)
+                self.heap.free(page_no)
+        self.page_ids = page_ids
+        self.page_starts = array('q')
+        self.row_count = 0
+        for rows_on_page in page_counts:
+            self.page_starts.append(self.row_count)
+            self.row_count += rows_on_page
+        return mapping
+
+    def checkpoint(self, checkpoint_lsn):
+        # Write the dirty pages, make them durable, then switch the on-disk directory over to them
+        self.pool.flush(self.heap)
+        self.heap.sync()
+        self.heap.write_directory(self.page_ids, self.page_counts(), self.deleted.bits, checkpoint_lsn)
+
+    def close(self):
+        self.pool.discard(self.heap)
+        self.heap.close()
+
+    def drop(self):
+        self.pool.discard(self.heap)
+        self.heap.remove()
+
+
+class WriteAheadLog:
+
+    # Append-only log of logical row changes, each record checksummed and numbered with an LSN.
+    # A commit writes its records to the file right away but returns before they are synced
+    # (asynchronous commit): the fsync runs once async_commit_bytes of log are waiting, or
+    # async_commit_delay seconds after the first unsynced commit, and a crash loses the commits it
+    # had not yet covered. A delay of 0 makes every commit fsync before it returns.
+
+    def __init__(self, path, async_commit_delay=DEFAULT_ASYNC_COMMIT_DELAY, async_commit_bytes=DEFAULT_ASYNC_COMMIT_BYTES):
+        self.path = path
+
+        self.async_commit_delay = async_commit_delay
+
+        self.async_commit_bytes = async_commit_bytes
+
+        self.file = open(path, 'ab+')
+
+        self.next_lsn = 1
+
+        self.pending = []
+
+        self.unsynced_bytes = 0
+
+        self.syncs = 0
+
+        self.lock = threading.Lock()
+
+        self.timer = None
+
+    def read_records(self):
+        # Return the (lsn, record) pairs in the log, cutting it off at the first torn or corrupt record
+        self.file.seek(0)
+        data = self.file.read()
+        records = []
+        offset = 0
+        while offset + WAL_RECORD.size <= len(data):
+            length, checksum, lsn = WAL_RECORD.unpack_from(data, offset)
+            payload = data[offset + WAL_RECORD.size:offset + WAL_RECORD.size + length]
+            if len(payload) < length or zlib.crc32(payload, lsn & 0xFFFFFFFF) != checksum:
+                break
+            records.append((lsn, json.loads(payload)))
+            offset += WAL_RECORD.size + length
+        if offset < len(data):
+            print(f"Discarding {len(data) - offset} bytes of incomplete log.")
+            self.file.truncate(offset)
+        if records:
+            self.next_lsn = max(self.next_lsn, records[-1][0] + 1)
+        return records
+
+    def append(self, record):
+        payload = json.dumps(record, separators=(',', ':')).encode('utf-8')
+        lsn = self.next_lsn
+        self.next_lsn += 1
+        self.pending.append(WAL_RECORD.pack(len(payload), zlib.crc32(payload, lsn & 0xFFFFFFFF), lsn) + payload)
+        return lsn
+
+    def commit(self):
+        if not self.pending:
+            return
+        with self.lock:
+            data = b''.join(self.pending)
+            self.pending = []
+            self.file.write(data)
+            self.file.flush()
+            self.unsynced_bytes += len(data)
+            if self.async_commit_delay <= 0 or self.unsynced_bytes >= self.async_commit_bytes:
+                self._sync()
+            elif self.timer is None:
+                self.timer = threading.Timer(self.async_commit_delay, self.sync)
+                self.timer.daemon = True
+                self.timer.start()
+
+    def sync(self):
+        with self.lock:
+            self._sync()
+
+    def _sync(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        if self.unsynced_bytes:
+            os.fsync(self.file.fileno())
+            self.unsynced_bytes = 0
+            self.syncs += 1
+
+    def size(self):
+        return self.file.tell()
+
+    def truncate(self):
+        # Everything in the log is covered by a checkpoint
+        with self.lock:
+            self._sync()
+            self.file.truncate(0)
+            self.file.seek(0)
+
+    def close(self):
+        self.commit()
+        self.sync()
+        self.file.close()
+
+
+# Query Plans
+
+class PlanNode:
+
+    # One operator of a query plan as EXPLAIN prints it, with the rows it is estimated to produce. Under
+    # EXPLAIN ANALYZE it also collects what the operator did: rows produced over all its loops, the number
+    # of times it ran, and the wall time and peak of newly allocated memory while it ran, both including
+    # the operators below it. Scans and probes read inside another operator are timed but their memory
+    # is counted in that operator's.
+
+    def __init__(self, operator, estimated_rows=None, children=()):
+        self.operator = operator
+        self.estimated_rows = estimated_rows
+        self.children = list(children)
+        self.rows = 0
+        self.loops = 0
+        self.elapsed = 0.0
+        self.peak_memory = None
+
+    def lines(self, analyze, depth=0):
+        line = f"{'    ' * (depth - 1) + '->  ' if depth else ''}{self.operator}"
+        if self.estimated_rows is not None:
+            line += f"  (estimated rows={round(self.estimated_rows)})"
+        if analyze and self.loops:
+            line += f"  (actual rows={self.rows} loops={self.loops} time={self.elapsed * 1000:.3f} ms"
+            line += f" memory={self.peak_memory / 1024:.1f} KiB)" if self.peak_memory is not None else ")"
+        elif analyze:
+            line += "  (never executed)"
+        yield line
+        for child in self.children:
+            yield from child.lines(analyze, depth + 1)
+
+
+class TracedRows:
+
+    # The rows a plan operator reads, passed through unchanged. Every pass over them is a loop of the
+    # node, which is given the rows produced and the time spent producing them.
+
+    def __init__(self, node, rows):
+        self.node = node
+        self.rows = rows
+
+    def __iter__(self):
+        node = self.node
+        node.loops += 1
+        rows = iter(self.rows)
+        while True:
+            start_time = time.perf_counter()
+            row = next(rows, None)
+            node.elapsed += time.perf_counter() - start_time
+            if row is None:
+                return
+            node.rows += 1
+            yield row
+
+
+class RDBMS:
+
+    def __init__(self, database_dir=None, buffer_pool_bytes=DEFAULT_BUFFER_POOL_BYTES,
+                 async_commit_delay=DEFAULT_ASYNC_COMMIT_DELAY, async_commit_bytes=DEFAULT_ASYNC_COMMIT_BYTES,
+                 checkpoint_bytes=DEFAULT_CHECKPOINT_BYTES, compaction_ratio=DEFAULT_COMPACTION_RATIO,
+                 analyze_ratio=DEFAULT_ANALYZE_RATIO):
+
+        self.tables = {}
+
+        self.relationships = {}
+
+        # Additional structures for indexing, query optimization, etc.
+
+        # With a database directory, tables live in paged heap files read through a bounded buffer pool
+
+        self.database_dir = database_dir
+
+        self.buffer_pool = None
+
+        # Row changes are logged to the write-ahead log and checkpointed once it reaches checkpoint_bytes
+
+        self.wal = None
+
+        self.checkpoint_bytes = checkpoint_bytes
+
+        # Deleted rows are tombstoned; a table is compacted once this fraction of its rows is dead
+
+        self.compaction_ratio = compaction_ratio
+
+        # ANALYZE builds a table's histograms; they are rebuilt once this fraction of its rows has changed
+
+        self.analyze_ratio = analyze_ratio
+
+        # While a query runs under EXPLAIN ('plan') or EXPLAIN ANALYZE ('analyze'), its plan is left in
+
+        # explain_plan, and measuring holds the nodes being measured with their memory baseline and peak
+
+        self.explaining = None
+
+        self.explain_plan = None
+
+        self.measuring = []
+
+        if database_dir is not None:
+
+            self.buffer_pool = BufferPool(buffer_pool_bytes)
+
+            os.makedirs(database_dir, exist_ok=True)
+
+            self.wal = WriteAheadLog(os.path.join(database_dir, WAL_FILE), async_commit_delay, async_commit_bytes)
+
+            self.open_database(database_dir)
+
+    # Persistent Storage Methods
+
+    def open_database(self, database_dir):
+
+        catalog_path = os.path.join(database_dir, CATALOG_FILE)
+
+        if not os.path.exists(catalog_path):
+
+            return
+
+        with open(catalog_path) as catalog_file:
+
+            saved_catalog = json.load(catalog_file)
+
+        for table_name, table_info in saved_catalog["tables"].items():
+
+            schema = table_info["columns"]
+
+            catalog = {column: position for position, column in enumerate(schema)}
+
+            self.tables[table_name] = {
+
+                "columns": schema,
+
+                "catalog": catalog,
+
+                "data": self.new_store(table_name, schema, catalog),
+
+                "primary_key": table_info["primary_key"],
+
+                "foreign_keys": {column: tuple(reference) for column, reference in table_info["foreign_keys"].items()}
+
+            }
+
+        # Bring the tables from their last checkpoint up to date before any index is built
+
+        self.recover()
+
+        # Indexes are not stored on disk; rebuild them from the table data
+
+        for table_name, table_info in saved_catalog["tables"].items():
+
+            if "indexes" in table_info:
+
+                self.tables[table_name]["indexes"] = {}
+
+                # Each key column is read from the heap once for all of the table's indexes
+
+                column_values = {}
+
+                for index_name, index_info in table_info["indexes"].items():
+
+                    # Older catalogs list only the columns, from before indexes could be non-unique
+
+                    if not isinstance(index_info, dict):
+
+                        index_info = {"columns": index_info, "unique": True}
+
+                    using = index_info.get("using", "btree")
+
+                    index = self.build_index(table_name, index_info["columns"], using, column_values)
+
+                    self.tables[table_name]["indexes"][index_name] = {'index': index,
+
+                                                                      'columns': index_info["columns"],
+
+                                                                      'unique': index_info["unique"],
+
+                                                                      'using': using,
+
+                                                                      'include': index_info.get("include", []),
+
+                                                                      'entries': None}
+
+                    index_info = self.tables[table_name]["indexes"][index_name]
+
+                    index_info['entries'] = self.build_entries(table_name, index_info)
+
+        print(f"Opened database {database_dir} with {len(self.tables)} tables.")
+
+    def new_store(self, table_name, schema, catalog, fresh=False):
+
+        if self.database_dir is None:
+
+            return ColumnStore(schema, catalog)
+
+        heap_path = os.path.join(self.database_dir, f"{table_name}.heap")
+
+        # A new table must not pick up a heap file left behind by an earlier table of the same name
+
+        if fresh:
+
+            for path in (heap_path, heap_path + '.dir'):
+
+                if os.path.exists(path):
+
+                    os.remove(path)
+
+        heap = HeapFile(heap_path, RowCodec(schema))
+
+        return PagedStore(schema, catalog, heap, self.buffer_pool)
+
+    def save_catalog(self):
+
+        # Write table schemas, keys and index definitions; the rows themselves live in the heap files
+
+        if self.database_dir is None:
+
+            return
+
+        saved_catalog = {"tables": {}}
+
+        for table_name, table in self.tables.items():
+
+            table_info = {
+
+                "columns": table["columns"],
+
+                "primary_key": table["primary_key"],
+
+                "foreign_keys": table["foreign_keys"]
+
+            }
+
+            if 'indexes' in table:
+
+                table_info["indexes"] = {index_name: {"columns": index_info['columns'], "unique": index_info['unique'],
+                                                      "using": index_info['using'], "include": index_info['include']}
+                                         for index_name, index_info in table['indexes'].items()}
+
+            saved_catalog["tables"][table_name] = table_info
+
+        catalog_path = os.path.join(self.database_dir, CATALOG_FILE)
+
+        with open(catalog_path + ".tmp", "w") as catalog_file:
+
+            json.dump(saved_catalog, catalog_file)
+
+        os.replace(catalog_path + ".tmp", catalog_path)
+
+    def recover(self):
+
+        # Replay the write-ahead log over the checkpointed tables. Each heap directory records the LSN
+
+        # it was checkpointed at, so records it already contains are skipped.
+
+        records = self.wal.read_records()
+
+        replayed = 0
+
+        for lsn, record in records:
+
+            operation, table_name = record[0], record[1]
+
+            if table_name not in self.tables:
+
+                continue
+
+            store = self.tables[table_name]["data"]
+
+            self.wal.next_lsn = max(self.wal.next_lsn, store.heap.checkpoint_lsn + 1)
+
+            if lsn <= store.heap.checkpoint_lsn:
+
+                continue
+
+            if operation == 'insert':
+
+                store.append(record[2])
+
+            elif operation == 'bulk_insert':
+
+                store.extend(record[2])
+
+            elif operation == 'update':
+
+                for row_id in record[2]:
+
+                    for position, value in record[3]:
+
+                        store.set_value(row_id, position, value)
+
+            elif operation == 'delete':
+
+                store.delete_rows(set(record[2]))
+
+            replayed += 1
+
+        for table in self.tables.values():
+
+            self.wal.next_lsn = max(self.wal.next_lsn, table["data"].heap.checkpoint_lsn + 1)
+
+        if replayed:
+
+            print(f"Recovered {replayed} changes from the write-ahead log.")
+
+            self.checkpoint()
+
+    def log_change(self, *record):
+
+        # Queue a logical change for the write-ahead log; it becomes durable at the next commit
+
+        if self.wal is not None:
+
+            self.wal.append(record)
+
+    def commit(self):
+
+        if self.wal is None:
+
+            return
+
+        self.wal.commit()
+
+        if self.wal.size() >= self.checkpoint_bytes:
+
+            self.checkpoint()
+
+    def checkpoint(self):
+
+        # Write every dirty page and page directory back to disk, then drop the log records they cover
+
+        if self.database_dir is None:
+
+            return
+
+        self.wal.commit()
+
+        checkpoint_lsn = self.wal.next_lsn - 1
+
+        for table in self.tables.values():
+
+            table["data"].checkpoint(checkpoint_lsn)
+
+        self.save_catalog()
+
+        self.wal.truncate()
+
+    def close(self):
+
+        if self.database_dir is None:
+
+            return
+
+        self.checkpoint()
+
+        for table in self.tables.values():
+
+            table["data"].close()
+
+        self.wal.close()
+
+        self.tables = {}
+
+    def save_snapshot(self, path):
+
+        # Write every table, its schema and its index contents into one snapshot file
+
+        try:
+            writer = SnapshotWriter(path)
+
+        except FileNotFoundError:
+            print(f"Cannot write snapshot {path}: its directory does not exist.")
+
+            return
+
+        metadata = {"tables": {table_name: writer.write_table(table) for table_name, table in self.tables.items()}}
+
+        writer.finish(metadata)
+
+        print(f"Snapshot of {len(self.tables)} tables written to {path}")
+
+    def open_snapshot(self, path):
+
+        # Replace the in-memory tables with the ones in a snapshot file. The column buffers stay in the
+
+        # read-only mapping until a table is first written to.
+
+        if self.database_dir is not None:
+
+            print("Snapshots can only be opened by an in-memory database.")
+
+            return
+
+        try:
+            reader = SnapshotReader(path)
+
+        except FileNotFoundError:
+            print(f"Snapshot {path} does not exist.")
+
+            return
+
+        self.tables = {table_name: reader.read_table(table_info) for table_name, table_info in reader.metadata["tables"].items()}
+
+        print(f"Opened snapshot {path} with {len(self.tables)} tables.")
+
+    def parse_sql(self, sql_query):
+
+        # INSERT statements are left ungrouped: they are only read as a flat token stream, and grouping
+
+        # a long VALUES list costs several times the tokenizing
+
+        parsed_statement = list(parse_statements(sql_query, ('INSERT',)))
+
+        self.execute(parsed_statement)
+
+    def execute(self, parsed_statements):
+
+        # Parse the SQL query
+
+        # Handle each parsed statement
+
+        start_time = time.perf_counter()
+
+
+        for statement in parsed_statements:
+
+            # Tokenize the statement to extract the command type
+
+            tokens = statement.tokens
+
+            first_token = tokens[0]
+
+            if first_token.ttype is Keyword.DML:
+
+                # Handle DML commands (INSERT, SELECT)
+
+                if statement.get_type() == 'INSERT':
+
+                    self.extract_insert_data(statement)
+
+
+
+                elif statement.get_type() == 'SELECT':
+
+                    # print("Calling Select properly!")
+
+                    self.extract_select_data(statement)
+
+
+
+                elif statement.get_type() == 'DELETE':
+
+                    self.extract_delete_data(statement)
+
+
+
+                elif statement.get_type() == 'UPDATE':
+
+                    self.extract_update_data(statement)
+
+
+
+
+
+
+
+
+
+
+
+            elif first_token.ttype is Keyword.DDL:
+
+                # Handle DDL commands (CREATE TABLE, DROP TABLE)
+
+                if statement.get_type() == 'CREATE':
+
+                    self.create_manager(statement)
+
+
+
+
+
+
+
+                elif statement.get_type() == 'DROP':
+
+                    self.drop_manager(statement)
+
+
+
+            elif first_token.ttype is Keyword:
+
+                # Handle utility commands (COPY, CHECK TABLE, VACUUM, ANALYZE, EXPLAIN, SNAPSHOT TO, OPEN SNAPSHOT)
+
+                self.command_manager(statement)
+
+
+
+            else:
+
+                print("Invalid SQL Argument")
+
+                return
+
+        end_time = time.perf_counter()
+
+        execution_time = end_time - start_time
+
+        print(f"The query: took {execution_time} seconds to execute.")
+
+    # Database Definition Language (DDL) Methods
+
+    def create_manager(self, statement):
+
+        # Determine whether it's a table or index creation
+
+        create_table = False
+
+        create_index = False
+
+        for token in statement.tokens:
+
+            if token.ttype is Keyword.DDL and token.value.upper() == 'CREATE':
+                continue
+
+            if token.ttype is Keyword and token.value.upper() == 'TABLE':
+                create_table = True
+
+                break
+
+            if token.ttype is Keyword and token.value.upper() == 'INDEX':
+                create_index = True
+
+                break
+
+        if create_table:
+
+            self.extract_create_table_data(statement)
+
+
+
+
+
+
+
+        elif create_index:
+
+            self.extract_create_index_data(statement)  # Pass the original statement
+
+    def command_manager(self, statement):
+
+        # Utility commands are told apart by their leading keywords
+
+        words = [token.value.upper() for token in statement.flatten() if token.ttype is Keyword]
+
+        if words[0] == 'VACUUM':
+
+            self.extract_vacuum_data(statement)
+
+        elif words[0] == 'ANALYZE':
+
+            self.extract_analyze_data(statement)
+
+        elif words[0] == 'EXPLAIN':
+
+            self.extract_explain_data(statement)
+
+        elif words[0] == 'COPY':
+
+            self.extract_copy_data(statement)
+
+        elif words[:2] == ['CHECK', 'TABLE']:
+
+            self.extract_check_data(statement)
+
+        elif words[:2] == ['SNAPSHOT', 'TO']:
+
+            self.save_snapshot(self.extract_path(statement, 2))
+
+        elif words[:2] == ['OPEN', 'SNAPSHOT']:
+
+            self.open_snapshot(self.extract_path(statement, 2))
+
+        else:
+
+            print("Invalid SQL Argument")
+
+    def extract_vacuum_data(self, statement):
+
+        # VACUUM [table]: compact one table, or every table when none is named
+
+        table_names = [token.value for token in statement.flatten() if token.ttype is Name]
+
+        for table_name in table_names or list(self.tables):
+
+            if table_name not in self.tables:
+
+                print(f"Table {table_name} does not exist.")
+
+                continue
+
+            removed = self.compact(table_name)
+
+            print(f"Compacted {table_name}: removed {removed} deleted rows.")
+
+    def extract_analyze_data(self, statement):
+
+        # ANALYZE [table]: build the histograms of one table, or of every table when none is named
+
+        table_names = [token.value for token in statement.flatten() if token.ttype is Name]
+
+        for table_name in table_names or list(self.tables):
+
+            if table_name not in self.tables:
+
+                print(f"Table {table_name} does not exist.")
+
+                continue
+
+            sampled = self.analyze(table_name)
+
+            print(f"Analyzed {table_name}: {len(self.tables[table_name]['data'])} rows, {sampled} sampled.")
+
+    def extract_explain_data(self, statement):
+
+        # EXPLAIN [ANALYZE] SELECT ...: the plan of the query, or with ANALYZE the plan it ran with and what
+
+        # each operator did. The query is the rest of the statement from its SELECT.
+
+        words = [token.value.upper() for token in statement.flatten() if token.ttype is Keyword]
+
+        tokens = list(statement.flatten())
+
+        selects = [position for position, token in enumerate(tokens) if token.ttype is DML and token.value.upper() == 'SELECT']
+
+        if not selects:
+
+            print("EXPLAIN supports SELECT statements only.")
+
+            return
+
+        query = ''.join(token.value for token in tokens[selects[0]:])
+
+        self.explain(next(parse_statements(query)), len(words) > 1 and words[1] == 'ANALYZE')
+
+    def explain(self, statement, analyze=False):
+
+        # Plan the SELECT without running it. Its output is held back, and only printed when no plan came
+
+        # out of it, such as the message for a missing table.
+
+        self.explain_plan = None
+
+        self.explaining = 'plan'
+
+        try:
+
+            with redirect_stdout(io.StringIO()) as output:
+
+                self.extract_select_data(statement)
+
+        finally:
+
+            self.explaining = None
+
+        if self.explain_plan is None:
+
+            print(output.getvalue(), end='')
+
+            return
+
+        # EXPLAIN ANALYZE runs the query with its rows discarded and memory traced, which slows it down
+
+        if analyze:
+
+            tracing = tracemalloc.is_tracing()
+
+            if not tracing:
+
+                tracemalloc.start()
+
+            self.explaining = 'analyze'
+
+            start_time = time.perf_counter()
+
+            try:
+
+                with open(os.devnull, 'w') as discarded, redirect_stdout(discarded):
+
+                    self.extract_select_data(statement)
+
+            finally:
+
+                self.explaining = None
+
+                self.measuring = []
+
+                if not tracing:
+
+                    tracemalloc.stop()
+
+            execution_time = time.perf_counter() - start_time
+
+        for line in self.explain_plan.lines(analyze):
+
+            print(line)
+
+        if analyze:
+
+            print(f"Execution time: {execution_time * 1000:.3f} ms")
+
+        self.explain_plan = None
+
+    @contextmanager
+
+    def measure(self, node):
+
+        # Count one loop of a plan node with its wall time and the peak memory allocated while it ran.
+
+        # tracemalloc keeps a single peak, so it is folded into every node being measured and reset whenever
+
+        # a node starts or stops. A node of None, as outside EXPLAIN ANALYZE, is not measured.
+
+        if node is None:
+
+            yield
+
+            return
+
+        self.fold_peak_memory()
+
+        current = tracemalloc.get_traced_memory()[0]
+
+        frame = [current, current]
+
+        self.measuring.append(frame)
+
+        start_time = time.perf_counter()
+
+        try:
+
+            yield
+
+        finally:
+
+            node.elapsed += time.perf_counter() - start_time
+
+            node.loops += 1
+
+            self.fold_peak_memory()
+
+            self.measuring.remove(frame)
+
+            node.peak_memory = max(node.peak_memory or 0, frame[1] - frame[0])
+
+    def fold_peak_memory(self):
+
+        peak = tracemalloc.get_traced_memory()[1]
+
+        for frame in self.measuring:
+
+            frame[1] = max(frame[1], peak)
+
+        tracemalloc.reset_peak()
+
+    def traced_probe(self, node, probe):
+
+        # An index probe that counts each call as a loop of node, with the row ids it found and its time
+
+        def traced(key):
+
+            start_time = time.perf_counter()
+
+            row_ids = probe(key)
+
+            node.elapsed += time.perf_counter() - start_time
+
+            node.loops += 1
+
+            node.rows += len(row_ids)
+
+            return row_ids
+
+        return traced
+
+    def describe_condition(self, condition):
+
+        column, operator, value = condition
+
+        if operator == 'BETWEEN':
+
+            return f"{column} BETWEEN {value[0]!r} AND {value[1]!r}"
+
+        return f"{column} {operator} {value!r}"
+
+    def condition_selectivity(self, table_name, column, operator, value):
+
+        # Estimated fraction of a table's rows satisfying a condition whose value is already converted
+
+        table = self.tables[table_name]
+
+        if column not in table["columns"] or not len(table["data"]):
+
+            return 0.0
+
+        return self.column_histogram(table_name, column).selectivity(operator, value)
+
+    def plan_conditions(self, table_name, conditions, logical_operator=None):
+
+        # A plan node for each step of match_rows, each over the one before, with the rows estimated to
+
+        # have matched once it has run. Selectivities are taken as independent.
+
+        rows = len(self.tables[table_name]["data"])
+
+        nodes = []
+
+        kept = 0.0 if logical_operator == 'OR' else 1.0
+
+        for path, step_conditions, index_name in self.access_paths(table_name, conditions, logical_operator):
+
+            for condition in step_conditions:
+
+                fraction = self.condition_selectivity(table_name, *condition)
+
+                kept = kept + fraction - kept * fraction if logical_operator == 'OR' else kept * fraction
+
+            described = f" {logical_operator or 'AND'} ".join(self.describe_condition(condition) for condition in step_conditions)
+
+            column, operator, _ = step_conditions[0]
+
+            if path == 'bitmap':
+
+                names = ", ".join(dict.fromkeys(self.bitmap_index(table_name, *condition) for condition in step_conditions))
+
+                label = f"Bitmap Index Scan using {names} on {table_name}: {described}"
+
+            elif path == 'composite':
+
+                label = f"Index Scan using {index_name} on {table_name}: {described}"
+
+            elif path == 'index':
+
+                kind = "Bitmap Index Scan" if self.tables[table_name]['indexes'][index_name]['using'] == 'bitmap' else "Index Scan"
+
+                label = f"{kind} using {index_name} on {table_name}: {described}"
+
+            elif path == 'scan' and not nodes:
+
+                zones = operator == 'BETWEEN' or COMPARISONS[operator] in ZONE_CHECKS
+
+                label = f"Seq Scan on {table_name}{' using zone maps' if zones else ''}: {described}"
+
+            elif path == 'scan' and logical_operator == 'OR':
+
+                label = f"Seq Scan of the unmatched rows of {table_name}: {described}"
+
+            elif path == 'scan':
+
+                label = f"Filter: {described}"
+
+            else:
+
+                label = f"No Match: {described}"
+
+            if nodes and logical_operator == 'OR':
+
+                label = f"Union with {label}"
+
+            nodes.append(PlanNode(label, rows * kept, nodes[-1:]))
+
+        return nodes
+
+    def extract_check_data(self, statement):
+
+        # CHECK TABLE [table]: verify the indexes of one table, or of every table when none is named
+
+        table_names = [token.value for token in statement.flatten() if token.ttype is Name]
+
+        for table_name in table_names or list(self.tables):
+
+            if table_name not in self.tables:
+
+                print(f"Table {table_name} does not exist.")
+
+                continue
+
+            problems = self.verify_indexes(table_name)
+
+            for problem in problems:
+
+                print(problem)
+
+            print(f"Checked {len(self.tables[table_name].get('indexes', {}))} indexes on {table_name}: {len(problems)} problems found.")
+
+    def extract_path(self, statement, keyword_count):
+
+        # The file path is everything after the leading keywords, quoted or not
+
+        path = ""
+
+        for token in statement.flatten():
+
+            if keyword_count:
+
+                if token.ttype is Keyword:
+
+                    keyword_count -= 1
+
+                continue
+
+            path += token.value
+
+        return path.strip().rstrip(';').strip().strip("'\"")
+
+    def drop_manager(self, statement):
+
+        # Determine whether it's a table or index drop
+
+        drop_table = False
+
+        drop_index = False
+
+        for token in statement.tokens:
+
+            if token.ttype is Keyword.DDL and token.value.upper() == 'DROP':
+                continue
+
+            if token.ttype is Keyword and token.value.upper() == 'TABLE':
+                drop_table = True
+
+                break
+
+            if token.ttype is Keyword and token.value.upper() == 'INDEX':
+                drop_index = True
+
+                break
+
+        if drop_table:
+
+            self.extract_drop_table_data(statement)
+
+
+
+
+
+
+
+        elif drop_index:
+
+            self.extract_drop_index_data(statement)  # Pass the original statement
+
+    def extract_create_table_data(self, statement):
+
+        table_name = None
+
+        schema = {}
+
+        create_found = False
+
+        table_found = False
+
+        schema_next = False
+
+        column_names = []
+
+        column_types = []
+
+        type_next = False
+
+        column_next = False
+
+        primary_found = False
+
+        primary_key_next = False
+
+        primary_key_found = False
+
+        primary_key = None
+
+        foreign_key_found = False
+
+        foreign_table_next = False
+
+        foreign_table_name = None
+
+        key_found = False
+
+        current_table_reference = None
+
+        foreign_column_found = False
+
+        foreign_reference_found = False
+
+        foreign_key = None
+
+        foreign_table_found = False
+
+        for token in statement.flatten():
+
+            if token.ttype is Keyword.DDL and token.value.upper() == 'CREATE':
+                create_found = True
+
+                continue
+
+            if create_found and not schema_next and token.ttype is Keyword and token.value.upper() == 'TABLE':
+                table_found = True
+
+                continue
+
+            if not primary_found and token.ttype is not Punctuation and not token.is_whitespace and token.value.upper() == "PRIMARY":
+                primary_found = True
+
+                continue
+
+            if foreign_key_found and not key_found and token.value.upper() == "KEY":
+                key_found = True
+
+                foreign_table_next = True
+
+                continue
+
+            if primary_found and token.value.upper() == "KEY":
+                primary_key_next = True
+
+                continue
+
+            if not foreign_key_found and token.value.upper() == "FOREIGN":
+                foreign_key_found = True
+
+                continue
+
+            if foreign_key_found and foreign_table_next and token.ttype is not Punctuation and not token.is_whitespace:
+                current_table_reference = token.value
+
+                foreign_column_found = True
+
+                foreign_table_next = False
+
+                continue
+
+            if foreign_column_found and token.value.upper() == "REFERENCES":
+                foreign_reference_found = True
+
+                continue
+
+            if foreign_column_found and not foreign_table_found and foreign_reference_found and token.ttype is not Punctuation and not token.is_whitespace:
+                foreign_table_name = token.value
+
+                foreign_table_found = True
+
+                continue
+
+            if foreign_table_found and token.ttype is not Punctuation and not token.is_whitespace:
+                reference_column = token.value
+
+                continue
+
+            if not primary_key_found and primary_key_next and token.ttype is not Punctuation and not token.is_whitespace:
+                primary_key_next = False
+
+                primary_key = token.value
+
+                primary_key_found = True
+
+            if table_found and not schema_next and not token.is_whitespace and token.ttype is not Punctuation:
+
+                if table_name is None:
+                    table_name = token.value
+
+                    schema_next = True
+
+                    continue
+
+            if schema_next and token.ttype is not Whitespace and token.ttype is not Punctuation:
+
+                # Parsing column definitions for the schema
+
+                if not type_next and token.ttype is not Punctuation and not token.is_whitespace:
+
+                    column_name = token.value
+
+                    column_names.append(column_name)
+
+                    type_next = True
+
+                    continue
+
+
+
+                elif token.ttype is Name.Builtin:
+
+                    column_type = token.value
+
+                    column_types.append(column_type)
+
+                    type_next = False
+
+                    continue
+
+        schema = {name: type for name, type in zip(column_names, column_types)}
+
+        # print(schema)
+
+        # Once table name and schema are extracted, create the table
+
+        if table_name and schema:
+
+            self.create_table(table_name, schema)
+
+
+
+        else:
+
+            print("Error creating table")
+
+        if primary_key_found:
+            self.create_index(primary_key, table_name, primary_key, unique=True)
+
+        if foreign_key_found:
+            self.create_foreign_key(table_name, current_table_reference, foreign_table_name, reference_column)
+
+    def create_foreign_key(self, table_name, curr_table_column, foreign_table, foreign_column):
+
+        # Check if both tables exist
+
+        if table_name not in self.tables:
+            raise Exception(f"Table {table_name} does not exist.")
+
+        if foreign_table not in self.tables:
+            raise Exception(f"Referenced table {foreign_table} does not exist.")
+
+        # Check if the foreign key column exists in the current table
+
+        if curr_table_column not in self.tables[table_name]["columns"]:
+            raise Exception(f"Column {curr_table_column} does not exist in table {table_name}.")
+
+        # Check if the referenced column exists in the foreign table
+
+        if foreign_column not in self.tables[foreign_table]["columns"]:
+            raise Exception(f"Referenced column {foreign_column} does not exist in table {foreign_table}.")
+
+        # Add foreign key information to the current table's schema
+
+        self.tables[table_name]["foreign_keys"][curr_table_column] = (foreign_table, foreign_column)
+
+        self.save_catalog()
+
+        print(f"Foreign key added to {table_name}: {curr_table_column} references {foreign_table}({foreign_column})")
+
+        self.create_reference_index(foreign_table, foreign_column)
+
+    def create_reference_index(self, table_name, column):
+
+        # Foreign key checks probe an index on the referenced column. A primary key already has one;
+
+        # otherwise a hash index is built, since the checks only ever look up whole values.
+
+        if self.find_suitable_index(table_name, [column]) is None:
+
+            self.create_index(f"{column}_ref", table_name, [column], using='hash')
+
+    def reference_probe(self, table_name, column):
+
+        # A function telling whether the referenced column holds a value: one probe of an index leading
+
+        # with the column, or membership in a set of the column's values if it has none
+
+        match = self.find_suitable_index(table_name, [column])
+
+        if match is None:
+
+            return set(self.tables[table_name]["data"].column_values(column)).__contains__
+
+        probe = self.index_probe(match[0], 1)
+
+        return lambda value: self.index_accepts(table_name, column, value) and len(probe((value,))) > 0
+
+    def create_table(self, table_name, schema, primary_key=None, foreign_keys=None):
+
+        if table_name in self.tables:
+
+            raise Exception(f"Table {table_name} already exists.")
+
+        else:
+
+            # The catalog resolves each column name to its position once, for every later row access
+
+            catalog = {column: position for position, column in enumerate(schema)}
+
+            self.tables[table_name] = {
+
+                "columns": schema,
+
+                "catalog": catalog,
+
+                "data": self.new_store(table_name, schema, catalog, fresh=True),
+
+                "primary_key": primary_key if primary_key else [],
+
+                "foreign_keys": foreign_keys if foreign_keys else {}  # Initialize as empty dict if not provided
+
+            }
+
+            # Checkpoint on schema changes so the write-ahead log never spans a table's creation or removal
+
+            self.checkpoint()
+
+        print(f"Table {table_name} created with schema {schema}")
+
+        for ref_table, ref_column in (foreign_keys or {}).values():
+
+            self.create_reference_index(ref_table, ref_column)
+
+    def extract_drop_table_data(self, statement):
+
+        table_name = None
+
+        drop_found = False
+
+        table_found = False
+
+        for token in statement.flatten():
+
+            if token.ttype is Keyword.DDL and token.value.upper() == 'DROP':
+                drop_found = True
+
+                continue
+
+            if drop_found and token.ttype is Keyword and token.value.upper() == 'TABLE':
+                table_found = True
+
+                continue
+
+            if table_found and not token.is_whitespace and token.ttype is not Punctuation:
+
+                if table_name is None:
+                    table_name = token.value
+
+                    # print("WE HAVE FOUND THE TABLE NAME AND IT IS  :  ", table_name)
+
+                    continue
+
+        if table_name:
+
+            self.drop_table(table_name)
+
+
+
+        else:
+
+            print("Error dropping table")
+
+    def drop_table(self, table_name):
+
+        # Check if the table exists
+
+        if table_name in self.tables:
+
+            self.checkpoint()
+
+            # Remove the table from the dictionary, along with its heap file when it is stored on disk
+
+            if isinstance(self.tables[table_name]["data"], PagedStore):
+
+                self.tables[table_name]["data"].drop()
+
+            del self.tables[table_name]
+
+            self.save_catalog()
+
+            print(f"Table {table_name} has been dropped.")
+
+        else:
+
+            # If the table does not exist, print an error message
+
+            print(f"Table {table_name} does not exist and cannot be dropped.")
+
+    # Indexing Methods
+
+    def extract_create_index_data(self, statement):
+
+        index_name = None
+
+        index_found = False
+
+        index_name_found = False
+
+        column_next = False
+
+        table_name = None
+
+        columns = []
+
+        create_index_found = False
+
+        on_found = False
+
+        unique = False
+
+        using = 'btree'
+
+        using_next = False
+
+        include = []
+
+        include_next = False
+
+        for token in statement.flatten():
+
+            if token.ttype is Keyword and token.value.upper() == 'UNIQUE':
+                unique = True
+
+                continue
+
+            if create_index_found and token.ttype is Name and index_name is None:
+                index_name = token.value
+
+                continue
+
+            if token.ttype is Keyword.DML and token.value.upper() == 'CREATE':
+                create_index_found = True
+
+                continue
+
+            if token.ttype is Keyword and token.value.upper() == 'INDEX':
+                index_found = True
+
+                continue
+
+            if index_found and not index_name_found and token.ttype is Name:
+                index_name = token.value
+
+                index_name_found = True
+
+            if token.ttype is Keyword and token.value.upper() == 'ON':
+                on_found = True
+
+                continue
+
+            if on_found and token.ttype is Name and table_name is None:
+                table_name = token.value
+
+                column_next = True
+
+                continue
+
+            # USING BTREE | HASH, before or after the column list
+
+            if token.ttype is Keyword and token.value.upper() == 'USING':
+                using_next = True
+
+                continue
+
+            if using_next and not token.is_whitespace:
+                using = token.value.lower()
+
+                using_next = False
+
+                continue
+
+            # INCLUDE (columns) names the extra columns a covering index stores with its entries
+
+            if token.ttype is Keyword and token.value.upper() == 'INCLUDE':
+                include_next = True
+
+                continue
+
+            if include_next and token.ttype is Punctuation and token.value == ')':
+                include_next = False
+
+                continue
+
+            if include_next and token.ttype is not Punctuation and not token.is_whitespace:
+                include.append(token.value)
+
+                continue
+
+            if column_next and token.ttype is not Punctuation and not token.is_whitespace:
+                column = token.value
+
+                columns.append(column)
+
+        self.create_index(index_name, table_name, columns, unique, using, include)
+
+    def create_index(self, index_name, table_name, columns, unique=False, using='btree', include=None):
+
+        # A unique index doubles as a constraint: inserts and updates that would repeat a key are refused.
+
+        # A hash index answers equality lookups only, but probes a dict instead of descending a B-tree.
+
+        # The INCLUDE columns of a covering index are stored with its entries so that queries reading
+
+        # nothing else are answered without going back to the table.
+
+        if table_name not in self.tables:
+            print(f"Table {table_name} does not exist.")
+
+            return
+
+        if 'indexes' not in self.tables[table_name]:
+            self.tables[table_name]['indexes'] = {}
+
+        if index_name in self.tables[table_name]['indexes']:
+            print(f"Index {index_name} already exists on table {table_name}.")
+
+            return
+
+        if using not in INDEX_TYPES:
+            print(f"Unsupported index type {using}; expected one of {', '.join(INDEX_TYPES)}.")
+
+            return
+
+        include = list(include or [])
+
+        for column in (columns if isinstance(columns, list) else [columns]) + include:
+
+            if column not in self.tables[table_name]['columns']:
+                print(f"Column {column} does not exist in table {table_name}.")
+
+                return
+
+        index = self.build_index(table_name, columns, using)
+
+        if unique:
+
+            for index_key, posting in index.items():
+
+                if len(posting) > 1:
+                    print(f"Cannot create unique index {index_name}: key {index_key} is held by {len(posting)} rows.")
+
+                    return
+
+        # Store the index along with the column names
+
+        index_info = {'index': index, 'columns': columns, 'unique': unique, 'using': using, 'include': include, 'entries': None}
+
+        index_info['entries'] = self.build_entries(table_name, index_info)
+
+        self.tables[table_name]['indexes'][index_name] = index_info
+
+        self.save_catalog()
+
+        print(f"{'Unique index' if unique else 'Index'} {index_name} created on table {table_name} for columns {columns}"
+
+              + (f" including {include}" if include else "") + (f" using {using}" if using != 'btree' else ""))
+
+    def build_index(self, table_name, columns, using='btree', column_values=None):
+
+        # Create a new index over the rows already in the table. Each key maps to an array('q') of row ids
+
+        # in ascending order, or to a Bitmap. Rather than probing the index once per row, the key columns
+
+        # are read whole, the row positions are sorted by key once (a stable sort, so each key's row ids
+
+        # stay in order) and cut into one posting list per run of equal keys, and the index is filled in
+
+        # key order. Indexes built together can share column_values, a dict of the live values read so far.
+
+        index_columns = columns if isinstance(columns, list) else [columns]
+
+        index = new_index(using, [self.tables[table_name]["columns"][col] for col in index_columns])
+
+        store = self.tables[table_name]["data"]
+
+        column_values = {} if column_values is None else column_values
+
+        for col in index_columns:
+
+            if col not in column_values:
+                column_values[col] = list(store.column_values(col))
+
+        if not len(store):
+
+            return index
+
+        # A posting list and a key per distinct value would set the cyclic garbage collector off over and
+
+        # over on a big table, though none of them can form a cycle, so it waits until the index is built
+
+        collecting = gc.isenabled()
+
+        gc.disable()
+
+        try:
+
+            self.fill_index(index, [column_values[col] for col in index_columns], store.row_ids())
+
+        finally:
+
+            if collecting:
+                gc.enable()
+
+        return index
+
+    def fill_index(self, index, key_columns, row_ids):
+
+        # Fill an empty index, in key order, from the values of its key columns in the rows with the given row ids
+
+        keys = key_columns[0] if len(key_columns) == 1 else list(zip(*key_columns))
+
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+
+        sorted_keys = list(map(keys.__getitem__, order))
+
+        order = array('q', order if isinstance(row_ids, range) else map(row_ids.__getitem__, order))
+
+        starts = [0]
+
+        starts.extend(compress(count(1), map(operator.ne, sorted_keys[1:], sorted_keys)))
+
+        starts.append(len(order))
+
+        postings = [order[start:end] for start, end in zip(starts, starts[1:])]
+
+        if isinstance(index, BitmapIndex):
+
+            postings = [Bitmap(posting) for posting in postings]
+
+        if len(key_columns) == 1:
+
+            index.update([((sorted_keys[start],), posting) for start, posting in zip(starts, postings)])
+
+        else:
+
+            index.update([(sorted_keys[start], posting) for start, posting in zip(starts, postings)])
+
+    def build_entries(self, table_name, index_info):
+
+        # The entries of a covering index: a B-tree from the index key with the row id on the end to the
+
+        # row's INCLUDE values, so a key range of the table is read in one walk. None without INCLUDE.
+
+        if not index_info['include']:
+
+            return None
+
+        store = self.tables[table_name]["data"]
+
+        entries = OOBTree()
+
+        entries.update(self.entry_items(table_name, index_info, zip(store.row_ids(), store.rows())))
+
+        return entries
+
+    def entry_items(self, table_name, index_info, rows):
+
+        # (entry key, included values) of each (row id, row) pair for a covering index's entries tree
+
+        positions = self.index_positions(table_name, index_info)
+
+        include_positions = [self.tables[table_name]["catalog"][column] for column in index_info['include']]
+
+        return [(tuple(row[position] for position in positions) + (row_id,), tuple(row[position] for position in include_positions))
+
+                for row_id, row in rows]
+
+    def extract_drop_index_data(self, statement):
+
+        index_name = None
+
+        table_name = None  # If your DROP INDEX syntax requires specifying the table name
+
+        table_found = False
+
+        on_found = False
+
+        drop_index_found = False
+
+        index_found = False
+
+        for token in statement.flatten():
+
+            if token.ttype is Keyword.DDL and token.value.upper() == 'DROP':
+                drop_index_found = True
+
+                continue
+
+            if drop_index_found and token.ttype is Keyword and token.value.upper() == 'INDEX':
+                continue
+
+            if drop_index_found and not index_found and not token.is_whitespace and token.ttype is not Punctuation:
+                index_name = token.value
+
+                # print("INDEX FOUND  :  ", index_name)
 
-            if token.ttype is Keyword and token.value.upper() == 'INDEX':
                 index_found = True
 
-                continue
+                continue
+
+            if index_found and token.ttype is Keyword and token.value.upper() == "ON":
+                on_found = True
+
+                continue
+
+            if on_found and not token.is_whitespace and token.ttype is not Punctuation:
+                table_name = token.value
+
+                # print("Found Table Name  :  ", table_name)
+
+                table_found = True
+
+        if index_found and table_found:
+
+            self.drop_index(index_name, table_name)  # Pass the table name if needed
+
+
+
+
+
+
+
+        else:
+
+            print("Error: table or index not found")
+
+    def drop_index(self, index_name, table_name):
+
+        if table_name and table_name not in self.tables:
+            print(f"Table {table_name} does not exist.")
+
+            return
+
+        # Assuming each table has a 'indexes' dictionary where keys are index names
+
+        if index_name in self.tables[table_name]['indexes']:
+
+            indexes = self.tables[table_name]['indexes']
+
+            kept = list(indexes.items())
+
+            del indexes[index_name]
+
+            # Foreign key checks probe an index on the referenced column, so the last one left cannot be dropped
+
+            referenced = {ref_column for table in self.tables.values()
+
+                          for ref_table, ref_column in table['foreign_keys'].values() if ref_table == table_name}
+
+            unindexed = [column for column in referenced if self.find_suitable_index(table_name, [column]) is None]
+
+            if unindexed:
+
+                indexes.clear()
+
+                indexes.update(kept)
+
+                print(f"Cannot drop index {index_name}: foreign keys referencing {table_name}({unindexed[0]}) are checked through it.")
+
+                return
+
+            self.save_catalog()
+
+            print(f"Index {index_name} has been dropped from table {table_name}.")
+
+
+
+
+
+
+
+        else:
+
+            print(f"Index {index_name} does not exist in table {table_name}.")
+
+    # Data Manipulation Language (DML) Methods
+
+    def extract_insert_data(self, statement):
+
+        table_name = None
+
+        values = []
+
+        # One list of values per parenthesized row after VALUES
+
+        rows = []
+
+        insert_found = False
+
+        into_found = False
+
+        values_next = False
+
+        table_name_found = False
+
+        is_table_name_next = False  # Define this flag
+
+        for token in statement.flatten():
+
+            if token.ttype is Keyword.DML and token.value.upper() == 'INSERT':
+                insert_found = True
+
+                continue
+
+            if insert_found and token.ttype is Keyword and token.value.upper() == 'INTO':
+                into_found = True
+
+                is_table_name_next = True
+
+                continue
+
+            if into_found and is_table_name_next and table_name is None and not token.is_whitespace:
+                table_name = token.value
+
+                table_name_found = True
+
+                is_table_name_next = False
+
+                continue
+
+            if table_name_found and not is_table_name_next and token.ttype is Keyword and token.value.upper() == 'VALUES':
+                values_next = True
+
+                continue
+
+            if values_next and token.ttype is Punctuation and token.value == '(':
+                values = []
+
+                continue
+
+            if values_next and token.ttype is Punctuation and token.value == ')':
+                rows.append(values)
+
+                continue
+
+            if values_next and not token.is_whitespace and token.ttype is not Punctuation:
+                value = token.value.strip("'")
+
+                values.append(value)
+
+        # A single row keeps the plain insert path; a VALUES list is loaded as one batch
+
+        if len(rows) > 1:
+
+            self.bulk_insert(table_name, rows)
+
+        else:
+
+            self.insert(table_name, rows[0] if rows else values)
+
+    def insert(self, table_name, values):
+        # Check if the table exists
+        if table_name not in self.tables:
+            raise Exception(f"Table {table_name} does not exist.")
+
+        table = self.tables[table_name]
+        column_names = list(table["columns"].keys())
+
+        # Check if the number of values matches the number of columns
+        if len(values) != len(column_names):
+            raise Exception("Value count does not match column count.")
+
+        # Convert values to their correct types based on the schema
+        converted_values = []
+        for col, val in zip(column_names, values):
+            try:
+                if table["columns"][col].lower() == "integer":
+                    converted_value = int(val)
+                    # Integer columns are packed as signed 64-bit values
+                    if not -2 ** 63 <= converted_value < 2 ** 63:
+                        raise ValueError(val)
+                    converted_values.append(converted_value)
+                elif table["columns"][col].lower() == "float":
+                    converted_values.append(float(val))
+                elif table["columns"][col].lower() == "string":
+                    converted_values.append(str(val))
+                else:
+                    raise Exception(f"Unsupported data type for column {col}")
+            except ValueError as e:
+                raise Exception(f"Invalid value for column {col}: {val}")
+
+        catalog = table["catalog"]
+
+        # Check for foreign key constraints
+        if "foreign_keys" in table:
+            for fk_column, (ref_table, ref_column) in table["foreign_keys"].items():
+                fk_value = converted_values[catalog[fk_column]]
+                # Probe the index on the referenced column
+                if not self.reference_probe(ref_table, ref_column)(fk_value):
+                    print(f"Foreign key constraint violation: {fk_value} does not exist in {ref_table}({ref_column})")
+                    return
+
+        # Check if the record violates any unique index constraints
+        if 'indexes' in table:
+            for index_name, index_info in table['indexes'].items():
+                if not index_info['unique']:
+                    continue
+
+                index_columns = index_info['columns']
+
+                # Ensure index_columns is a list
+                if not isinstance(index_columns, list):
+                    index_columns = [index_columns]
+
+                # Create index key for the new record
+                index_key_parts = [converted_values[catalog[col]] if col in catalog else None for col in index_columns]
+                index_key = tuple(index_key_parts)
+
+                # Check if the index key already exists in the index
+                if index_key in index_info['index']:
+                    print(
+                        f"Unique constraint violation: Record with key {index_key} already exists in index {index_name}.")
+                    return
+
+        # If no unique constraints are violated, insert the record
+        new_row_id = table["data"].append(converted_values)
+
+        self.log_change('insert', table_name, converted_values)
+
+        # Update indexes
+        if 'indexes' in table:
+            for index_name, index_info in table['indexes'].items():
+                index_columns = index_info['columns']
+
+                # Ensure index_columns is a list
+                if not isinstance(index_columns, list):
+                    index_columns = [index_columns]
+
+                # Retrieve the index object
+                index = index_info['index']
+
+                # Create index key for the new record
+                index_key_parts = [converted_values[catalog[col]] if col in catalog else None for col in index_columns]
+                index_key = tuple(index_key_parts)
+
+                # Add new row ID to the index
+                self.add_index_entry(index, index_key, new_row_id)
+
+                if index_info['include']:
+                    index_info['entries'].update(self.entry_items(table_name, index_info, [(new_row_id, converted_values)]))
+
+        self.commit()
+
+    def extract_copy_data(self, statement):
+
+        # COPY table FROM 'file.csv' [HEADER]
+
+        table_name = None
+
+        path = None
+
+        header = False
+
+        for token in statement.flatten():
+
+            if token.value.upper() == 'HEADER':
+
+                header = True
+
+            elif token.ttype is Name and table_name is None:
+
+                table_name = token.value
+
+            elif token.ttype in Literal.String and path is None:
+
+                path = token.value.strip("'\"")
+
+        if table_name is None or path is None:
+
+            print("Error copying table: expected COPY table FROM 'file.csv'")
+
+            return
+
+        self.copy_from(table_name, path, header)
+
+    def copy_from(self, table_name, path, header=False):
+
+        # Stream a CSV file into bulk_insert. With a header row the file's columns are matched to the
+
+        # table by name, otherwise they must be in schema order. Rows are numbered by their line in the file.
+
+        if table_name not in self.tables:
+
+            print(f"Table {table_name} does not exist.")
+
+            return
+
+        try:
+            csv_file = open(path, newline='')
+
+        except FileNotFoundError:
+            print(f"File {path} does not exist.")
+
+            return
+
+        with csv_file:
+
+            reader = csv.reader(csv_file)
+
+            rows = reader
+
+            if header:
+
+                names = next(reader, [])
+
+                missing = [column for column in self.tables[table_name]["columns"] if column not in names]
+
+                if missing:
+
+                    print(f"Columns {missing} are missing from the header of {path}.")
+
+                    return
+
+                order = [names.index(column) for column in self.tables[table_name]["columns"]]
+
+                # A line with a different number of fields than the header is passed on empty, to be skipped as malformed
+
+                rows = ([row[position] for position in order] if len(row) == len(names) else [] for row in reader)
+
+            loaded = self.bulk_insert(table_name, rows, first_row_number=2 if header else 1)
+
+        print(f"Copied {loaded} rows into {table_name}.")
+
+    def bulk_insert(self, table_name, rows, chunk_rows=BULK_CHUNK_ROWS, first_row_number=1):
+
+        # Load many rows at once. The input is consumed chunk_rows at a time; each chunk is converted
+
+        # column by column, checked against the foreign keys and unique indexes as a batch and appended
+
+        # in one step, and the indexes take all the new keys at the end. Rows that break a constraint
+
+        # are skipped with the same message insert() prints, and malformed rows with a message giving
+
+        # their number, counted from first_row_number. Returns the number of rows loaded.
+
+        if table_name not in self.tables:
+            raise Exception(f"Table {table_name} does not exist.")
+
+        table = self.tables[table_name]
+
+        store = table["data"]
+
+        catalog = table["catalog"]
+
+        # Each chunk's foreign keys are semi-joined with the referenced column's index: every distinct
+
+        # value is probed once and only the values it lacks are looked for among the rows
+
+        references = [(catalog[fk_column], ref_table, ref_column, self.reference_probe(ref_table, ref_column))
+
+                      for fk_column, (ref_table, ref_column) in table["foreign_keys"].items()]
+
+        # Keys added by this load, per index, kept apart from the index until the end
+
+        indexes = []
+
+        for index_name, index_info in table.get('indexes', {}).items():
+
+            index_columns = index_info['columns'] if isinstance(index_info['columns'], list) else [index_info['columns']]
+
+            indexes.append((index_name, index_info['index'], [catalog.get(col) for col in index_columns], index_info['unique'], {}))
+
+        rows = iter(rows)
+
+        row_number = first_row_number
+
+        loaded = 0
+
+        # The keys of every chunk that was appended reach the indexes even when a later chunk fails
+
+        try:
+
+            while True:
+
+                chunk = list(islice(rows, chunk_rows))
+
+                if not chunk:
+                    break
+
+                columns = self.convert_rows(table_name, chunk, row_number)
+
+                row_number += len(chunk)
+
+                if not columns:
+                    continue
+
+                chunk_size = len(columns[0])
+
+                keep = [True] * chunk_size
+
+                index_keys = [list(zip(*[columns[position] if position is not None else [None] * chunk_size
+
+                                         for position in positions])) for _, _, positions, _, _ in indexes]
+
+                unique_keys = [(index_name, index, added, keys, set())
+
+                               for (index_name, index, _, unique, added), keys in zip(indexes, index_keys) if unique]
+
+                # The chunk is checked as a whole first. Only a chunk that breaks a constraint goes through
+
+                # the row by row pass, which reports the violations in the same order insert() would
+
+                missing = [{value for value in set(columns[position]) if not referenced(value)} for position, _, _, referenced in references]
+
+                clean = not any(missing) and \
+                    all(len(set(keys)) == len(keys) and added.keys().isdisjoint(keys) and not any(map(index.__contains__, keys))
+                        for _, index, added, keys, _ in unique_keys)
+
+                for offset in range(0 if clean else chunk_size):
+
+                    for (position, ref_table, ref_column, _), missing_values in zip(references, missing):
+
+                        if columns[position][offset] in missing_values:
+                            print(f"Foreign key constraint violation: {columns[position][offset]} does not exist in {ref_table}({ref_column})")
+                            keep[offset] = False
+                            break
+
+                    if not keep[offset]:
+                        continue
+
+                    for index_name, index, added, keys, claimed in unique_keys:
+
+                        if keys[offset] in index or keys[offset] in added or keys[offset] in claimed:
+                            print(f"Unique constraint violation: Record with key {keys[offset]} already exists in index {index_name}.")
+                            keep[offset] = False
+                            break
+
+                    else:
+
+                        for index_name, index, added, keys, claimed in unique_keys:
+                            claimed.add(keys[offset])
+
+                if not all(keep):
+
+                    columns = [[value for value, kept in zip(values, keep) if kept] for values in columns]
+
+                if not columns or not columns[0]:
+                    continue
+
+                first_row_id = store.row_count
+
+                store.extend(columns)
+
+                # Record the keys of the rows that made it, numbered from their row ids. On a unique index
+
+                # every one of them is new by now
+
+                for (_, _, _, unique, added), keys in zip(indexes, index_keys):
+
+                    if unique:
+
+                        added.update(zip(compress(keys, keep), ([row_id] for row_id in count(first_row_id))))
+
+                    else:
+
+                        for row_id, index_key in zip(count(first_row_id), compress(keys, keep)):
+                            added.setdefault(index_key, []).append(row_id)
+
+                for index_info in table.get('indexes', {}).values():
+
+                    if index_info['include']:
+                        index_info['entries'].update(self.entry_items(table_name, index_info, zip(count(first_row_id), zip(*columns))))
+
+                self.log_change('bulk_insert', table_name, columns)
+
+                self.commit()
+
+                loaded += len(columns[0])
+
+        finally:
+
+            # Add every new key to the indexes in key order. The loaded rows have the highest row ids, so on
+
+            # a non-unique index they go on the end of any posting list the key already has
+
+            for _, index, _, unique, added in indexes:
+
+                for index_key in ([] if unique else [index_key for index_key in added if index_key in index]):
+                    index[index_key].extend(added.pop(index_key))
+
+                index.update(sorted((index_key, new_posting(index, row_ids)) for index_key, row_ids in added.items()))
+
+        return loaded
+
+    def convert_rows(self, table_name, rows, first_row_number):
+
+        # Convert a chunk of rows column by column. When a row is malformed, every row is checked on its
+
+        # own and the bad ones are skipped with a message giving their number
+
+        column_names = list(self.tables[table_name]["columns"])
+
+        if all(len(row) == len(column_names) for row in rows):
+
+            try:
+                return [self.convert_column(table_name, column, values) for column, values in zip(column_names, zip(*rows))]
+
+            except Exception:
+                pass
+
+        well_formed = []
+
+        for row_number, row in enumerate(rows, first_row_number):
+
+            if len(row) != len(column_names):
+                print(f"Skipping row {row_number}: Value count does not match column count.")
+
+                continue
+
+            try:
+
+                for column, value in zip(column_names, row):
+                    self.convert_column(table_name, column, [value])
+
+            except Exception as error:
+                print(f"Skipping row {row_number}: {error}")
+
+                continue
+
+            well_formed.append(row)
+
+        return [self.convert_column(table_name, column, values) for column, values in zip(column_names, zip(*well_formed))]
+
+    def convert_column(self, table_name, column, values):
+
+        # Convert one column of raw values to the column's type in a single pass
+
+        column_type = self.tables[table_name]["columns"][column].lower()
+
+        converter = {"integer": int, "float": float, "string": str}.get(column_type)
+
+        if converter is None:
+            raise Exception(f"Unsupported data type for column {column}")
+
+        try:
+
+            converted = list(map(converter, values))
+
+        except (ValueError, TypeError):
+
+            for value in values:
+
+                try:
+                    converter(value)
+                except (ValueError, TypeError):
+                    raise Exception(f"Invalid value for column {column}: {value}")
+
+        # Integer columns are packed as signed 64-bit values
+
+        if column_type == "integer" and converted and not (-2 ** 63 <= min(converted) and max(converted) < 2 ** 63):
+
+            value = min(converted) if min(converted) < -2 ** 63 else max(converted)
+
+            raise Exception(f"Invalid value for column {column}: {value}")
+
+        return converted
+
+    def find_selectivity(self, table_name, column, operator='=', value=None):
+        # Check if the table exists
+        if table_name not in self.tables:
+            raise Exception(f"Table {table_name} does not exist.")
+
+        table = self.tables[table_name]
+
+        # Check if the column exists in the table
+        if column not in table["columns"]:
+            raise Exception(f"Column {column} does not exist in table {table_name}.")
+
+        if not len(table["data"]):
+            return 0
+
+        # Estimate the fraction of rows satisfying the condition from the column's histogram
+        if isinstance(value, (str, tuple)):
+            value = self.convert_condition_value(value)
+
+        return self.column_histogram(table_name, column).selectivity(operator, value)
+
+    def column_histogram(self, table_name, column):
+
+        # The column's histogram from the last ANALYZE, rebuilt first when more than analyze_ratio of the
+
+        # table's rows have changed since. A table never analyzed is described by its column statistics.
+
+        table = self.tables[table_name]
+
+        store = table["data"]
+
+        if "histograms" not in table:
+
+            return store.column_statistics(column).histogram(len(store))
+
+        changes, rows = table["analyzed"]
+
+        if store.changes - changes > self.analyze_ratio * rows:
+
+            self.analyze(table_name)
+
+        return table["histograms"][column]
+
+    def analyze(self, table_name):
+
+        # Build every column's most common values and equi-depth histogram, from all rows or a random
+
+        # sample of ANALYZE_SAMPLE_ROWS of them. The distinct counts come from the full column statistics.
+
+        # Returns the number of rows read.
+
+        table = self.tables[table_name]
+
+        store = table["data"]
+
+        row_ids = store.row_ids()
+
+        if len(row_ids) > ANALYZE_SAMPLE_ROWS:
+
+            rows = [store.row(row_id) for row_id in sorted(random.sample(row_ids, ANALYZE_SAMPLE_ROWS))]
+
+        else:
+
+            rows = list(store.rows())
+
+        samples = list(zip(*rows)) if rows else [()] * len(table["columns"])
+
+        table["histograms"] = {column: build_histogram(list(samples[position]),
+                                                       min(store.column_statistics(column).distinct(), len(store)))
+                               for column, position in table["catalog"].items()}
+
+        table["analyzed"] = (store.changes, len(store))
+
+        return len(rows)
+
+    def extract_delete_data(self, statement):
+
+        delete_found = False
+
+        from_found = False
+
+        table_found = False
+
+        table_name = None
+
+        where_found = False
+
+        operator_found = False
+
+        condition_found = False
+
+        column_found = False
+
+        columns = []
+
+        values = []
+
+        operators = []
+
+        logical_operator_found = False
+
+        operator = None
+
+        logical_operator = None
+
+        for token in statement.flatten():
+
+            # print("TOKEN VALUE  :  ", token.value, "  :  ", token.ttype)
+
+            if token.ttype is Keyword.DML and token.value.upper() == 'DELETE':
+                delete_found = True
+
+                continue
+
+            if delete_found and token.ttype is Keyword and token.value.upper() == 'FROM':
+                from_found = True
+
+                continue
+
+            if delete_found and from_found and not table_found and token.ttype is Name:
+                table_name = token.value
+
+                table_found = True
+
+                # print("Table Found  :  ", table_name)
+
+                continue
+
+            if table_found and not where_found and token.ttype is Keyword and token.value.upper() == 'WHERE':
+                where_found = True
+
+                # print("where...")
+
+                continue
+
+            if where_found and token.ttype is Keyword and (token.value.upper() == 'OR' or token.value.upper() == 'AND'):
+                # print("logical operator found: ", token.value.upper())
+
+                logical_operator = token.value.upper()
+
+                logical_operator_found = True
+
+                continue
+
+            if where_found and not operator_found and token.ttype is not Punctuation and token.ttype is not Operator.Comparison and not token.is_whitespace:
+                column = token.value.strip("'")
+
+                columns.append(column)
+
+                column_found = True
+
+                # print(" COLUMN FOUND  :  ", column)
+
+                continue
+
+            if column_found and token.ttype is Operator.Comparison and not operator_found:
+                operator_found = True
+
+                # print("OPERATOR  :  ", token.value)
+
+                operator = token.value
+
+                operators.append(operator)
+
+                continue
+
+            if not condition_found and where_found and operator_found and token.ttype is not Punctuation and token.ttype is not Operator.Comparison and not token.is_whitespace:
+                value = token.value.strip("'")
+
+                values.append(value)
+
+                # print("CONDITION  :  ", value)
+
+                condition_found = False
+
+                operator_found = False
+
+                column_found = False
+
+                continue
+
+        if logical_operator_found:
+
+            self.delete_multiple(table_name, columns, values, logical_operator, operators)
+
+        else:
+
+            self.delete(table_name, columns[0], values[0], operator)
+
+    def delete(self, table_name, column, value, operator):
+        if table_name not in self.tables:
+            print(f"Table {table_name} does not exist.")
+            return
+
+        table = self.tables[table_name]
+        table_schema = table["columns"]
+
+        if column not in table_schema:
+            print(f"Column {column} does not exist in table {table_name}.")
+            return
+
+        # Convert value based on column type
+        column_type = table_schema[column].lower()
+        if column_type == 'integer':
+            try:
+                value = int(value)
+            except ValueError:
+                print(f"Value {value} is not a valid integer.")
+                return
+        elif column_type == 'float':
+            try:
+                value = float(value)
+            except ValueError:
+                print(f"Value {value} is not a valid float.")
+                return
+        elif column_type == 'string':
+            value = str(value).strip("'\"")  # Strip quotes for string values
+
+        # Check if there's a suitable index
+        rows_to_delete = self.index_scan(table_name, column, operator, value)
+        index_used = rows_to_delete is not None
+
+        if not index_used:
+            # Fallback to full table scan over the condition column only
+            if operator not in COMPARISONS:
+                raise ValueError(f"Unsupported operator: {operator}")
+            compare = COMPARISONS[operator]
+            rows_to_delete = {row_id for row_id, row_value in table["data"].column_items(column)
+                              if compare(row_value, value)}
+
+        # Update the table data and its indexes
+        deleted_rows = self.delete_rows(table_name, rows_to_delete)
+
+        print(f"Deleted {deleted_rows} rows from {table_name}.")
+        if index_used:
+            print("Deletion performed using index.")
+        else:
+            print("Deletion performed using full table scan.")
+            # Evaluate condition
+
+    def evaluate_delete_condition(self, row, column, value, operator):
+
+        if column not in row:
+            return False
+
+        # Column buffers are typed, so the stored value already matches the converted condition value
+
+        if operator not in COMPARISONS:
+
+            raise ValueError(f"Unsupported operator: {operator}")
+
+        return COMPARISONS[operator](row[column], value)
+
+    def delete_multiple(self, table_name, columns, values, logical_operator, operators):
+
+        if table_name not in self.tables:
+            print(f"Table {table_name} does not exist.")
+
+            return
+
+        table_schema = self.tables[table_name]["columns"]
+
+        # Calculate selectivity for each condition
+
+        conditions_with_selectivity = []
+
+        for column, value, comparison in zip(columns, values, operators):
+            selectivity = self.find_selectivity(table_name, column, comparison, value)
+
+            print(f"Selectivity for column {column}: {selectivity}")
+
+            conditions_with_selectivity.append(((column, comparison, value), selectivity))
+
+        # Sort conditions based on selectivity
+
+        if logical_operator == 'AND':
+
+            conditions_with_selectivity.sort(key=lambda x: x[1])  # Sort by selectivity, ascending
+
+        elif logical_operator == 'OR':
+
+            conditions_with_selectivity.sort(key=lambda x: x[1], reverse=True)  # Sort by selectivity, descending
+
+        print("Order of evaluation based on selectivity:", [cond[0] for cond, _ in conditions_with_selectivity])
+
+        # Convert values based on column types and evaluate conditions
+
+        converted_conditions = []
+
+        for condition, _ in conditions_with_selectivity:
+
+            column, comparison, value = condition
+
+            column_type = table_schema[column].lower()
+
+            if column_type == 'integer':
+
+                converted_value = int(value)
+
+            elif column_type == 'float':
+
+                converted_value = float(value)
+
+            elif column_type == 'string':
+
+                converted_value = str(value).strip("'\"")  # Strip quotes for string values
+
+            else:
+
+                raise Exception(f"Unsupported column type: {column_type}")
+
+            converted_conditions.append((column, comparison, converted_value))
+
+        rows_to_delete = set(self.match_rows(table_name, converted_conditions, logical_operator))
+
+        deleted_count = self.delete_rows(table_name, rows_to_delete)
+
+        print(f"{deleted_count} rows deleted from {table_name} where the conditions were met.")
+
+    def delete_rows(self, table_name, row_ids):
+
+        # Tombstone the rows and take them out of every index on the table. Row ids are not reused
+
+        # or shifted, so the other index entries stay valid until the table is compacted.
+
+        table = self.tables[table_name]
+
+        store = table["data"]
+
+        row_ids = sorted(row_id for row_id in row_ids if 0 <= row_id < store.row_count and row_id not in store.deleted)
+
+        if not row_ids:
+
+            return 0
+
+        self.log_change('delete', table_name, row_ids)
+
+        for index_info in table.get('indexes', {}).values():
+
+            positions = self.index_positions(table_name, index_info)
+
+            for row_id in row_ids:
+
+                row = store.row(row_id)
+
+                self.remove_index_entry(index_info['index'], tuple(row[position] for position in positions), row_id)
+
+            if index_info['include']:
+
+                for entry_key, _ in self.entry_items(table_name, index_info, ((row_id, store.row(row_id)) for row_id in row_ids)):
+                    index_info['entries'].pop(entry_key, None)
+
+        deleted_count = store.delete_rows(row_ids)
+
+        self.commit()
+
+        if store.deleted.count > self.compaction_ratio * store.row_count:
+
+            self.compact(table_name)
+
+        return deleted_count
+
+    def index_positions(self, table_name, index_info):
+
+        # Catalog positions of an index's key columns (a primary key index names a single column)
+
+        index_columns = index_info['columns'] if isinstance(index_info['columns'], list) else [index_info['columns']]
+
+        return [self.tables[table_name]["catalog"][column] for column in index_columns]
+
+    def add_index_entry(self, index, index_key, row_id):
+
+        # Posting lists are kept in row id order; new rows have the highest ids and go on the end
+
+        posting = index.get(index_key)
+
+        if posting is None:
+
+            index[index_key] = new_posting(index, [row_id])
+
+        elif isinstance(posting, Bitmap):
+
+            posting.append(row_id)
 
-            if index_found and not index_name_found and token.ttype is Name:
-                index_name = token.value
+        elif posting[-1] < row_id:
 
-                index_name_found = True
+            posting.append(row_id)
 
-            if token.ttype is Keyword and token.value.upper() == 'ON':
-                on_found = True
+        else:
 
-                continue
+            insort(posting, row_id)
 
-            if on_found and token.ttype is Name and table_name is None:
-                table_name = token.value
+    def remove_index_entry(self, index, index_key, row_id):
 
-                column_next = True
+        posting = index.get(index_key)
 
-                continue
+        if posting is None:
 
-            if column_next and token.ttype is not Punctuation and not token.is_whitespace:
-                column = token.value
+            return
 
-                columns.append(column)
+        if isinstance(posting, Bitmap):
 
-        self.create_index(index_name, table_name, columns)
+            posting.discard(row_id)
 
-    def create_index(self, index_name, table_name, columns):
+            if not posting.bits:
 
-        if table_name not in self.tables:
-            print(f"Table {table_name} does not exist.")
+                del index[index_key]
 
             return
 
-        if 'indexes' not in self.tables[table_name]:
-            self.tables[table_name]['indexes'] = {}
+        position = bisect_left(posting, row_id)
 
-        if index_name in self.tables[table_name]['indexes']:
-            print(f"Index {index_name} already exists on table {table_name}.")
+        if position < len(posting) and posting[position] == row_id:
 
-            return
+            del posting[position]
 
-        # Create a new B-tree index
+            if not posting:
 
-        index = OOBTree()
+                del index[index_key]
 
-        # Populate the index
+    def index_moves(self, table_name, row_ids, converted_values):
 
-        for row_id, row in enumerate(self.tables[table_name]["data"]):
+        # For each index touched by an update, list the (row id, old key, new key) entries that change.
 
-            index_key = tuple(row[col] for col in columns)
+        # On a unique index a new key may not be held by a row that keeps it or be given to two updated
 
-            if index_key not in index:
-                index[index_key] = []
+        # rows. Returns None, after reporting the violation, if it would be.
 
-            index[index_key].append(row_id)
+        table = self.tables[table_name]
 
-        # Store the index along with the column names
+        store = table["data"]
 
-        self.tables[table_name]['indexes'][index_name] = {'index': index, 'columns': columns}
+        moves = []
 
-        print(f"Index {index_name} created on table {table_name} for columns {columns}")
+        for index_name, index_info in table.get('indexes', {}).items():
 
-    def extract_drop_index_data(self, statement):
+            positions = self.index_positions(table_name, index_info)
 
-        index_name = None
+            if not any(position in converted_values for position in positions):
 
-        table_name = None  # If your DROP INDEX syntax requires specifying the table name
+                continue
 
-        table_found = False
+            index = index_info['index']
 
-        on_found = False
+            changes = []
 
-        drop_index_found = False
+            for row_id in row_ids:
 
-        index_found = False
+                row = store.row(row_id)
 
-        for token in statement.flatten():
+                old_key = tuple(row[position] for position in positions)
 
-            if token.ttype is Keyword.DDL and token.value.upper() == 'DROP':
-                drop_index_found = True
+                new_key = tuple(converted_values.get(position, row[position]) for position in positions)
 
-                continue
+                if old_key != new_key:
 
-            if drop_index_found and token.ttype is Keyword and token.value.upper() == 'INDEX':
-                continue
+                    changes.append((row_id, old_key, new_key))
 
-            if drop_index_found and not index_found and not token.is_whitespace and token.ttype is not Punctuation:
-                index_name = token.value
+            leaving = {row_id for row_id, _, _ in changes}
 
-                # print("INDEX FOUND  :  ", index_name)
+            claimed = set()
 
-                index_found = True
+            for row_id, old_key, new_key in (changes if index_info['unique'] else []):
 
-                continue
+                if new_key in claimed or any(holder not in leaving for holder in index.get(new_key, ())):
 
-            if index_found and token.ttype is Keyword and token.value.upper() == "ON":
-                on_found = True
+                    print(f"Unique constraint violation: Record with key {new_key} already exists in index {index_name}.")
 
-                continue
+                    return None
 
-            if on_found and not token.is_whitespace and token.ttype is not Punctuation:
-                table_name = token.value
+                claimed.add(new_key)
 
-                # print("Found Table Name  :  ", table_name)
+            moves.append((index, changes))
 
-                table_found = True
+        return moves
 
-        if index_found and table_found:
+    def verify_indexes(self, table_name):
 
-            self.drop_index(index_name, table_name)  # Pass the table name if needed
+        # Compare every index on the table with one rebuilt from the live rows and describe each difference
 
+        problems = []
 
+        for index_name, index_info in self.tables[table_name].get('indexes', {}).items():
 
+            index = index_info['index']
 
+            expected = self.build_index(table_name, index_info['columns'])
 
+            for index_key, posting in index.items():
 
+                if index_key not in expected:
 
-        else:
+                    problems.append(f"Index {index_name}: key {index_key} points to rows {list(posting)} that do not hold it.")
 
-            print("Error: table or index not found")
+                elif list(posting) != list(expected[index_key]):
 
-    def drop_index(self, index_name, table_name):
+                    problems.append(f"Index {index_name}: key {index_key} points to rows {list(posting)} instead of {list(expected[index_key])}.")
 
-        if table_name and table_name not in self.tables:
-            print(f"Table {table_name} does not exist.")
+                elif index_info['unique'] and len(posting) > 1:
 
-            return
+                    problems.append(f"Unique index {index_name}: key {index_key} is held by rows {list(posting)}.")
 
-        # Assuming each table has a 'indexes' dictionary where keys are index names
+            for index_key, posting in expected.items():
 
-        if index_name in self.tables[table_name]['indexes']:
+                if index_key not in index:
 
-            del self.tables[table_name]['indexes'][index_name]
+                    problems.append(f"Index {index_name}: key {index_key} of rows {list(posting)} is missing.")
 
-            print(f"Index {index_name} has been dropped from table {table_name}.")
+            if index_info['include'] and list(index_info['entries'].items()) != list(self.build_entries(table_name, index_info).items()):
 
+                problems.append(f"Index {index_name}: included values do not match the table.")
 
+        return problems
 
+    def compact(self, table_name):
 
+        # Drop the tombstoned rows from storage and renumber the survivors, remapping every index in one pass
 
+        store = self.tables[table_name]["data"]
 
+        removed = store.deleted.count
 
-        else:
+        if not removed:
 
-            print(f"Index {index_name} does not exist in table {table_name}.")
+            return 0
 
-    # Data Manipulation Language (DML) Methods
+        # Checkpoint first so the write-ahead log never holds row ids from both sides of the renumbering
 
-    def extract_insert_data(self, statement):
+        self.checkpoint()
 
-        table_name = None
+        mapping = store.compact()
 
-        values = []
+        for index_info in self.tables[table_name].get('indexes', {}).values():
 
-        insert_found = False
+            for posting in index_info['index'].values():
 
-        into_found = False
+                if isinstance(posting, Bitmap):
 
-        values_next = False
+                    posting.bits = Bitmap([mapping[row_id] for row_id in posting]).bits
 
-        table_name_found = False
+                else:
 
-        is_table_name_next = False  # Define this flag
+                    posting[:] = array('q', [mapping[row_id] for row_id in posting])
 
-        for token in statement.flatten():
+            if index_info['include']:
 
-            if token.ttype is Keyword.DML and token.value.upper() == 'INSERT':
-                insert_found = True
+                index_info['entries'] = self.build_entries(table_name, index_info)
 
-                continue
+        self.checkpoint()
 
-            if insert_found and token.ttype is Keyword and token.value.upper() == 'INTO':
-                into_found = True
+        return removed
 
-                is_table_name_next = True
+    def access_paths(self, table_name, conditions, logical_operator=None):
 
-                continue
+        # Decide how match_rows answers (column, operator, converted value) conditions, without reading the table.
+        # Returns (path, conditions, index name) steps in evaluation order: 'bitmap' for the conditions combined
+        # from bitmap indexes, 'composite' for equalities answered by one probe of a composite index, 'index'
+        # for a condition read from an index, 'scan' for one compared column by column and 'none' for one that
+        # cannot match any row.
 
-            if into_found and is_table_name_next and table_name is None and not token.is_whitespace:
-                table_name = token.value
+        store = self.tables[table_name]["data"]
 
-                table_name_found = True
+        if not logical_operator:
 
-                is_table_name_next = False
+            conditions = conditions[:1]
 
-                continue
+        steps = []
 
-            if table_name_found and not is_table_name_next and token.ttype is Keyword and token.value.upper() == 'VALUES':
-                values_next = True
+        # Conditions on columns with a bitmap index are combined as whole bitmaps before any row is read.
 
-                continue
+        # Under AND the rows left are checked against the other conditions; under OR they count as matched
 
-            if values_next and not token.is_whitespace and token.ttype is not Punctuation:
-                value = token.value.strip("'")
+        # and only the rest of the table is checked against the others.
 
-                values.append(value)
+        bitmap_names = [self.bitmap_index(table_name, *condition) for condition in conditions]
 
-        self.insert(table_name, values)
+        if any(name is not None for name in bitmap_names):
 
-    def insert(self, table_name, values):
-        # Check if the table exists
-        if table_name not in self.tables:
-            raise Exception(f"Table {table_name} does not exist.")
+            steps.append(('bitmap', [condition for condition, name in zip(conditions, bitmap_names) if name is not None], None))
 
-        table = self.tables[table_name]
-        column_names = list(table["columns"].keys())
+            conditions = [condition for condition, name in zip(conditions, bitmap_names) if name is None]
 
-        # Check if the number of values matches the number of columns
-        if len(values) != len(column_names):
-            raise Exception("Value count does not match column count.")
+        # Equality conditions ANDed on the leading columns of a composite index are answered by one probe
+
+        elif logical_operator != 'OR':
+
+            equalities = {}
+
+            for column, comparison, value in conditions:
+
+                if comparison == '=' and column in store.catalog and self.index_accepts(table_name, column, value):
+
+                    equalities.setdefault(column, value)
+
+            match = self.find_suitable_index(table_name, list(equalities)) if len(equalities) > 1 else None
+
+            if match is not None and len(match[1]) > 1:
+
+                index_info, key_columns = match
+
+                probed = [condition for condition in conditions
+
+                          if condition[1] == '=' and condition[0] in key_columns and condition[2] == equalities[condition[0]]]
+
+                steps.append(('composite', probed, self.index_name(table_name, index_info)))
+
+                conditions = [condition for condition in conditions if condition not in probed]
+
+        for condition in conditions:
+
+            column, comparison, value = condition
+
+            # An index on the column answers the first condition, and every condition of an OR, without a scan
+
+            index_name = self.scan_index(table_name, column, comparison, value) if not steps or logical_operator == 'OR' else None
+
+            if index_name is not None:
+
+                steps.append(('index', [condition], index_name))
+
+            elif column in store.catalog and (comparison == 'BETWEEN' or comparison in COMPARISONS):
+
+                steps.append(('scan', [condition], None))
+
+            else:
+
+                steps.append(('none', [condition], None))
+
+        return steps
+
+    def match_rows(self, table_name, conditions, logical_operator=None, plan=None):
+
+        # Evaluate (column, operator, converted value) conditions one column at a time, along the access paths.
+        # AND keeps narrowing the surviving row ids and OR only re-checks rows that nothing has matched yet,
+        # which is the same short circuit the row-at-a-time loops used. Returns matching row ids in row order.
+        # Under EXPLAIN ANALYZE plan holds a node per step, which is timed and given the rows matched so far.
+
+        store = self.tables[table_name]["data"]
+
+        steps = self.access_paths(table_name, conditions, logical_operator)
+
+        candidates = None
+
+        matched = []
+
+        for position, (path, step_conditions, index_name) in enumerate(steps):
+
+            with self.measure(plan[position] if plan else None):
+
+                if path == 'bitmap':
+
+                    bits = None
+
+                    for condition in step_conditions:
+
+                        more_bits = self.bitmap_scan(table_name, *condition)
+
+                        if bits is None:
+
+                            bits = more_bits
+
+                        elif logical_operator == 'OR':
+
+                            bits |= more_bits
+
+                        else:
+
+                            bits &= more_bits
+
+                    if logical_operator == 'OR':
+
+                        matched = list(Bitmap.from_bits(bits))
+
+                        if position < len(steps) - 1:
+
+                            candidates = [row_id for row_id in store.row_ids() if not bits >> row_id & 1]
+
+                    else:
+
+                        candidates = list(Bitmap.from_bits(bits))
+
+                elif path == 'composite':
+
+                    index_info = self.tables[table_name]['indexes'][index_name]
+
+                    equalities = {column: value for column, _, value in step_conditions}
+
+                    key_columns = index_info['columns'][:len(equalities)]
+
+                    candidates = list(self.index_probe(index_info, len(key_columns))(tuple(equalities[column] for column in key_columns)))
 
-        # Convert values to their correct types based on the schema
-        converted_values = []
-        for col, val in zip(column_names, values):
-            try:
-                if table["columns"][col].lower() == "integer":
-                    converted_values.append(int(val))
-                elif table["columns"][col].lower() == "float":
-                    converted_values.append(float(val))
-                elif table["columns"][col].lower() == "string":
-                    converted_values.append(str(val))
                 else:
-                    raise Exception(f"Unsupported data type for column {col}")
-            except ValueError as e:
-                raise Exception(f"Invalid value for column {col}: {val}")
 
-        new_record = dict(zip(column_names, converted_values))
+                    column, operator, value = step_conditions[0]
 
-        # Check for foreign key constraints
-        if "foreign_keys" in table:
-            for fk_column, (ref_table, ref_column) in table["foreign_keys"].items():
-                fk_value = new_record[fk_column]
-                if not any(row[ref_column] == fk_value for row in self.tables[ref_table]["data"]):
-                    print(f"Foreign key constraint violation: {fk_value} does not exist in {ref_table}({ref_column})")
-                    return
+                    if path == 'index':
 
-        # Check if the record violates any unique index constraints
-        if 'indexes' in table:
-            for index_name, index_info in table['indexes'].items():
-                index_columns = index_info['columns']
+                        hits = self.index_scan(table_name, column, operator, value)
 
-                # Ensure index_columns is a list
-                if not isinstance(index_columns, list):
-                    index_columns = [index_columns]
+                        if candidates is not None:
 
-                # Create index key for the new record
-                index_key_parts = [new_record.get(col) for col in index_columns]
-                index_key = tuple(index_key_parts)
+                            matched_set = set(matched)
 
-                # Check if the index key already exists in the index
-                if index_key in index_info['index']:
-                    print(
-                        f"Unique constraint violation: Record with key {index_key} already exists in index {index_name}.")
-                    return
+                            hits = [row_id for row_id in hits if row_id not in matched_set]
 
-        # If no unique constraints are violated, insert the record
-        table["data"].append(new_record)
-        new_row_id = len(table["data"]) - 1
+                    elif path == 'scan' and operator == 'BETWEEN':
 
-        # Update indexes
-        if 'indexes' in table:
-            for index_name, index_info in table['indexes'].items():
-                index_columns = index_info['columns']
+                        hits = store.select(column, COMPARISONS['<='], value[1], store.select(column, COMPARISONS['>='], value[0], candidates))
 
-                # Ensure index_columns is a list
-                if not isinstance(index_columns, list):
-                    index_columns = [index_columns]
+                    elif path == 'scan':
 
-                # Retrieve the index object
-                index = index_info['index']
+                        hits = store.select(column, COMPARISONS[operator], value, candidates)
 
-                # Create index key for the new record
-                index_key_parts = [new_record.get(col) for col in index_columns]
-                index_key = tuple(index_key_parts)
+                    else:
 
-                # Add new row ID to the index
-                if index_key not in index:
-                    index[index_key] = [new_row_id]
+                        hits = []
 
-    def find_selectivity(self, table_name, column):
-        # Check if the table exists
-        if table_name not in self.tables:
-            raise Exception(f"Table {table_name} does not exist.")
+                    if logical_operator == 'OR':
 
-        table = self.tables[table_name]
+                        matched.extend(hits)
 
-        # Check if the column exists in the table
-        if column not in table["columns"]:
-            raise Exception(f"Column {column} does not exist in table {table_name}.")
+                        hit_set = set(hits)
 
-        # Calculate the number of distinct values in the column
-        distinct_values = set()
-        for record in table["data"]:
-            if column in record:
-                distinct_values.add(record[column])
+                        candidates = [row_id for row_id in (store.row_ids() if candidates is None else candidates)
 
-        # Calculate the total number of tuples in the table
-        num_tuples = len(table["data"])
+                                      if row_id not in hit_set]
 
-        # Calculate selectivity
-        selectivity = (num_tuples / len(distinct_values)) / num_tuples if num_tuples > 0 and distinct_values else 0
+                    else:
 
-        return selectivity
+                        candidates = hits
 
-    def extract_delete_data(self, statement):
+            # A step's node includes the steps it read from, like every other plan node
 
-        delete_found = False
+            if plan:
 
-        from_found = False
+                plan[position].rows += len(matched) if logical_operator == 'OR' else len(candidates)
 
-        table_found = False
+                if position:
 
-        table_name = None
+                    plan[position].elapsed += plan[position - 1].elapsed
 
-        where_found = False
+                    plan[position].peak_memory = max(plan[position].peak_memory, plan[position - 1].peak_memory)
 
-        operator_found = False
+        if logical_operator == 'OR':
 
-        condition_found = False
+            return sorted(matched)
 
-        column_found = False
+        return candidates if candidates is not None else []
 
-        columns = []
+    def bitmap_scan(self, table_name, column, operator, value):
 
-        values = []
+        # The bits of the rows whose value in column satisfies the condition, as the OR of the bitmaps of
 
-        operators = []
+        # every matching key of a bitmap index on the column; != is the OR of all the other keys. The
 
-        logical_operator_found = False
+        # index holds only live rows, so no row is read. Returns None when no bitmap index can answer it.
 
-        operator = None
+        index_name = self.bitmap_index(table_name, column, operator, value)
 
-        logical_operator = None
+        if index_name is None:
 
-        for token in statement.flatten():
+            return None
 
-            # print("TOKEN VALUE  :  ", token.value, "  :  ", token.ttype)
+        index = self.tables[table_name]['indexes'][index_name]['index']
 
-            if token.ttype is Keyword.DML and token.value.upper() == 'DELETE':
-                delete_found = True
+        if operator == '=':
 
-                continue
+            posting = index.get((value,))
 
-            if delete_found and token.ttype is Keyword and token.value.upper() == 'FROM':
-                from_found = True
+            return posting.bits if posting is not None else 0
 
-                continue
+        if operator == 'BETWEEN':
 
-            if delete_found and from_found and not table_found and token.ttype is Name:
-                table_name = token.value
+            keys = [index_key for index_key in index if value[0] <= index_key[0] <= value[1]]
 
-                table_found = True
+        else:
+
+            compare = COMPARISONS[operator]
+
+            keys = [index_key for index_key in index if compare(index_key[0], value)]
+
+        bits = 0
+
+        for index_key in keys:
+
+            bits |= index[index_key].bits
+
+        return bits
+
+    def bitmap_index(self, table_name, column, operator, value):
+
+        # The name of the bitmap index on the column that bitmap_scan answers the condition from, or None
+
+        if column not in self.tables[table_name]["columns"] or (operator not in COMPARISONS and operator != 'BETWEEN'):
+
+            return None
+
+        bounds = value if operator == 'BETWEEN' else (value,)
+
+        if not all(self.index_accepts(table_name, column, bound) for bound in bounds):
+
+            return None
+
+        for index_name, index_info in self.tables[table_name].get('indexes', {}).items():
+
+            if index_info['using'] == 'bitmap' and index_info['columns'] in ([column], column):
+
+                return index_name
 
-                # print("Table Found  :  ", table_name)
+        return None
 
-                continue
+    def index_name(self, table_name, index_info):
 
-            if table_found and not where_found and token.ttype is Keyword and token.value.upper() == 'WHERE':
-                where_found = True
+        # The name an index is registered under in its table
 
-                # print("where...")
+        return next(name for name, info in self.tables[table_name]['indexes'].items() if info is index_info)
 
-                continue
+    def scan_index(self, table_name, column, operator, value):
 
-            if where_found and token.ttype is Keyword and (token.value.upper() == 'OR' or token.value.upper() == 'AND'):
-                # print("logical operator found: ", token.value.upper())
+        # The name of the index index_scan reads the condition from, or None when it is left to a column scan
 
-                logical_operator = token.value.upper()
+        if operator not in INDEX_RANGES or column not in self.tables[table_name]["columns"]:
 
-                logical_operator_found = True
+            return None
 
-                continue
+        low, high = value if operator == 'BETWEEN' else (value, value)
 
-            if where_found and not operator_found and token.ttype is not Punctuation and token.ttype is not Operator.Comparison and not token.is_whitespace:
-                column = token.value.strip("'")
+        if not self.index_accepts(table_name, column, low) or not self.index_accepts(table_name, column, high):
 
-                columns.append(column)
+            return None
 
-                column_found = True
+        match = self.find_suitable_index(table_name, [column], operator)
 
-                # print(" COLUMN FOUND  :  ", column)
+        if match is None:
 
-                continue
+            # A bitmap index still answers ranges, by combining the bitmaps of the keys inside them
 
-            if column_found and token.ttype is Operator.Comparison and not operator_found:
-                operator_found = True
+            return self.bitmap_index(table_name, column, operator, value)
 
-                # print("OPERATOR  :  ", token.value)
+        return self.index_name(table_name, match[0])
 
-                operator = token.value
+    def index_scan(self, table_name, column, operator, value):
 
-                operators.append(operator)
+        # Row ids, in row order, whose value in column satisfies the condition, read from an index that
 
-                continue
+        # leads with the column by walking only the matching key range. Keys are tuples and (value,) sorts
 
-            if not condition_found and where_found and operator_found and token.ttype is not Punctuation and token.ttype is not Operator.Comparison and not token.is_whitespace:
-                value = token.value.strip("'")
+        # before every longer key that starts with value. Returns None when no index can answer it.
 
-                values.append(value)
+        index_name = self.scan_index(table_name, column, operator, value)
 
-                # print("CONDITION  :  ", value)
+        if index_name is None:
 
-                condition_found = False
+            return None
 
-                operator_found = False
+        index_info = self.tables[table_name]['indexes'][index_name]
 
-                column_found = False
+        if index_info['using'] == 'bitmap':
 
-                continue
+            return list(Bitmap.from_bits(self.bitmap_scan(table_name, column, operator, value)))
 
-        if logical_operator_found:
+        if operator == '=':
 
-            self.delete_multiple(table_name, columns, values, logical_operator, operators)
+            return list(self.index_probe(index_info, 1)((value,)))
 
-        else:
+        low, high = value if operator == 'BETWEEN' else (value, value)
 
-            self.delete(table_name, columns[0], values[0], operator)
+        postings = [posting for _, posting in self.index_range(index_info['index'], operator, low, high)]
 
-    def delete(self, table_name, column, value, operator):
-        if table_name not in self.tables:
-            print(f"Table {table_name} does not exist.")
-            return
+        if len(postings) == 1:
 
-        table = self.tables[table_name]
-        table_schema = table["columns"]
+            return list(postings[0])
 
-        if column not in table_schema:
-            print(f"Column {column} does not exist in table {table_name}.")
-            return
+        return sorted(chain.from_iterable(postings))
 
-        # Convert value based on column type
-        column_type = table_schema[column].lower()
-        if column_type == 'integer':
-            try:
-                value = int(value)
-            except ValueError:
-                print(f"Value {value} is not a valid integer.")
-                return
-        elif column_type == 'float':
-            try:
-                value = float(value)
-            except ValueError:
-                print(f"Value {value} is not a valid float.")
-                return
-        elif column_type == 'string':
-            value = str(value).strip("'\"")  # Strip quotes for string values
+    def index_range(self, tree, operator, low, high):
 
-        # Check if there's a suitable index
-        index_used = False
-        suitable_index = self.find_suitable_index(table.get('indexes', {}), column)
+        # The items of a B-tree whose first key column satisfies the operator, in key order
 
-        if suitable_index:
-            index_used = True
-            # Use index to delete rows
-            rows_to_delete = set()
-            for index_key, row_ids in suitable_index.items():
-                for row_id in row_ids:
-                    if self.evaluate_delete_condition(table["data"][row_id], column, value, operator):
-                        rows_to_delete.add(row_id)
+        low_inclusive, high_inclusive = INDEX_RANGES[operator]
 
-            new_data = [row for i, row in enumerate(table["data"]) if i not in rows_to_delete]
+        bounds = {}
 
-        else:
-            # Fallback to full table scan
-            new_data = []
-            for row in table["data"]:
-                if not self.evaluate_delete_condition(row, column, value, operator):
-                    new_data.append(row)
+        if low_inclusive is not None:
 
-        # Update the table data
-        deleted_rows = len(table["data"]) - len(new_data)
-        table["data"] = new_data
+            bounds['min'] = (low,)
 
-        # Update any indexes (if needed)
-        # ...
+        if high_inclusive is False:
 
-        print(f"Deleted {deleted_rows} rows from {table_name}.")
-        if index_used:
-            print("Deletion performed using index.")
-        else:
-            print("Deletion performed using full table scan.")
-            # Evaluate condition
+            bounds.update(max=(high,), excludemax=True)
 
-    def evaluate_delete_condition(self, row, column, value, operator):
+        items = tree.items(**bounds)
 
-        if column not in row:
-            return False
+        if low_inclusive is False:
 
-        if isinstance(value, int):
+            items = dropwhile(lambda item: item[0][0] == low, items)
 
-            try:
+        if high_inclusive:
 
-                row[column] = int(row[column])
+            items = takewhile(lambda item: item[0][0] <= high, items)
 
-            except ValueError:
+        return items
 
-                print(f"Value {value} is not a valid integer.")
+    def index_only_scan(self, table_name, columns, conditions):
 
-                return
+        # Answer an AND of conditions from a single index when it holds every column the query reads, in
 
-        elif isinstance(value, float):
+        # its key or its INCLUDE list, so no row is fetched from the table. The index must lead with the
 
-            try:
+        # column of one of the conditions; its key range is walked and the other conditions are checked on
 
-                row[column] = float(row[column])
+        # the values read from the index. Returns {column: value} dicts in row order, or None when no
 
-            except ValueError:
+        # index covers the query.
 
-                print(f"Value {value} is not a valid float.")
+        covering = self.covering_index(table_name, columns, conditions)
 
-                return
+        if covering is None:
 
-        elif isinstance(value, str):
+            return None
 
-            row[column] = str(row[column])
+        index_name, position = covering
 
-        # Comparison operations
+        index_info = self.tables[table_name]['indexes'][index_name]
 
-        if operator == '=':
+        key_columns = index_info['columns'] if isinstance(index_info['columns'], list) else [index_info['columns']]
 
-            # print(f"operator is {operator}")
+        column, comparison, value = conditions[position]
 
-            # print("type of row = ", type(row[column]), "| type of value = ", type(value))
+        low, high = value if comparison == 'BETWEEN' else (value, value)
 
-            return row[column] == value
+        rows = []
 
-        elif operator == '<':
+        if index_info['include']:
 
-            return row[column] < value
+            for entry_key, included in self.index_range(index_info['entries'], comparison, low, high):
 
-        elif operator == '>':
+                values = dict(zip(key_columns, entry_key))
 
-            return row[column] > value
+                values.update(zip(index_info['include'], included))
 
-        elif operator == '<=':
+                rows.append((entry_key[-1], values))
 
-            return row[column] <= value
+        else:
 
-        elif operator == '>=':
+            if index_info['using'] in ('hash', 'bitmap'):
 
-            return row[column] >= value
+                items = [((value,), index_info['index'][(value,)])] if (value,) in index_info['index'] else []
 
-        elif operator == '!=':
+            else:
 
-            return row[column] != value
+                items = self.index_range(index_info['index'], comparison, low, high)
 
-        else:
+            for index_key, posting in items:
 
-            raise ValueError(f"Unsupported operator: {operator}")
+                values = dict(zip(key_columns, index_key))
 
-    def delete_multiple(self, table_name, columns, values, logical_operator, operators):
+                rows.extend((row_id, values) for row_id in posting)
 
-        if table_name not in self.tables:
-            print(f"Table {table_name} does not exist.")
+        rows.sort(key=lambda row: row[0])
 
-            return
+        for column, comparison, value in conditions[:position] + conditions[position + 1:]:
 
-        table_schema = self.tables[table_name]["columns"]
+            if comparison == 'BETWEEN':
 
-        new_data = []
+                rows = [row for row in rows if value[0] <= row[1][column] <= value[1]]
 
-        # Calculate selectivity for each condition
+            else:
 
-        conditions_with_selectivity = []
+                compare = COMPARISONS[comparison]
 
-        for column, value, operator in zip(columns, values, operators):
-            selectivity = self.find_selectivity(table_name, column)
+                rows = [row for row in rows if compare(row[1][column], value)]
 
-            print(f"Selectivity for column {column}: {selectivity}")
+        return [values for _, values in rows]
 
-            conditions_with_selectivity.append(((column, operator, value), selectivity))
+    def covering_index(self, table_name, columns, conditions):
 
-        # Sort conditions based on selectivity
+        # The (index name, position of the condition it leads with) an index-only scan reads, or None
 
-        if logical_operator == 'AND':
+        schema = self.tables[table_name]["columns"]
 
-            conditions_with_selectivity.sort(key=lambda x: x[1])  # Sort by selectivity, ascending
+        referenced = set(columns) | {column for column, _, _ in conditions}
 
-        elif logical_operator == 'OR':
+        if not referenced.issubset(schema):
 
-            conditions_with_selectivity.sort(key=lambda x: x[1], reverse=True)  # Sort by selectivity, descending
+            return None
 
-        print("Order of evaluation based on selectivity:", [cond[0] for cond, _ in conditions_with_selectivity])
+        for column, comparison, value in conditions:
 
-        # Convert values based on column types and evaluate conditions
+            bounds = value if comparison == 'BETWEEN' else (value,)
 
-        for row in self.tables[table_name]["data"]:
+            if comparison not in COMPARISONS and comparison != 'BETWEEN' or \
+                    not all(self.index_accepts(table_name, column, bound) for bound in bounds):
 
-            condition_results = []
+                return None
 
-            for condition, _ in conditions_with_selectivity:
+        candidates = []
 
-                column, operator, value = condition
+        for index_name, index_info in self.tables[table_name].get('indexes', {}).items():
 
-                column_type = table_schema[column].lower()
+            key_columns = index_info['columns'] if isinstance(index_info['columns'], list) else [index_info['columns']]
 
-                if column_type == 'integer':
+            if not referenced.issubset(key_columns + index_info['include']):
 
-                    converted_value = int(value)
+                continue
 
-                elif column_type == 'float':
+            for position, (column, comparison, value) in enumerate(conditions):
 
-                    converted_value = float(value)
+                if column != key_columns[0] or comparison not in INDEX_RANGES:
 
-                elif column_type == 'string':
+                    continue
 
-                    converted_value = str(value).strip("'\"")  # Strip quotes for string values
+                # Without INCLUDE a hash or bitmap index is read by one lookup of the whole key
 
-                else:
+                if index_info['using'] in ('hash', 'bitmap') and not index_info['include'] and (comparison != '=' or len(key_columns) > 1):
 
-                    raise Exception(f"Unsupported column type: {column_type}")
+                    continue
 
-                result = self.evaluate_update_condition(row, column, operator, converted_value)
+                candidates.append((len(key_columns) + len(index_info['include']), position, index_name))
 
-                condition_results.append(result)
+        if not candidates:
 
-                # Short-circuit evaluation
+            return None
 
-                if logical_operator == 'AND' and not result:
+        _, position, index_name = min(candidates)
 
-                    break  # No need to evaluate further for AND
+        return index_name, position
 
-                elif logical_operator == 'OR' and result:
+    def index_accepts(self, table_name, column, value):
 
-                    break  # No need to evaluate further for OR
+        # A literal of the wrong kind would be compared against the keys and fail, so it is left to the scan.
 
-            if (logical_operator == 'AND' and all(condition_results)) or (
+        # So is a fractional or out of range number against an Integer column, whose B-tree holds 64-bit integers.
 
-                    logical_operator == 'OR' and any(condition_results)) or (
+        column_type = self.tables[table_name]["columns"][column].lower()
 
-                    not logical_operator and condition_results[0]):
+        if column_type == 'integer' and isinstance(value, float):
 
-                continue
+            if not value.is_integer():
 
-            else:
+                return False
 
-                new_data.append(row)
+            value = int(value)
 
-        deleted_count = len(self.tables[table_name]["data"]) - len(new_data)
+        if column_type == 'integer' and isinstance(value, int) and not -2 ** 63 <= value < 2 ** 63:
 
-        self.tables[table_name]["data"] = new_data
+            return False
 
-        print(f"{deleted_count} rows deleted from {table_name} where the conditions were met.")
+        return isinstance(value, str) == (column_type == 'string')
 
     def matches_condition(self, row, columns, values, operators, logical_operator, table_schema):
 
         condition_matches = []
 
-        for column, value, operator in zip(columns, values, operators):
+        for column, value, comparison in zip(columns, values, operators):
 
             if column not in row:
                 continue
@@ -1167,37 +5555,37 @@ class RDBMS:
 
             # Evaluate condition based on operator
 
-            if operator == '=':
+            if comparison == '=':
 
                 match = row[column] == converted_value
 
 
 
-            elif operator == '<':
+            elif comparison == '<':
 
                 match = row[column] < converted_value
 
 
 
-            elif operator == '>':
+            elif comparison == '>':
 
                 match = row[column] > converted_value
 
 
 
-            elif operator == '<=':
+            elif comparison == '<=':
 
                 match = row[column] <= converted_value
 
 
 
-            elif operator == '>=':
+            elif comparison == '>=':
 
                 match = row[column] >= converted_value
 
 
 
-            elif operator == '!=':
+            elif comparison == '!=':
 
                 match = row[column] != converted_value
 
@@ -1205,7 +5593,7 @@ class RDBMS:
 
             else:
 
-                raise ValueError(f"Unsupported operator: {operator}")
+                raise ValueError(f"Unsupported operator: {comparison}")
 
             condition_matches.append(match)
 
@@ -1339,7 +5727,7 @@ class RDBMS:
 
             column = condition[0]
 
-            selectivity = self.find_selectivity(table_name, column)
+            selectivity = self.find_selectivity(table_name, *condition)
 
             if len(conditions) > 1:
                 print(f"Selectivity for column {column}: {selectivity}")
@@ -1359,69 +5747,112 @@ class RDBMS:
         if len(conditions_with_selectivity) > 1:
             print("Order of evaluation based on selectivity:", [cond[0] for cond, _ in conditions_with_selectivity])
 
-        # Evaluate conditions in the sorted order
+        # Adjust the condition values based on the column types
 
-        for row in self.tables[table_name]["data"]:
+        converted_conditions = []
 
-            condition_results = []
+        for condition, _ in conditions_with_selectivity:
 
-            for condition, _ in conditions_with_selectivity:
+            column, operator, condition_value = condition
 
-                column, operator, condition_value = condition
+            column_type = self.tables[table_name]["columns"].get(column).lower()
 
-                # Adjust the condition value based on the column type
+            if column_type == 'integer':
 
-                column_type = self.tables[table_name]["columns"].get(column).lower()
+                condition_value = int(condition_value)
 
-                if column_type == 'integer':
+            elif column_type == 'float':
 
-                    condition_value = int(condition_value)
+                condition_value = float(condition_value)
 
-                elif column_type == 'float':
+            elif column_type == 'string':
 
-                    condition_value = float(condition_value)
+                condition_value = str(condition_value).strip("'\"")
 
-                elif column_type == 'string':
+            converted_conditions.append((column, operator, condition_value))
 
-                    condition_value = str(condition_value).strip("'\"")
+        # Convert the new values once, then write them straight into the column buffers
 
-                result = self.evaluate_update_condition(row, column, operator, condition_value)
+        store = self.tables[table_name]["data"]
 
-                condition_results.append(result)
+        converted_values = {}
 
-                # Short-circuit evaluation for logical operators
+        for column, value in set_values.items():
 
-                if logical_operator == 'AND' and not result:
+            if column in store.catalog:
 
-                    break
+                position = store.catalog[column]
 
-                elif logical_operator == 'OR' and result:
+                if self.tables[table_name]["columns"][column].lower() == 'integer':
 
-                    break
+                    converted_values[position] = int(value)
+
+                elif self.tables[table_name]["columns"][column].lower() == 'float':
+
+                    converted_values[position] = float(value)
+
+                elif self.tables[table_name]["columns"][column].lower() == 'string':
+
+                    converted_values[position] = str(value)
+
+        # Apply updates to the rows where the conditions are met
+
+        matched_rows = self.match_rows(table_name, converted_conditions, logical_operator)
+
+        # Index entries are worked out before any row is written, so a refused update changes nothing
+
+        index_moves = self.index_moves(table_name, matched_rows, converted_values)
+
+        if index_moves is None:
+
+            return
+
+        # Covering indexes whose key or included values change lose the rows' old entries and take new ones
+
+        covering = []
+
+        for index_info in self.tables[table_name].get('indexes', {}).values():
 
-            # Apply updates if conditions are met
+            if not index_info['include']:
 
-            if (logical_operator == 'AND' and all(condition_results)) or \
-                    (logical_operator == 'OR' and any(condition_results)) or \
-                    (not logical_operator and condition_results[0]):
+                continue
+
+            positions = self.index_positions(table_name, index_info) + [store.catalog[column] for column in index_info['include']]
+
+            if any(position in converted_values for position in positions):
+
+                covering.append(index_info)
+
+        stale_entries = [(index_info, self.entry_items(table_name, index_info, ((row_id, store.row(row_id)) for row_id in matched_rows)))
+
+                         for index_info in covering]
+
+        self.log_change('update', table_name, matched_rows, list(converted_values.items()))
+
+        for row_id in matched_rows:
 
-                for column, value in set_values.items():
+            for position, value in converted_values.items():
 
-                    # Convert value to appropriate data type
+                store.set_value(row_id, position, value)
 
-                    if column in row:
+        for index_info, entries in stale_entries:
 
-                        if self.tables[table_name]["columns"][column].lower() == 'integer':
+            for entry_key, _ in entries:
+                del index_info['entries'][entry_key]
 
-                            row[column] = int(value)
+            index_info['entries'].update(self.entry_items(table_name, index_info, ((row_id, store.row(row_id)) for row_id in matched_rows)))
 
-                        elif self.tables[table_name]["columns"][column].lower() == 'float':
+        # Move each changed row from its old key's posting list to its new key's
 
-                            row[column] = float(value)
+        for index, changes in index_moves:
 
-                        elif self.tables[table_name]["columns"][column].lower() == 'string':
+            for row_id, old_key, new_key in changes:
 
-                            row[column] = str(value)
+                self.remove_index_entry(index, old_key, row_id)
+
+                self.add_index_entry(index, new_key, row_id)
+
+        self.commit()
 
     def evaluate_update_condition(self, row, column, operator, value):
 
@@ -1494,6 +5925,8 @@ class RDBMS:
 
         aggregate_function = False
 
+        between_values = []
+
         for token in statement.flatten():
 
             if token.ttype is Keyword.DML and token.value.upper() == 'SELECT':
@@ -1555,6 +5988,20 @@ class RDBMS:
 
                 continue
 
+            if condition_found and token.ttype is Keyword and token.value.upper() == 'BETWEEN':
+                operator = 'BETWEEN'
+
+                operator_found = True
+
+                between_values = []
+
+                continue
+
+            # The AND of BETWEEN low AND high joins the bounds, not two conditions
+
+            if operator_found and operator == 'BETWEEN' and token.ttype is Keyword and token.value.upper() == 'AND':
+                continue
+
             if condition_found and token.ttype is Keyword and (
 
                     token.value.upper() == 'OR' or token.value.upper() == 'AND'):
@@ -1574,6 +6021,16 @@ class RDBMS:
 
                 continue
 
+            if condition_found and operator_found and operator == 'BETWEEN' and token.ttype is not Punctuation and not token.is_whitespace:
+                between_values.append(token.value)
+
+                if len(between_values) == 2:
+                    conditions.append((column_for_condition, operator, tuple(between_values)))
+
+                    operator_found = False
+
+                continue
+
             if condition_found and operator_found and token.ttype is not Punctuation and not token.is_whitespace:
                 condition = token.value
 
@@ -1713,88 +6170,135 @@ class RDBMS:
 
                 continue
 
-        if avg_oper:
+        aggregate = None
 
-            self.avg_calc(column, table)
+        if self.explaining and table in self.tables:
 
+            function = next(name for name, found in (("AVG", avg_oper), ("COUNT", count_oper), ("MIN", min_oper),
+                                                     ("MAX", max_oper), ("SUM", sum_oper)) if found)
 
+            aggregate = self.explain_plan = self.plan_aggregate(function, column, table)
 
+            if self.explaining == 'plan':
+                return
 
+        with self.measure(aggregate):
 
+            if avg_oper:
 
+                self.avg_calc(column, table)
 
-        elif count_oper:
 
-            self.count(column, table)
 
 
 
 
 
+            elif count_oper:
 
+                self.count(column, table)
 
-        elif min_oper:
 
-            self.min_calc(column, table)
 
 
 
 
 
+            elif min_oper:
 
+                self.min_calc(column, table)
 
-        elif max_oper:
 
-            self.max_calc(column, table)
 
 
 
 
 
+            elif max_oper:
 
+                self.max_calc(column, table)
 
-        elif sum_oper:
 
-            self.sum_calc(column, table)
 
-    def avg_calc(self, column, table):
 
-        if table not in self.tables:
-            print(f"Table {table} does not exist.")
 
-            return
 
-        data = self.tables[table]["data"]
 
-        total = 0
+            elif sum_oper:
 
-        count = 0  # Initialize count to 0
+                self.sum_calc(column, table)
 
-        for row in data:
+        if aggregate:
+            aggregate.rows = 1
 
-            if column in row:
+    def plan_aggregate(self, function, column, table):
 
-                value = row[column]
+        # The aggregate as a single plan node, naming where it reads its values from
 
-                # Check if the value is a digit (either int or float)
+        store = self.tables[table]["data"]
 
-                if str(value).replace(".", "", 1).isdigit():
+        match = self.find_suitable_index(table, [column], '<') if function in ("MIN", "MAX") else None
 
-                    if "." in str(value):
+        if function == "COUNT":
 
-                        total += float(value)  # Convert to float if it has a decimal point
+            source = "row count"
 
+        elif match is not None and column in store.catalog:
 
+            source = f"{'first' if function == 'MIN' else 'last'} key of index {self.index_name(table, match[0])}"
 
+        else:
 
+            source = "column scan"
 
+        return PlanNode(f"Aggregate {function}({column}) on {table}: {source}", 1)
 
+    def numeric_values(self, column, table):
 
-                    else:
+        # Integer and Float columns are read straight from their typed buffer; any other column keeps
 
-                        total += int(value)  # Convert to int if it's a whole number
+        # the rule of only counting values that look like unsigned numbers
 
-                    count += 1  # Increment count for valid values
+        store = self.tables[table]["data"]
+
+        if column not in store.catalog:
+
+            return []
+
+        values = store.column_values(column)
+
+        if self.tables[table]["columns"][column].lower() in ("integer", "float"):
+
+            return values
+
+        return [float(value) if "." in str(value) else int(value) for value in values
+
+                if str(value).replace(".", "", 1).isdigit()]
+
+    def numeric_sum(self, column, table):
+
+        # (sum, number of values) of a column. Integer and Float columns are summed by their store,
+
+        # so compressed integer segments are added up without being decoded
+
+        store = self.tables[table]["data"]
+
+        if column in store.catalog and self.tables[table]["columns"][column].lower() in ("integer", "float"):
+
+            return store.aggregate(column, "sum"), len(store)
+
+        values = self.numeric_values(column, table)
+
+        return sum(values), len(values)
+
+    def avg_calc(self, column, table):
+
+        if table not in self.tables:
+            print(f"Table {table} does not exist.")
+
+            return
+
+        total, count = self.numeric_sum(column, table)  # Number of valid values
 
         avg = total / count if count > 0 else 0
 
@@ -1807,7 +6311,9 @@ class RDBMS:
 
             return
 
-        count = sum(1 for row in self.tables[table]["data"] if column in row)
+        store = self.tables[table]["data"]
+
+        count = len(store) if column in store.catalog else 0
 
         print(f"Count of {column} in {table}: {count}")
 
@@ -1818,7 +6324,9 @@ class RDBMS:
 
             return
 
-        max_value = max((row[column] for row in self.tables[table]["data"] if column in row), default=None)
+        store = self.tables[table]["data"]
+
+        max_value = self.index_extreme(table, column, "max") if column in store.catalog else None
 
         print(f"Max of {column} in {table}: {max_value}")
 
@@ -1829,36 +6337,39 @@ class RDBMS:
 
             return
 
-        min_value = min((row[column] for row in self.tables[table]["data"] if column in row), default=None)
+        store = self.tables[table]["data"]
 
-        print(f"Min of {column} in {table}: {min_value}")
+        min_value = self.index_extreme(table, column, "min") if column in store.catalog else None
 
-    def sum_calc(self, column, table):
+        print(f"Min of {column} in {table}: {min_value}")
 
-        if table not in self.tables:
-            print(f"Table {table} does not exist.")
+    def index_extreme(self, table, column, function):
 
-            return
+        # MIN and MAX read the first or last key of a B-tree leading with the column instead of the column itself
 
-        total = 0  # Initialize the total to 0
+        match = self.find_suitable_index(table, [column], '<')
 
-        for row in self.tables[table]["data"]:
+        if match is not None:
 
-            if column in row:
+            index = match[0]['index']
 
-                value = row[column]
+            try:
+                return (index.minKey() if function == "min" else index.maxKey())[0]
 
-                # Check if the value is a digit (either int or float)
+            except ValueError:
+                # An empty tree has no keys
+                pass
 
-                if str(value).replace(".", "", 1).isdigit():
+        return self.tables[table]["data"].aggregate(column, function)
 
-                    if "." in str(value):
+    def sum_calc(self, column, table):
 
-                        total += float(value)  # Convert to float if it has a decimal point
+        if table not in self.tables:
+            print(f"Table {table} does not exist.")
 
-                    else:
+            return
 
-                        total += int(value)  # Convert to int if it's a whole number
+        total, count = self.numeric_sum(column, table)
 
         print(f"Sum of {column} in {table}: {total}")
 
@@ -1887,19 +6398,28 @@ class RDBMS:
 
         # Print the specified columns for each row
 
-        for row in table_data:
-            selected_data = {col: row.get(col, None) for col in columns}
+        positions = self.resolve_columns(table_name, columns)
 
-            print(selected_data)
+        output = None
 
-    def evaluate_condition(self, row, column, operator, value):
+        if self.explaining:
 
-        if column not in row:
-            return False
+            scan = PlanNode(f"Seq Scan on {table_name}", len(table_data))
 
-        # Retrieve the actual value from the row
+            output = self.explain_plan = PlanNode(f"Output: {', '.join(columns)}", len(table_data), [scan])
 
-        row_value = row[column]
+            if self.explaining == 'plan':
+                return
+
+        with self.measure(output):
+
+            for row in TracedRows(scan, table_data.rows()) if output else table_data.rows():
+                self.print_row(columns, positions, row)
+
+        if output:
+            output.rows = scan.rows
+
+    def convert_literal(self, value):
 
         try:
             # First, try to convert it to an integer if it's a whole number
@@ -1912,6 +6432,19 @@ class RDBMS:
             # If it raises a ValueError, it's neither an int nor a float, so keep it as a string
             value = value
 
+        return value
+
+    def evaluate_condition(self, row, column, operator, value):
+
+        if column not in row:
+            return False
+
+        # Retrieve the actual value from the row
+
+        row_value = row[column]
+
+        value = self.convert_literal(value)
+
         # Comparison operations
 
         if operator == "=":
@@ -1939,119 +6472,169 @@ class RDBMS:
 
         else:
 
-            return False
+            return False
+
+    def condition_select(self, columns, table_name, conditions, logical_operator=None):
+
+        if table_name not in self.tables:
+            print(f"Table {table_name} does not exist.")
+
+            return
+
+        # Handle the '*' wildcard for selecting all columns
+        if columns == ['*']:
+            columns = list(self.tables[table_name]['columns'].keys())
+        else:
+            # Here, you can add additional checks to ensure that the specified columns exist in the table
+            pass
+        # Retrieve the table data
+
+        table_data = self.tables[table_name]["data"]
+
+        positions = self.resolve_columns(table_name, columns)
+
+        # Check if there's only one condition and no logical operator
+
+        if len(conditions) == 1 and not logical_operator:
+
+            column, comparison, value = conditions[0]
+
+            converted_conditions = [(column, comparison, self.convert_condition_value(value))]
+
+            logical_operator = 'AND'
+
+        else:
+
+            # If there are multiple conditions or a logical operator is present
+
+            # Calculate selectivity for each condition
+
+            conditions_with_selectivity = []
+
+            for condition in conditions:
+                column = condition[0]
+
+                selectivity = self.find_selectivity(table_name, *condition)
+
+                print(f"Selectivity for column {column}: {selectivity}")
+
+                conditions_with_selectivity.append((condition, selectivity))
 
-    def condition_select(self, columns, table_name, conditions, logical_operator=None):
+            # Sort conditions based on selectivity
 
-        if table_name not in self.tables:
-            print(f"Table {table_name} does not exist.")
+            if logical_operator == 'AND':
 
-            return
+                conditions_with_selectivity.sort(key=lambda x: x[1])  # Sort by selectivity, ascending
 
-        # Handle the '*' wildcard for selecting all columns
-        if columns == ['*']:
-            columns = list(self.tables[table_name]['columns'].keys())
-        else:
-            # Here, you can add additional checks to ensure that the specified columns exist in the table
-            pass
-        # Retrieve the table data
 
-        table_data = self.tables[table_name]["data"]
 
-        # Check if there's only one condition and no logical operator
+            elif logical_operator == 'OR':
 
-        if len(conditions) == 1 and not logical_operator:
+                conditions_with_selectivity.sort(key=lambda x: x[1], reverse=True)  # Sort by selectivity, descending
 
-            column, operator, value = conditions[0]
+            print("Order of evaluation based on selectivity:", [cond[0] for cond, _ in conditions_with_selectivity])
 
-            value = value.strip("'\"")  # Strip extra quotes
+            # Evaluate conditions in the sorted order
 
-            for row in table_data:
+            converted_conditions = [(column, comparison, self.convert_condition_value(value))
+                                    for (column, comparison, value), _ in conditions_with_selectivity]
 
-                if self.evaluate_condition(row, column, operator, value):
-                    self.print_row(columns, row)
+        output = plan = None
 
-            return
+        if self.explaining:
 
-        # If there are multiple conditions or a logical operator is present
+            output, plan = self.plan_condition_select(table_name, columns, converted_conditions, logical_operator)
 
-        # Calculate selectivity for each condition
+            self.explain_plan = output
 
-        conditions_with_selectivity = []
+            if self.explaining == 'plan':
+                return
 
-        for condition in conditions:
-            column = condition[0]
+        # Print rows where the conditions are met, from an index-only scan when an index covers the query
 
-            selectivity = self.find_selectivity(table_name, column)
+        with self.measure(output):
 
-            print(f"Selectivity for column {column}: {selectivity}")
+            if logical_operator == 'OR' or not self.print_covered_rows(table_name, columns, converted_conditions, plan):
 
-            conditions_with_selectivity.append((condition, selectivity))
+                for row_id in self.match_rows(table_name, converted_conditions, logical_operator, plan):
+                    self.print_row(columns, positions, table_data.row(row_id))
 
-        # Sort conditions based on selectivity
+        if output:
+            output.rows = plan[-1].rows
 
-        if logical_operator == 'AND':
+    def plan_condition_select(self, table_name, columns, conditions, logical_operator):
 
-            conditions_with_selectivity.sort(key=lambda x: x[1])  # Sort by selectivity, ascending
+        # The Output node of a SELECT with conditions, and its access path nodes as match_rows or
 
+        # print_covered_rows measure them
 
+        covering = self.covering_index(table_name, columns, conditions) if logical_operator != 'OR' else None
 
-        elif logical_operator == 'OR':
+        if covering is None:
 
-            conditions_with_selectivity.sort(key=lambda x: x[1], reverse=True)  # Sort by selectivity, descending
+            plan = self.plan_conditions(table_name, conditions, logical_operator)
 
-        print("Order of evaluation based on selectivity:", [cond[0] for cond, _ in conditions_with_selectivity])
+        else:
 
-        # Evaluate conditions in the sorted order
+            index_name, position = covering
 
-        for row in table_data:
+            estimate = len(self.tables[table_name]["data"])
 
-            condition_results = []
+            for condition in conditions:
+                estimate *= self.condition_selectivity(table_name, *condition)
 
-            for condition, _ in conditions_with_selectivity:
+            label = f"Index Only Scan using {index_name} on {table_name}: {self.describe_condition(conditions[position])}"
 
-                column, operator, value = condition
+            others = conditions[:position] + conditions[position + 1:]
 
-                value = value.strip("'\"")  # Strip extra quotes
+            if others:
+                label += f", Filter: {' AND '.join(self.describe_condition(condition) for condition in others)}"
 
-                result = self.evaluate_condition(row, column, operator, value)
+            plan = [PlanNode(label, estimate)]
 
-                condition_results.append(result)
+        return PlanNode(f"Output: {', '.join(columns)}", plan[-1].estimated_rows, plan[-1:]), plan
 
-                # Short-circuit evaluation
+    def print_covered_rows(self, table_name, columns, conditions, plan=None):
 
-                if logical_operator == 'AND' and not result:
+        # Print the matching rows from an index-only scan; False if no index covers the query
 
-                    break  # No need to evaluate further as one false condition is enough for AND
+        if self.covering_index(table_name, columns, conditions) is None:
 
+            return False
 
+        with self.measure(plan[0] if plan else None):
 
-                elif logical_operator == 'OR' and result:
+            rows = self.index_only_scan(table_name, columns, conditions)
 
-                    break  # No need to evaluate further as one true condition is enough for OR
+        if plan:
+            plan[0].rows += len(rows)
 
-            # Print row if condition is met
+        for row in rows:
+            print({col: row[col] for col in columns})
 
-            if logical_operator == 'AND' and all(condition_results):
+        return True
 
-                self.print_row(columns, row)
+    def convert_condition_value(self, value):
 
+        # Strip extra quotes and convert; a BETWEEN condition carries a (low, high) pair
 
+        if isinstance(value, tuple):
 
-            elif logical_operator == 'OR' and any(condition_results):
+            return tuple(self.convert_literal(bound.strip("'\"")) for bound in value)
 
-                self.print_row(columns, row)
+        return self.convert_literal(value.strip("'\""))
 
+    def resolve_columns(self, table_name, columns):
 
+        # Resolve column names to their catalog positions once per query (None for unknown columns)
 
-            elif not logical_operator:
+        catalog = self.tables[table_name]["catalog"]
 
-                if condition_results[0]:
-                    self.print_row(columns, row)
+        return [catalog.get(col) for col in columns]
 
-    def print_row(self, columns, row):
+    def print_row(self, columns, positions, row):
 
-        selected_data = {col: row.get(col, None) for col in columns}
+        selected_data = {col: row[position] if position is not None else None for col, position in zip(columns, positions)}
 
         print(selected_data)
 
@@ -2068,21 +6651,52 @@ class RDBMS:
 
         table_data = self.tables[table_name]["data"]
 
-        # Use a set to store distinct values (as tuples for multiple columns)
+        output = distinct = None
+
+        if self.explaining:
+
+            # At most one row per combination of the columns' distinct values
+
+            estimate = len(table_data)
+
+            if all(col in table_data.catalog for col in columns):
+                estimate = min(estimate, math.prod(table_data.column_statistics(col).distinct() for col in columns))
+
+            distinct = PlanNode(f"Distinct on {table_name}: {', '.join(columns)}", estimate)
+
+            output = self.explain_plan = PlanNode(f"Output: {', '.join(columns)}", estimate, [distinct])
+
+            if self.explaining == 'plan':
+                return
+
+        # Use a dict to store distinct values (as tuples for multiple columns) in order of first appearance
+
+        distinct_values = {}
+
+        with self.measure(output):
+
+            # Extract distinct values or combinations from the specified columns, reading only those column buffers
+
+            with self.measure(distinct):
+
+                if all(col in table_data.catalog for col in columns):
+
+                    distinct_values.update(dict.fromkeys(table_data.distinct(columns)))
 
-        distinct_values = set()
+                else:
 
-        # Extract distinct values or combinations from the specified columns
+                    selected_columns = [table_data.column_values(col) if col in table_data.catalog else [None] * len(table_data)
+                                        for col in columns]
 
-        for row in table_data:
-            row_values = tuple(row.get(col, None) for col in columns)
+                    distinct_values.update(dict.fromkeys(zip(*selected_columns)))
 
-            distinct_values.add(row_values)
+            # Print the distinct values or combinations
 
-        # Print the distinct values or combinations
+            for value in distinct_values:
+                print(value)
 
-        for value in distinct_values:
-            print(value)
+        if output:
+            output.rows = distinct.rows = len(distinct_values)
 
     def extract_join_table_data(self, statement):
 
@@ -2295,760 +6909,967 @@ class RDBMS:
 
             return []
 
-        index_strat = False
-        Sort_Merge = False
-        Nested_Loop = False
-        table1issmaller = False
-
         table1 = self.tables[table1_name]
 
         table2 = self.tables[table2_name]
 
-        # Determine columns to include in the join
+        if column1_name not in table1["catalog"] or column2_name not in table2["catalog"]:
+            print("One or both join columns do not exist.")
 
-        if columns == ['*']:
+            return []
+
+        # Resolve the output columns to row positions once
+
+        columns = list(dict.fromkeys(columns))
+
+        join_plan = self.resolve_join_columns(columns, table1["catalog"], table2["catalog"])
+
+        # Cost every strategy that can run the join and take the cheapest
+
+        estimated_rows, strategies = self.join_strategies(table1_name, table2_name, [column1_name], [column2_name], operator)
+
+        output = join = scans = None
+
+        if self.explaining:
+
+            join, scans = self.plan_join(strategies[0], table1_name, table2_name, [column1_name], [column2_name], operator, estimated_rows)
+
+            output = self.explain_plan = PlanNode(f"Output: {', '.join(columns)}", estimated_rows, [join])
+
+            if self.explaining == 'plan':
+                return
+
+        with self.measure(output):
 
-            join_columns = set(table1['columns'].keys()).union(table2['columns'].keys())
+            with self.measure(join):
 
+                joined_data = self.run_join(strategies[0], table1_name, table2_name, [column1_name], [column2_name], operator,
+                                            lambda row1, row2: self.combine_rows(row1, row2, join_plan), scans)
+
+            self.print_joined_data(columns, joined_data)
+
+        if output:
+            output.rows = join.rows = len(joined_data)
+
+        strategy, side = strategies[0][2:4]
+
+        outer_name, inner_name = (table1_name, table2_name) if side == 1 else (table2_name, table1_name)
+
+        if strategy == "sort-merge join":
+            print("Joined Using Sort Merge...")
+        elif strategy == "nested loop join":
+            print("Joined using Nested Loop...")
+            print(f"Outer relation: {outer_name}")
+            print(f"Inner relation: {inner_name}")
+        elif strategy == "hash join":
+            print("Joined Using Hash Join...")
+            print(f"Build relation: {outer_name}")
+            print(f"Probe relation: {inner_name}")
         else:
+            print("Joined Using Indices")
 
-            join_columns = set(columns)
+        self.print_join_estimates((table1_name, table2_name), estimated_rows, strategies, len(joined_data))
 
-        # Check for suitable index in table1 or table2
+    def join_strategies(self, table1_name, table2_name, columns1, columns2, operator='='):
 
-        suitable_index1 = self.find_suitable_index(table1.get('indexes', {}), column1_name)
+        # Estimate every strategy that can run a join of table1.columns1 with table2.columns2. The estimated
 
-        suitable_index2 = self.find_suitable_index(table2.get('indexes', {}), column2_name)
+        # output is the product of the row counts over the larger distinct count of each pair of join columns.
 
-        joined_data = []
+        # CPU is counted in key comparisons and memory in rows held at once. Returns the estimated output rows and
 
-        if suitable_index1:
-            index_strat = True
+        # (cpu, memory, strategy, side, index match) tuples, cheapest first. side is the table (1 or 2) that is
 
-            # Use index from table1
+        # the outer of a nested loop, the build side of a hash join, or the indexed side of an index nested loop.
 
-            for row2 in table2["data"]:
+        tables = {1: self.tables[table1_name], 2: self.tables[table2_name]}
 
-                index_key = self.create_index_key(row2, column2_name, suitable_index1)
+        sizes = {side: len(table["data"]) for side, table in tables.items()}
 
-                if index_key in suitable_index1:
+        equi_join = operator == '='
 
-                    for row_id in suitable_index1[index_key]:
-                        combined_row = self.combine_rows(table1["data"][row_id], row2, columns)
+        selectivity = 1.0 if equi_join else DEFAULT_RANGE_SELECTIVITY
 
-                        joined_data.append(combined_row)
+        orderable = hashable = equi_join
 
-        elif suitable_index2:
-            index_strat = True
-            # Use index from table2
+        for column1, column2 in zip(columns1, columns2):
 
-            for row1 in table1["data"]:
+            kinds = [JOIN_KEY_KINDS.get(tables[side]["columns"][column].lower()) for side, column in ((1, column1), (2, column2))]
 
-                index_key = self.create_index_key(row1, column1_name, suitable_index2)
+            hashable = hashable and None not in kinds
 
-                if index_key in suitable_index2:
+            orderable = orderable and None not in kinds and kinds[0] == kinds[1]
 
-                    for row_id in suitable_index2[index_key]:
-                        combined_row = self.combine_rows(row1, table2["data"][row_id], columns)
+            if equi_join:
 
-                        joined_data.append(combined_row)
+                selectivity /= max(min(tables[side]["data"].column_statistics(column).distinct(), sizes[side])
 
-        else:
+                                   for side, column in ((1, column1), (2, column2))) or 1
 
-            table1_data = table1["data"]
+        estimated_rows = round(sizes[1] * sizes[2] * selectivity)
 
-            table2_data = table2["data"]
+        # The smaller table is the outer relation of a nested loop, and the side a hash join builds on.
 
-            if len(table1_data) > 2 * len(table2_data) or len(table2_data) > 2 * len(table1_data):
+        # A nested loop reads the inner table once per block of outer rows.
 
-                # Nested Loop Join
-                # Assume table1_data, table2_data, column1_name, column2_name are defined earlier in the code.
-                # Compare the lengths of the two tables to determine which one is smaller.
-                if len(table1_data) < len(table2_data):
-                    smaller_table = table1_data
-                    larger_table = table2_data
-                    smaller_column = column1_name
-                    larger_column = column2_name
-                    table1issmaller = True
-                else:
-                    smaller_table = table2_data
-                    larger_table = table1_data
-                    smaller_column = column2_name
-                    larger_column = column1_name
-                joined_data = self.nested_loop_join(smaller_table, larger_table, smaller_column, larger_column,
-                                                    operator, columns)
-                Nested_Loop = True
-            else:
-                # Merge Sort Join
-                Sort_Merge = True
-                joined_data = self.merge_sort_join(table1_data, table2_data, column1_name, column2_name, operator,
-                                                   columns)
+        smaller = 1 if sizes[1] < sizes[2] else 2
 
-        self.print_joined_data(joined_data)
-        if Sort_Merge:
-            print("Joined Using Sort Merge...")
-        elif Nested_Loop:
-            print("Joined using Nested Loop...")
-            if table1issmaller:
-                print(f"Outer relation: {table1_name}")
-                print(f"Inner relation: {table2_name}")
-            else:
-                print(f"Outer relation: {table2_name}")
-                print(f"Inner relation: {table1_name}")
-        elif index_strat:
-            print("Joined Using Indices")
+        scan_cost = JOIN_SCAN_COST * (sizes[1] + sizes[2]) + estimated_rows
 
-    def find_suitable_index(self, indexes, column_name):
+        blocks = math.ceil(sizes[smaller] / NESTED_LOOP_BLOCK_ROWS)
 
-        for index_name, index_data in indexes.items():
+        strategies = [(sizes[1] * sizes[2] + JOIN_SCAN_COST * (sizes[smaller] + blocks * sizes[3 - smaller]) + estimated_rows,
 
-            if column_name in index_data['columns']:
-                return index_data['index']
+                       min(sizes[smaller], NESTED_LOOP_BLOCK_ROWS), "nested loop join", smaller, None)]
 
-        return None
+        if hashable:
 
-    def create_index_key(self, row, column_name, index):
+            strategies.append((scan_cost + JOIN_HASH_COST * (sizes[1] + sizes[2]), sizes[smaller], "hash join", smaller, None))
 
-        if isinstance(list(index.keys())[0], tuple):
-            return (row[column_name],)
+        if orderable:
 
-        return row[column_name]
+            sort_cost = sum(size * math.log2(size + 1) for size in sizes.values())
 
-    def combine_rows(self, row1, row2, columns):
+            strategies.append((scan_cost + sort_cost, sizes[1] + sizes[2], "sort-merge join", None, None))
 
-        combined_row = {}
+        # An index is only probed with keys of its own kind, which a B-tree could not compare otherwise
 
-        for col in columns:
-            combined_row[col] = row1.get(col) or row2.get(col)
+        if orderable:
 
-        return combined_row
+            for side, table_name, columns in ((1, table1_name, columns1), (2, table2_name, columns2)):
 
-    def merge_sort_join(self, table1_data, table2_data, column1_name, column2_name, operator, join_columns):
+                match = self.find_suitable_index(table_name, columns)
 
-        # Implement the merge sort join logic
+                if match is None or len(match[1]) != len(columns):
 
-        # Merge Sort Join
+                    continue
 
-        print("MERGE SORT JOIN")
+                # A hash or bitmap probe is one lookup, a B-tree probe descends log2(n) comparisons
 
-        joined_data = []
+                probe_cost = JOIN_HASH_COST if match[0]['using'] in ('hash', 'bitmap') else math.log2(sizes[side] + 1)
 
-        sorted_table1 = sorted(table1_data, key=lambda x: int(x[column1_name]))
+                strategies.append(((JOIN_SCAN_COST + probe_cost) * sizes[3 - side] + JOIN_FETCH_COST * estimated_rows, 0,
 
-        sorted_table2 = sorted(table2_data, key=lambda x: int(x[column2_name]))
+                                   "index nested loop join", side, match))
 
-        print("SORTING COMPLETE")
+        strategies.sort(key=lambda strategy: strategy[:4])
 
-        i, j, runs = 0, 0, 0
+        return estimated_rows, strategies
 
-        while i < len(sorted_table1) and j < len(sorted_table2):
+    def run_join(self, strategy, table1_name, table2_name, columns1, columns2, comparison, combine, scans=None):
 
-            if sorted_table1[i][column1_name] == sorted_table2[j][column2_name]:
+        # Run a join with a strategy from join_strategies. combine(row1, row2) builds an output row from a row of
 
-                combined_row = self.combine_rows(sorted_table1[i], sorted_table2[j], join_columns)
+        # table1 and a row of table2, whichever side the strategy reads first. Under EXPLAIN ANALYZE scans holds
 
-                joined_data.append(combined_row)
+        # the plan node reading each side (1 and 2), from plan_join.
 
-                i += 1
+        _, _, strategy, side, match = strategy
 
-                j += 1
+        stores = {1: self.tables[table1_name]["data"], 2: self.tables[table2_name]["data"]}
 
+        def read(side):
 
+            if not scans:
+                return stores[side].rows()
 
+            start_time = time.perf_counter()
 
+            rows = stores[side].rows()
 
+            scans[side].elapsed += time.perf_counter() - start_time
 
+            return TracedRows(scans[side], rows)
 
-            elif sorted_table1[i][column1_name] < sorted_table2[j][column2_name]:
+        positions = {1: [self.tables[table1_name]["catalog"][column] for column in columns1],
 
-                i += 1
+                     2: [self.tables[table2_name]["catalog"][column] for column in columns2]}
 
+        keys = {side: operator.itemgetter(*side_positions) for side, side_positions in positions.items()}
 
+        if strategy == "index nested loop join":
 
+            # Probe the indexed side once per row of the other, with the key columns in index key order
 
+            inner_columns = columns1 if side == 1 else columns2
 
+            outer_columns = columns2 if side == 1 else columns1
 
+            outer_positions = [self.tables[table2_name if side == 1 else table1_name]["catalog"][outer_columns[inner_columns.index(column)]]
 
-            else:
+                               for column in match[1]]
 
-                j += 1
+            probe = self.index_probe(match[0], len(match[1]))
 
-        return joined_data
+            if scans:
+                probe = self.traced_probe(scans[side], probe)
 
-    def nested_loop_join(self, smaller_table, larger_table, smaller_column, larger_column, operator, join_columns):
+            inner_store = stores[side]
 
-        print("NESTED LOOP JOIN")
+            joined_data = []
 
-        joined_data = []
+            for outer_row in read(3 - side):
 
-        for row1 in smaller_table:
+                for row_id in probe(tuple(outer_row[position] for position in outer_positions)):
 
-            for row2 in larger_table:
+                    inner_row = inner_store.row(row_id)
 
-                if self.evaluate_join_condition(row1, row2, smaller_column, larger_column, operator):
-                    combined_row = self.combine_rows(row1, row2, join_columns)
+                    joined_data.append(combine(inner_row, outer_row) if side == 1 else combine(outer_row, inner_row))
 
-                    joined_data.append(combined_row)
+            return joined_data
 
-        return joined_data
+        if strategy == "hash join":
 
-    def join_natural_tables(self, table1_name, table2_name, columns):
+            return self.hash_join(read(side), keys[side], read(3 - side), keys[3 - side],
 
-        # Check if the tables exist in the database
+                                  combine if side == 1 else lambda build_row, probe_row: combine(probe_row, build_row))
 
-        if table1_name not in self.tables:
+        # Dictionary-encoded string join columns are merged and compared by integer rank instead of by string
 
-            raise ValueError(f"{table1_name} is not in tables")
+        keys1, keys2 = self.dictionary_join_keys(stores[1], columns1[0], stores[2], columns2[0]) if len(columns1) == 1 else (None, None)
 
-        elif table2_name not in self.tables:
+        if strategy == "sort-merge join":
 
-            raise ValueError(f"{table2_name} is not in tables")
+            return self.merge_sort_join(read(1), read(2), keys[1], keys[2], combine, keys1, keys2)
 
-        table1 = self.tables[table1_name]["data"]
+        compare = COMPARISONS.get(comparison)
 
-        table2 = self.tables[table2_name]["data"]
+        if side == 1:
 
-        # print(f"table1: {table1}")
+            return self.nested_loop_join(read(1), read(2), keys[1], keys[2], compare, combine, keys1, keys2)
 
-        # print(f"table2: {table2}")
+        # The outer rows come from table2, so the comparison and the output row are taken the other way round
 
-        for col in columns:
-            print(f"column name = {col} | column type = {type(col)}")
+        return self.nested_loop_join(read(2), read(1), keys[2], keys[1],
 
-        # Find common columns
+                                     compare and (lambda value2, value1: compare(value1, value2)),
 
-        common_columns = set(self.tables[table1_name]["columns"]).intersection(set(self.tables[table2_name]["columns"]))
+                                     lambda row2, row1: combine(row1, row2), keys2, keys1)
 
-        if not common_columns:
-            raise ValueError("No common columns to perform a natural join.")
+    def plan_join(self, strategy, table1_name, table2_name, columns1, columns2, comparison, estimated_rows):
 
-        joined_data = []
+        # The plan node of a join run with a strategy from join_strategies, over a node reading each table,
 
-        # Decide join strategy based on table sizes
+        # and those nodes by side for run_join. The indexed side of an index nested loop is read by probes.
 
-        if len(table1) > 2 * len(table2) or len(table2) > 2 * len(table1):
+        cpu, memory, strategy, side, match = strategy
 
-            # Size difference is significant, use nested loop with smaller table outside
+        names = {1: table1_name, 2: table2_name}
 
-            smaller_table, larger_table = (table1, table2) if len(table1) < len(table2) else (table2, table1)
+        condition = " AND ".join(f"{table1_name}.{column1} {comparison} {table2_name}.{column2}"
+                                 for column1, column2 in zip(columns1, columns2))
 
-            print("USING OPTIMIZER WITH NESTED FOR LOOP SMALL CONDITION  : OUTER")
+        scans = {1: PlanNode(f"Seq Scan on {table1_name}", len(self.tables[table1_name]["data"])),
+                 2: PlanNode(f"Seq Scan on {table2_name}", len(self.tables[table2_name]["data"]))}
+
+        if strategy == "index nested loop join":
+
+            scans[side] = PlanNode(f"Index Scan using {self.index_name(names[side], match[0])} on {names[side]}", estimated_rows)
 
-            for row1 in smaller_table:
+            label, children = f"Index Nested Loop Join (index on {names[side]})", [scans[3 - side], scans[side]]
 
-                for row2 in larger_table:
+        elif strategy == "hash join":
 
-                    if all(row1[col] == row2[col] for col in common_columns):
-                        combined_row = self.merge_rows_for_natural_join(row1, row2, common_columns, columns)
+            label, children = f"Hash Join (build {names[side]})", [scans[side], scans[3 - side]]
 
-                        joined_data.append(combined_row)
+        elif strategy == "nested loop join":
+
+            label, children = f"Nested Loop Join (outer {names[side]})", [scans[side], scans[3 - side]]
 
         else:
 
-            # Sizes are similar, sort tables and use merge-join
+            label, children = "Sort-Merge Join", [scans[1], scans[2]]
 
-            print("USING SORT MERGE TO COMBINE THESE TWO TABLES")
+        return PlanNode(f"{label}: {condition}  (cost cpu={round(cpu)} memory={memory} rows)", estimated_rows, children), scans
 
-            sorted_table1 = sorted(table1, key=lambda x: tuple(int(x[col]) for col in common_columns))
+    def print_join_estimates(self, table_names, estimated_rows, strategies, joined_rows):
 
-            sorted_table2 = sorted(table2, key=lambda x: tuple(int(x[col]) for col in common_columns))
+        # Every costed strategy next to the estimated and the actual number of joined rows, the chosen one first
 
-            # print(f"sorted_table1: {sorted_table1}")
+        print(f"Join estimates: {estimated_rows} rows estimated, {joined_rows} rows joined")
 
-            # print(f"sorted_table2: {sorted_table2}")
+        sides = {"nested loop join": "outer", "hash join": "build", "index nested loop join": "index on"}
 
-            i, j = 0, 0
+        labels = [f"{strategy} ({sides[strategy]} {table_names[side - 1]})" if strategy in sides else strategy
 
-            while i < len(sorted_table1) and j < len(sorted_table2):
+                  for _, _, strategy, side, _ in strategies]
 
-                # print(f"sorted_table i col: {[sorted_table1[i][col] for col in common_columns]}")
+        width = max(len(label) for label in labels)
 
-                # print(f"sorted_table j col: {[sorted_table2[j][col] for col in common_columns]}")
+        for position, (label, (cpu, memory, _, _, _)) in enumerate(zip(labels, strategies)):
 
-                comparison = [int(sorted_table1[i][col]) - int(sorted_table2[j][col]) for col in common_columns]
+            print(f"  {label:<{width}}  cpu {round(cpu):>12}  memory {memory:>8} rows{'  (chosen)' if position == 0 else ''}")
 
-                if all(x == 0 for x in comparison):
+    def find_suitable_index(self, table_name, columns, operator='='):
 
-                    # Rows match, merge and add to joined_data
+        # Match an index to a predicate on the given columns. An index is usable when its key starts with
 
-                    combined_row = self.merge_rows_for_natural_join(sorted_table1[i], sorted_table2[j], common_columns,
+        # some of them: a B-tree for equality on that prefix, or for a range on a single column, and a hash
 
-                                                                    columns)
+        # index only for equality on its whole key. The index covering the most columns wins, then one
 
-                    joined_data.append(combined_row)
+        # probed with its full key, then a hash index, then the shortest key. Returns (index_info, the
 
-                    i += 1
+        # matched key columns in key order), or None.
 
-                    j += 1
+        best = None
 
-                elif any(x < 0 for x in comparison):
+        for index_name, index_info in self.tables[table_name].get('indexes', {}).items():
 
-                    # sorted_table1's row comes before sorted_table2's, advance in sorted_table1
+            key_columns = index_info['columns'] if isinstance(index_info['columns'], list) else [index_info['columns']]
 
-                    i += 1
+            prefix = []
 
-                else:
+            for column in key_columns:
 
-                    # sorted_table2's row comes before sorted_table1's, advance in sorted_table2
+                if column not in columns or column in prefix:
+                    break
 
-                    j += 1
+                prefix.append(column)
 
-        self.print_joined_data(joined_data)
+            exact = len(prefix) == len(key_columns)
 
-    def merge_rows_for_natural_join(self, row1, row2, common_columns, join_columns):
+            if not prefix or (operator != '=' and len(prefix) > 1):
+                continue
 
-        # Combine rows for a natural join
+            if index_info['using'] in ('hash', 'bitmap') and (operator != '=' or not exact):
+                continue
 
-        combined_row = {}
+            rank = (-len(prefix), not exact, index_info['using'] != 'hash', len(key_columns), index_name)
 
-        for col in join_columns:
+            if best is None or rank < best[0]:
+                best = (rank, index_info, prefix)
 
-            if col in row1:
+        return best[1:] if best else None
 
-                combined_row[col] = row1[col]
+    def index_probe(self, index_info, prefix_length):
 
+        # Fix the key shape once and return a function from a key prefix tuple to the row ids holding it,
 
+        # in row order. A full key is a single lookup; a shorter prefix walks the B-tree from the prefix,
 
+        # which sorts before every key that extends it.
 
+        index = index_info['index']
 
+        key_length = len(index_info['columns']) if isinstance(index_info['columns'], list) else 1
 
+        if prefix_length == key_length:
 
-            elif col in row2:
+            return lambda key: index.get(key, ())
 
-                combined_row[col] = row2[col]
+        def probe(key):
 
-        return combined_row
+            postings = [posting for index_key, posting in takewhile(lambda item: item[0][:prefix_length] == key, index.items(min=key))]
 
-    def evaluate_join_condition(self, row1, row2, column1_name, column2_name, operator):
+            return postings[0] if len(postings) == 1 else sorted(chain.from_iterable(postings))
 
-        # Convert both values to strings for a generic comparison
+        return probe
 
-        value1 = str(row1.get(column1_name, ''))
+    def resolve_join_columns(self, columns, catalog1, catalog2):
 
-        value2 = str(row2.get(column2_name, ''))
+        # For each output column, its position in the first and in the second row (None when absent)
 
-        if operator == "=":
+        return [(catalog1.get(col), catalog2.get(col)) for col in columns]
 
-            return value1 == value2
+    def combine_rows(self, row1, row2, join_plan):
 
+        # Build the output tuple, taking a column from row1 when it has one and from row2 otherwise
 
+        return tuple(row1[pos1] if pos1 is not None else row2[pos2] if pos2 is not None else None
+                     for pos1, pos2 in join_plan)
 
+    def dictionary_join_keys(self, store1, column1_name, store2, column2_name):
 
+        # When both join columns are dictionary-encoded strings, rank the union of the two dictionaries so
 
+        # every row gets an integer join key that compares exactly like its string. Returns (None, None) otherwise.
 
+        if not (isinstance(store1, ColumnStore) and isinstance(store2, ColumnStore)
 
-        elif operator == "<":
+                and column1_name in store1.catalog and column2_name in store2.catalog):
 
-            return value1 < value2
+            return None, None
 
+        column1 = store1.column(column1_name)
 
+        column2 = store2.column(column2_name)
 
+        if not (isinstance(column1, DictionaryColumn) and isinstance(column2, DictionaryColumn)):
 
+            return None, None
 
+        ranks = {value: rank for rank, value in enumerate(sorted(set(column1.dictionary).union(column2.dictionary)))}
 
+        keys = []
 
-        elif operator == ">":
+        for store, column in ((store1, column1), (store2, column2)):
 
-            return value1 > value2
+            code_ranks = [ranks[value] for value in column.dictionary]
 
+            codes = column.codes
 
+            keys.append([code_ranks[codes[row_id]] for row_id in store.row_ids()])
 
+        return keys[0], keys[1]
 
+    def merge_sort_join(self, table1_data, table2_data, key1, key2, combine, keys1=None, keys2=None):
 
+        # Sort both sides on the join key and merge them, pairing every row of a run of equal keys on one side
 
+        # with every row of the matching run on the other. keys1 and keys2 replace key(row) when given.
 
-        elif operator == "<=":
+        print("MERGE SORT JOIN")
 
-            return value1 <= value2
+        table1_data = list(table1_data)
 
+        table2_data = list(table2_data)
 
+        keys1 = keys1 if keys1 is not None else [key1(row) for row in table1_data]
 
+        keys2 = keys2 if keys2 is not None else [key2(row) for row in table2_data]
 
+        order1 = sorted(range(len(keys1)), key=keys1.__getitem__)
 
+        order2 = sorted(range(len(keys2)), key=keys2.__getitem__)
 
+        sorted_table1, sorted_keys1 = [table1_data[i] for i in order1], [keys1[i] for i in order1]
 
-        elif operator == ">=":
+        sorted_table2, sorted_keys2 = [table2_data[i] for i in order2], [keys2[i] for i in order2]
 
-            return value1 >= value2
+        print("SORTING COMPLETE")
 
+        joined_data = []
 
+        i, j = 0, 0
 
+        while i < len(sorted_table1) and j < len(sorted_table2):
 
+            if sorted_keys1[i] < sorted_keys2[j]:
 
+                i += 1
 
+            elif sorted_keys1[i] > sorted_keys2[j]:
 
-        elif operator == "!=":
+                j += 1
 
-            return value1 != value2
+            else:
+
+                end1, end2 = i + 1, j + 1
+
+                while end1 < len(sorted_table1) and sorted_keys1[end1] == sorted_keys1[i]:
+                    end1 += 1
+
+                while end2 < len(sorted_table2) and sorted_keys2[end2] == sorted_keys2[j]:
+                    end2 += 1
+
+                for row1 in sorted_table1[i:end1]:
+
+                    for row2 in sorted_table2[j:end2]:
+                        joined_data.append(combine(row1, row2))
 
+                i, j = end1, end2
+
+        return joined_data
+
+    def hash_join(self, build_rows, build_key, probe_rows, probe_key, combine):
+
+        # Hash the build side by join key, then stream the probe side once; combine(build row, probe row)
+
+        print("HASH JOIN")
+
+        buckets = {}
+
+        for row in build_rows:
+            buckets.setdefault(build_key(row), []).append(row)
+
+        joined_data = []
+
+        for row in probe_rows:
+
+            for build_row in buckets.get(probe_key(row), ()):
+                joined_data.append(combine(build_row, row))
+
+        return joined_data
+
+    def nested_loop_join(self, outer_table, inner_table, outer_key, inner_key, compare, combine,
+                         outer_keys=None, inner_keys=None):
+
+        print("NESTED LOOP JOIN")
 
+        joined_data = []
 
+        if compare is None:
+            return joined_data
 
+        # Block nested loop: read the outer relation a block at a time and stream the inner relation once
+        # per block, so an on-disk inner table is scanned page by page and each join key is read once.
+        # Precomputed join keys (dictionary-encoded columns) replace the key functions when given.
 
+        if outer_keys is not None and inner_keys is not None:
 
+            outer_rows = zip(outer_keys, outer_table)
 
         else:
 
-            return False
+            outer_rows = ((outer_key(row1), row1) for row1 in outer_table)
 
-    def print_joined_data(self, joined_data):
+            inner_keys = None
 
-        if not joined_data:
-            print("No data to display.")
+        while True:
 
-            return
+            block = [(value1, row1, []) for value1, row1 in islice(outer_rows, NESTED_LOOP_BLOCK_ROWS)]
 
-        # Determine the column names (keys) from the first row
+            if not block:
+                break
 
-        columns = list(joined_data[0].keys())
+            if inner_keys is not None:
 
-        # Calculate the maximum width for each column for proper alignment
+                inner_rows = zip(inner_keys, inner_table)
 
-        column_widths = {col: max(len(col), max(len(str(row[col])) for row in joined_data)) for col in columns}
+            else:
 
-        # Print header row
+                inner_rows = ((inner_key(row2), row2) for row2 in inner_table)
 
-        header_row = " | ".join(col.ljust(column_widths[col]) for col in columns)
+            for value2, row2 in inner_rows:
 
-        print(header_row)
+                for value1, row1, matches in block:
 
-        print("-" * len(header_row))
+                    if compare(value1, value2):
+                        matches.append(combine(row1, row2))
 
-        # Print each row in joined data
+            # Emit matches outer row by outer row, in the same order as a plain nested loop
 
-        for row in joined_data:
-            row_str = " | ".join(str(row[col]).ljust(column_widths[col]) for col in columns)
+            for _, _, matches in block:
+                joined_data.extend(matches)
 
-            print(row_str)
+        return joined_data
 
-        pass
+    def join_natural_tables(self, table1_name, table2_name, columns):
 
-    def print_table(self, table_name):
+        # Check if the tables exist in the database
 
-        # Check if the table exists
+        if table1_name not in self.tables:
 
-        if table_name not in self.tables:
-            print(f"Table {table_name} does not exist.")
+            raise ValueError(f"{table1_name} is not in tables")
 
-            return
+        elif table2_name not in self.tables:
 
-        # Retrieve the table data
+            raise ValueError(f"{table2_name} is not in tables")
 
-        table_data = self.tables[table_name]
+        for col in columns:
+            print(f"column name = {col} | column type = {type(col)}")
 
-        columns = table_data['columns']
+        # Find common columns
 
-        rows = table_data['data']
+        common_columns = set(self.tables[table1_name]["columns"]).intersection(set(self.tables[table2_name]["columns"]))
 
-        # Print column headers
+        if not common_columns:
+            raise ValueError("No common columns to perform a natural join.")
 
-        column_headers = ' | '.join(columns.keys())
+        # Resolve the output columns to row positions once
 
-        print(column_headers)
+        catalog1 = self.tables[table1_name]["catalog"]
 
-        print('-' * len(column_headers))  # Print a separator line
+        catalog2 = self.tables[table2_name]["catalog"]
 
-        # Print each row of data
+        common_columns = [column for column in self.tables[table1_name]["columns"] if column in common_columns]
 
-        for row in rows:
-            row_data = [str(row[col]) for col in columns]
+        columns = list(dict.fromkeys(col for col in columns if col in catalog1 or col in catalog2))
 
-            print(' | '.join(row_data))
+        natural_plan = self.resolve_natural_join_columns(columns, catalog1, catalog2)
 
+        # Cost every strategy that can join on the common columns and take the cheapest
 
-# Example usage
+        estimated_rows, strategies = self.join_strategies(table1_name, table2_name, common_columns, common_columns)
 
+        strategy = strategies[0][2]
 
-db = RDBMS()
+        if strategy == "nested loop join":
+
+            print("USING OPTIMIZER WITH NESTED FOR LOOP SMALL CONDITION  : OUTER")
 
-# CREATE THE NECESSARY PRE_LOADED TABLES
-state1 = "CREATE TABLE ii_1000 (Int Integer, Int2 Integer, PRIMARY KEY (Int));"
-db.parse_sql(state1)
-# INSERT VALUES
-ii_1000 = []
-for i in range(1,1001):
-    ii_1000.append((i,i))
-for i in ii_1000:
-    db.insert("ii_1000", i)
+        elif strategy == "sort-merge join":
 
-state = "CREATE TABLE i1_1000 (Int Integer, NumOne Integer, PRIMARY KEY (Int), FOREIGN KEY (Int) REFERENCES ii_1000(Int));"
-db.parse_sql(state)
-i1_1000 = []
-for i in range(1,1001):
-    i1_1000.append((i,1))
-for i in i1_1000:
-    db.insert("i1_1000", i)
+            print("USING SORT MERGE TO COMBINE THESE TWO TABLES")
 
-db.create_table("ii_10000", {'Int1': 'Integer','Int2': 'Integer'})
-ii_10000 = []
-for i in range(1,10001):
-    ii_10000.append((i,i))
-for i in ii_10000:
-    db.insert("ii_10000", i)
+        elif strategy == "hash join":
 
-db.create_table("i1_10000", {'Int': 'Integer','NumOne': 'Integer'})
-i1_10000 = []
-for i in range(1,10001):
-    i1_10000.append((i,1))
-for i in i1_10000:
-    db.insert("i1_10000", i)
+            print("USING HASH JOIN TO COMBINE THESE TWO TABLES")
 
-# Pre-made Employee Details Table
+        else:
 
-employee_details_create = "CREATE TABLE EmployeeDetails (ID INTEGER, Name STRING, Department STRING, Salary FLOAT, PRIMARY KEY (ID)"
+            print("USING INDEX NESTED LOOP TO COMBINE THESE TWO TABLES")
 
-db.parse_sql(employee_details_create)
+        output = join = scans = None
 
-detail_insert1 = "INSERT INTO EmployeeDetails (ID, Name, Department, Salary) VALUES (1, 'John Doe', 'HR', 50000)"
+        if self.explaining:
 
-detail_insert2 = "INSERT INTO EmployeeDetails (ID, Name, Department, Salary) VALUES (2, 'Jane Smith', 'Marketing', 48000)"
+            join, scans = self.plan_join(strategies[0], table1_name, table2_name, common_columns, common_columns, '=', estimated_rows)
 
-detail_insert3 = "INSERT INTO EmployeeDetails (ID, Name, Department, Salary) VALUES (3, 'Bob Johnson', 'Finance', 55000)"
+            output = self.explain_plan = PlanNode(f"Output: {', '.join(columns)}", estimated_rows, [join])
 
-detail_insert4 = "INSERT INTO EmployeeDetails (ID, Name, Department, Salary) VALUES (4, 'Mary Wilson', 'Engineering', 62000)"
+            if self.explaining == 'plan':
+                return
 
-detail_insert5 = "INSERT INTO EmployeeDetails (ID, Name, Department, Salary) VALUES (5, 'David Brown', 'IT', 58000)"
+        with self.measure(output):
 
-detail_insert6 = "INSERT INTO EmployeeDetails (ID, Name, Department, Salary) VALUES (6, 'Lisa Jackson', 'Marketing', 49000)"
+            with self.measure(join):
 
-detail_insert7 = "INSERT INTO EmployeeDetails (ID, Name, Department, Salary) VALUES (7, 'Michael Jones', 'Finance', 56000)"
+                joined_data = self.run_join(strategies[0], table1_name, table2_name, common_columns, common_columns, '=',
+                                            lambda row1, row2: self.merge_rows_for_natural_join(row1, row2, natural_plan), scans)
 
-detail_insert8 = "INSERT INTO EmployeeDetails (ID, Name, Department, Salary) VALUES (8, 'Susan Miller', 'Engineering', 63000)"
+            self.print_joined_data(columns, joined_data)
 
-detail_insert9 = "INSERT INTO EmployeeDetails (ID, Name, Department, Salary) VALUES (9, 'Richard Davis', 'IT', 59000)"
+        if output:
+            output.rows = join.rows = len(joined_data)
 
-detail_insert10 = "INSERT INTO EmployeeDetails (ID, Name, Department, Salary) VALUES (10, 'Jennifer White', 'Marketing', 50000)"
+        self.print_join_estimates((table1_name, table2_name), estimated_rows, strategies, len(joined_data))
 
-detail_insert11 = "INSERT INTO EmployeeDetails (ID, Name, Department, Salary) VALUES (11, 'William Moore', 'Finance', 57000)"
+    def resolve_natural_join_columns(self, columns, catalog1, catalog2):
 
-detail_insert12 = "INSERT INTO EmployeeDetails (ID, Name, Department, Salary) VALUES (12, 'Patricia Harris', 'Engineering', 64000)"
+        # For each output column, which row it is read from (0 or 1) and its position there
 
-detail_insert13 = "INSERT INTO EmployeeDetails (ID, Name, Department, Salary) VALUES (13, 'James Thomas', 'IT', 60000)"
+        return [(0, catalog1[col]) if col in catalog1 else (1, catalog2[col]) for col in columns]
 
-detail_insert14 = "INSERT INTO EmployeeDetails (ID, Name, Department, Salary) VALUES (14, 'Elizabeth Martin', 'Marketing', 51000)"
+    def merge_rows_for_natural_join(self, row1, row2, natural_plan):
 
-detail_insert15 = "INSERT INTO EmployeeDetails (ID, Name, Department, Salary) VALUES (15, 'John Wilson', 'Finance', 58000)"
+        # Combine rows for a natural join
 
-detail_insert16 = "INSERT INTO EmployeeDetails (ID, Name, Department, Salary) VALUES (16, 'Sarah Anderson', 'Engineering', 65000)"
+        rows = (row1, row2)
 
-detail_insert17 = "INSERT INTO EmployeeDetails (ID, Name, Department, Salary) VALUES (17, 'Robert Lewis', 'IT', 61000)"
+        return tuple(rows[side][position] for side, position in natural_plan)
 
-detail_insert18 = "INSERT INTO EmployeeDetails (ID, Name, Department, Salary) VALUES (18, 'Linda Garcia', 'Marketing', 52000)"
+    def join_value(self, row, position):
 
-detail_insert19 = "INSERT INTO EmployeeDetails (ID, Name, Department, Salary) VALUES (19, 'Daniel Martinez', 'Finance', 59000)"
+        # Join values are compared as strings, with a missing column treated as ''
 
-detail_insert20 = "INSERT INTO EmployeeDetails (ID, Name, Department, Salary) VALUES (20, 'Karen Hernandez', 'Engineering', 66000)"
+        return str(row[position]) if position is not None else ''
 
-db.parse_sql(detail_insert1)
+    def evaluate_join_condition(self, row1, row2, position1, position2, operator):
 
-db.parse_sql(detail_insert2)
+        # Convert both values to strings for a generic comparison
 
-db.parse_sql(detail_insert3)
+        value1 = self.join_value(row1, position1)
 
-db.parse_sql(detail_insert4)
+        value2 = self.join_value(row2, position2)
 
-db.parse_sql(detail_insert5)
+        if operator == "=":
 
-db.parse_sql(detail_insert6)
+            return value1 == value2
 
-db.parse_sql(detail_insert7)
 
-db.parse_sql(detail_insert8)
 
-db.parse_sql(detail_insert9)
 
-db.parse_sql(detail_insert10)
 
-db.parse_sql(detail_insert11)
 
-db.parse_sql(detail_insert12)
 
-db.parse_sql(detail_insert13)
+        elif operator == "<":
 
-db.parse_sql(detail_insert14)
+            return value1 < value2
 
-db.parse_sql(detail_insert15)
 
-db.parse_sql(detail_insert16)
 
-db.parse_sql(detail_insert17)
 
-db.parse_sql(detail_insert18)
 
-db.parse_sql(detail_insert19)
 
-db.parse_sql(detail_insert20)
 
+        elif operator == ">":
 
+            return value1 > value2
 
 
-# Pre-made Employee Contact Table
-employee_contact_create = "CREATE TABLE EmployeeContactInfo (ID INTEGER, Email STRING, Phone String, PRIMARY KEY (Email), FOREIGN KEY (ID) REFERENCES EmployeeDetails(ID));"
 
-db.parse_sql(employee_contact_create)
 
-contact_insert1 = "INSERT INTO EmployeeContactInfo (ID, Email, Phone) VALUES (1, 'john.doe@example.com', '(555) 123-4567')"
 
-contact_insert2 = "INSERT INTO EmployeeContactInfo (ID, Email, Phone) VALUES (2, 'jane.smith@example.com', '(555) 234-5678')"
 
-contact_insert3 = "INSERT INTO EmployeeContactInfo (ID, Email, Phone) VALUES (3, 'bob.johnson@example.com', '(555) 345-6789')"
 
-contact_insert4 = "INSERT INTO EmployeeContactInfo (ID, Email, Phone) VALUES (4, 'mary.wilson@example.com', '(555) 456-7890')"
+        elif operator == "<=":
 
-contact_insert5 = "INSERT INTO EmployeeContactInfo (ID, Email, Phone) VALUES (5, 'david.brown@example.com', '(555) 567-8901')"
+            return value1 <= value2
 
-contact_insert6 = "INSERT INTO EmployeeContactInfo (ID, Email, Phone) VALUES (6, 'lisa.jackson@example.com', '(555) 678-9012')"
 
-contact_insert7 = "INSERT INTO EmployeeContactInfo (ID, Email, Phone) VALUES (7, 'michael.jones@example.com', '(555) 789-0123')"
 
-contact_insert8 = "INSERT INTO EmployeeContactInfo (ID, Email, Phone) VALUES (8, 'susan.miller@example.com', '(555) 890-1234')"
 
-contact_insert9 = "INSERT INTO EmployeeContactInfo (ID, Email, Phone) VALUES (9, 'richard.davis@example.com', '(555) 901-2345')"
 
-contact_insert10 = "INSERT INTO EmployeeContactInfo (ID, Email, Phone) VALUES (10, 'jennifer.white@example.com', '(555) 012-3456')"
 
-contact_insert11 = "INSERT INTO EmployeeContactInfo (ID, Email, Phone) VALUES (11, 'william.moore@example.com', '(555) 123-4567')"
 
-contact_insert12 = "INSERT INTO EmployeeContactInfo (ID, Email, Phone) VALUES (12, 'patricia.harris@example.com', '(555) 234-5678')"
+        elif operator == ">=":
 
-contact_insert13 = "INSERT INTO EmployeeContactInfo (ID, Email, Phone) VALUES (13, 'james.thomas@example.com', '(555) 345-6789')"
+            return value1 >= value2
 
-contact_insert14 = "INSERT INTO EmployeeContactInfo (ID, Email, Phone) VALUES (14, 'elizabeth.martin@example.com', '(555) 456-7890')"
 
-contact_insert15 = "INSERT INTO EmployeeContactInfo (ID, Email, Phone) VALUES (15, 'john.wilson@example.com', '(555) 567-8901')"
 
-contact_insert16 = "INSERT INTO EmployeeContactInfo (ID, Email, Phone) VALUES (16, 'sarah.anderson@example.com', '(555) 678-9012')"
 
-contact_insert17 = "INSERT INTO EmployeeContactInfo (ID, Email, Phone) VALUES (17, 'robert.lewis@example.com', '(555) 789-0123')"
 
-contact_insert18 = "INSERT INTO EmployeeContactInfo (ID, Email, Phone) VALUES (18, 'linda.garcia@example.com', '(555) 890-1234')"
 
-contact_insert19 = "INSERT INTO EmployeeContactInfo (ID, Email, Phone) VALUES (19, 'daniel.martinez@example.com', '(555) 901-2345')"
 
-contact_insert20 = "INSERT INTO EmployeeContactInfo (ID, Email, Phone) VALUES (20, 'karen.hernandez@example.com', '(555) 012-3456')"
+        elif operator == "!=":
 
-db.parse_sql(contact_insert1)
+            return value1 != value2
 
-db.parse_sql(contact_insert2)
 
-db.parse_sql(contact_insert3)
 
-db.parse_sql(contact_insert4)
 
-db.parse_sql(contact_insert5)
 
-db.parse_sql(contact_insert6)
 
-db.parse_sql(contact_insert7)
 
-db.parse_sql(contact_insert8)
+        else:
 
-db.parse_sql(contact_insert9)
+            return False
 
-db.parse_sql(contact_insert10)
+    def print_joined_data(self, columns, joined_data):
 
-db.parse_sql(contact_insert11)
+        if not joined_data:
+            print("No data to display.")
 
-db.parse_sql(contact_insert12)
+            return
 
-db.parse_sql(contact_insert13)
+        # Joined rows are tuples laid out like columns
 
-db.parse_sql(contact_insert14)
+        # Calculate the maximum width for each column for proper alignment
 
-db.parse_sql(contact_insert15)
+        column_widths = [max(len(col), max(len(str(row[position])) for row in joined_data))
+                         for position, col in enumerate(columns)]
 
-db.parse_sql(contact_insert16)
+        # Print header row
 
-db.parse_sql(contact_insert17)
+        header_row = " | ".join(col.ljust(width) for col, width in zip(columns, column_widths))
 
-db.parse_sql(contact_insert18)
+        print(header_row)
 
-db.parse_sql(contact_insert19)
+        print("-" * len(header_row))
 
-db.parse_sql(contact_insert20)
+        # Print each row in joined data
 
-# ****QUERIES****
-# --CREATE TABLE--
-# CREATE TABLE EmployeeDetailsSample (ID INTEGER, Name STRING, Department STRING, Salary FLOAT, PRIMARY KEY (ID)
-# INSERT INTO EmployeeDetailsSample (ID, Name, Department, Salary) VALUES (1, 'John Doe', 'HR', 50000)
-# INSERT INTO EmployeeDetailsSample (ID, Name, Department, Salary) VALUES (2, 'Alex Henry', 'Marketing', 45000)
-# SELECT * FROM EmployeeDetailsSample
+        for row in joined_data:
+            row_str = " | ".join(str(value).ljust(width) for value, width in zip(row, column_widths))
 
-# --W/ FOREIGN KEY--
-# CREATE TABLE Projects (ProjectID INTEGER, EmployeeID Integer, PRIMARY KEY (ProjectID), FOREIGN KEY (EmployeeID) REFERENCES EmployeeDetailsSample(ID))
-# INSERT INTO Projects (ProjectID, EmployeeID) VALUES (20, 1)
-# SELECT ProjectID, EmployeeID FROM Projects
+            print(row_str)
 
-# FOREIGN KEY Violation
-# INSERT INTO Projects (ProjectID, EmployeeID) VALUES (15, 3)
-# PRIMARY KEY Violation
-# INSERT INTO Projects (ProjectID, EmployeeID) VALUES (20, 2)
+        pass
 
-# --Preloaded Tables--
-# SELECT ID, Name, Department, Salary FROM EmployeeDetails
-# SELECT ID, Email, Phone FROM EmployeeContactInfo
+    def print_table(self, table_name):
 
-# Testing Primary Key
-# INSERT INTO EmployeeDetails (ID, Name, Department, Salary) VALUES (17, 'John Doe', 'HR', 50000)
+        # Check if the table exists
 
-# --Aggregate Operators--
-# SELECT MAX(Salary) FROM EmployeeDetails (correct number = 66000.0)
-# SELECT MIN(Salary) FROM EmployeeDetails (correct number = 48000.0)
-# SELECT SUM(Salary) FROM EmployeeDetails (correct number = 1143000.0)
-# SELECT AVG(Salary) FROM EmployeeDetails (correct number = 57150.0)
-# SELECT COUNT(Name) FROM EmployeeDetails (correct number = 20)
+        if table_name not in self.tables:
+            print(f"Table {table_name} does not exist.")
 
-# --WHERE and Logical Operators--
-# SELECT ID, Name, Department FROM EmployeeDetails WHERE Department = 'Marketing'
+            return
 
-# SELECT * FROM EmployeeDetails WHERE Salary > 55000 AND Department = 'Engineering'
-# SELECT ID, Name, Department, Salary FROM EmployeeDetails WHERE Salary > 62000 OR Department = 'Marketing'
-# SELECT ID, Name, Department, Salary FROM EmployeeDetails WHERE Salary > 62000 OR Department = 'Marketing' OR Name = 'Bob Johnson'
-# SELECT ID, Name, Department, Salary FROM EmployeeDetails WHERE ID < 10 AND Salary < 58000 AND Department = 'Marketing'
+        # Retrieve the table data
 
-# --DISTINCT--
-# SELECT DISTINCT Department FROM EmployeeDetails
+        table_data = self.tables[table_name]
 
-# --JOIN--
-# SELECT EmployeeDetails.ID, EmployeeDetails.Name, EmployeeDetails.Department, EmployeeContactInfo.Email, FROM EmployeeDetails JOIN EmployeeContactInfo ON EmployeeDetails.ID = EmployeeContactInfo.ID
-# --NATURAL JOIN--
-# SELECT EmployeeDetails.ID, EmployeeDetails.Name, EmployeeDetails.Department, EmployeeDetails.Salary, EmployeeContactInfo.Email, EmployeeContactInfo.Phone FROM EmployeeDetails NATURAL JOIN EmployeeContactInfo
-# SELECT EmployeeDetails.ID, EmployeeDetails.Name, EmployeeDetails.Department, EmployeeContactInfo.Email, FROM EmployeeDetails JOIN EmployeeContactInfo ON EmployeeDetails.ID = EmployeeContactInfo.ID
+        columns = table_data['columns']
 
-# --UPDATE--
-# UPDATE EmployeeDetails SET Department = 'IT' WHERE ID = 3
-# UPDATE EmployeeDetails SET Department = 'Engineering' WHERE Name = 'John Doe' OR Salary < 50000
+        rows = table_data['data']
 
-# --DELETE--
-# DELETE FROM EmployeeDetails WHERE ID > 9
-# DELETE FROM EmployeeDetails WHERE Department = 'Engineering' AND Salary < 60000
+        # Print column headers
 
-# **PRINT**
-# SELECT ID, Name, Department, Salary FROM EmployeeDetails
+        column_headers = ' | '.join(columns.keys())
 
-# **CLASS TABLE QUERIES**
-# Print each table
-# SELECT Int, Int2 FROM ii_1000
-# SELECT Int, NumOne FROM i1_1000
-# SELECT Int1, Int2 FROM ii_10000
-# SELECT Int, NumOne FROM i1_10000
+        print(column_headers)
 
-# SELECT Int, NumOne FROM i1_10000 WHERE Int < 5
+        print('-' * len(column_headers))  # Print a separator line
 
-# --MERGE SORT JOIN-- (10,000 row & 10,000 row)
-# SELECT ii_10000.Int1, ii_10000.Int2, i1_10000.NumOne FROM ii_10000 JOIN i1_10000 ON ii_10000.Int1 = i1_10000.Int
+        # Print each row of data
 
-# --NESTED LOOP JOIN-- (10,000 row & 1,000 row)
-# SELECT ii_1000.Int, ii_1000.Int2, ii_10000.Int1 FROM ii_1000 JOIN ii_10000 ON ii_1000.Int2 = ii_10000.Int2
+        for row in rows:
+            row_data = [str(row[col]) for col in columns]
 
-# --INDICES-- (10,000 row & 1,000 row)
-# SELECT ii_1000.Int, ii_1000.Int2, ii_10000.Int1 FROM ii_1000 JOIN ii_10000 ON ii_1000.Int = ii_10000.Int1
+            print(' | '.join(row_data))
 
-while True:
-    query = input("Query: ")
 
-    if query.lower() == 'exit':
-        print("Exiting the program.")
-        break  # Exits the loop and terminates the program
+# Example usage
 
-    db.parse_sql(query)
+if __name__ == "__main__":
+    # Pass a database directory to keep the tables on disk between runs; the preloaded relations are
+    # only built the first time that directory is opened. Passing a snapshot file (SNAPSHOT TO) maps it
+    # instead, which skips the preload entirely.
+
+    if len(sys.argv) > 1 and os.path.isfile(sys.argv[1]):
+        db = RDBMS()
+        db.open_snapshot(sys.argv[1])
+    else:
+        db = RDBMS(sys.argv[1] if len(sys.argv) > 1 else None)
+
+    if not db.tables:
+        # CREATE THE NECESSARY PRE_LOADED TABLES
+        state1 = "CREATE TABLE ii_1000 (Int Integer, Int2 Integer, PRIMARY KEY (Int));"
+        db.parse_sql(state1)
+        # INSERT VALUES
+        ii_1000 = []
+        for i in range(1,1001):
+            ii_1000.append((i,i))
+        db.bulk_insert("ii_1000", ii_1000)
+
+        state = "CREATE TABLE i1_1000 (Int Integer, NumOne Integer, PRIMARY KEY (Int), FOREIGN KEY (Int) REFERENCES ii_1000(Int));"
+        db.parse_sql(state)
+        i1_1000 = []
+        for i in range(1,1001):
+            i1_1000.append((i,1))
+        db.bulk_insert("i1_1000", i1_1000)
+
+        db.create_table("ii_10000", {'Int1': 'Integer','Int2': 'Integer'})
+        ii_10000 = []
+        for i in range(1,10001):
+            ii_10000.append((i,i))
+        db.bulk_insert("ii_10000", ii_10000)
+
+        db.create_table("i1_10000", {'Int': 'Integer','NumOne': 'Integer'})
+        i1_10000 = []
+        for i in range(1,10001):
+            i1_10000.append((i,1))
+        db.bulk_insert("i1_10000", i1_10000)
+
+        # Pre-made Employee Details Table
+
+        employee_details_create = "CREATE TABLE EmployeeDetails (ID INTEGER, Name STRING, Department STRING, Salary FLOAT, PRIMARY KEY (ID)"
+
+        db.parse_sql(employee_details_create)
+
+        detail_insert = ("INSERT INTO EmployeeDetails (ID, Name, Department, Salary) VALUES "
+                         "(1, 'John Doe', 'HR', 50000), "
+                         "(2, 'Jane Smith', 'Marketing', 48000), "
+                         "(3, 'Bob Johnson', 'Finance', 55000), "
+                         "(4, 'Mary Wilson', 'Engineering', 62000), "
+                         "(5, 'David Brown', 'IT', 58000), "
+                         "(6, 'Lisa Jackson', 'Marketing', 49000), "
+                         "(7, 'Michael Jones', 'Finance', 56000), "
+                         "(8, 'Susan Miller', 'Engineering', 63000), "
+                         "(9, 'Richard Davis', 'IT', 59000), "
+                         "(10, 'Jennifer White', 'Marketing', 50000), "
+                         "(11, 'William Moore', 'Finance', 57000), "
+                         "(12, 'Patricia Harris', 'Engineering', 64000), "
+                         "(13, 'James Thomas', 'IT', 60000), "
+                         "(14, 'Elizabeth Martin', 'Marketing', 51000), "
+                         "(15, 'John Wilson', 'Finance', 58000), "
+                         "(16, 'Sarah Anderson', 'Engineering', 65000), "
+                         "(17, 'Robert Lewis', 'IT', 61000), "
+                         "(18, 'Linda Garcia', 'Marketing', 52000), "
+                         "(19, 'Daniel Martinez', 'Finance', 59000), "
+                         "(20, 'Karen Hernandez', 'Engineering', 66000)")
+
+        db.parse_sql(detail_insert)
+
+
+
+
+        # Pre-made Employee Contact Table
+        employee_contact_create = "CREATE TABLE EmployeeContactInfo (ID INTEGER, Email STRING, Phone String, PRIMARY KEY (Email), FOREIGN KEY (ID) REFERENCES EmployeeDetails(ID));"
+
+        db.parse_sql(employee_contact_create)
+
+        contact_insert = ("INSERT INTO EmployeeContactInfo (ID, Email, Phone) VALUES "
+                          "(1, 'john.doe@example.com', '(555) 123-4567'), "
+                          "(2, 'jane.smith@example.com', '(555) 234-5678'), "
+                          "(3, 'bob.johnson@example.com', '(555) 345-6789'), "
+                          "(4, 'mary.wilson@example.com', '(555) 456-7890'), "
+                          "(5, 'david.brown@example.com', '(555) 567-8901'), "
+                          "(6, 'lisa.jackson@example.com', '(555) 678-9012'), "
+                          "(7, 'michael.jones@example.com', '(555) 789-0123'), "
+                          "(8, 'susan.miller@example.com', '(555) 890-1234'), "
+                          "(9, 'richard.davis@example.com', '(555) 901-2345'), "
+                          "(10, 'jennifer.white@example.com', '(555) 012-3456'), "
+                          "(11, 'william.moore@example.com', '(555) 123-4567'), "
+                          "(12, 'patricia.harris@example.com', '(555) 234-5678'), "
+                          "(13, 'james.thomas@example.com', '(555) 345-6789'), "
+                          "(14, 'elizabeth.martin@example.com', '(555) 456-7890'), "
+                          "(15, 'john.wilson@example.com', '(555) 567-8901'), "
+                          "(16, 'sarah.anderson@example.com', '(555) 678-9012'), "
+                          "(17, 'robert.lewis@example.com', '(555) 789-0123'), "
+                          "(18, 'linda.garcia@example.com', '(555) 890-1234'), "
+                          "(19, 'daniel.martinez@example.com', '(555) 901-2345'), "
+                          "(20, 'karen.hernandez@example.com', '(555) 012-3456')")
+
+        db.parse_sql(contact_insert)
+
+
+    # ****QUERIES****
+    # --CREATE TABLE--
+    # CREATE TABLE EmployeeDetailsSample (ID INTEGER, Name STRING, Department STRING, Salary FLOAT, PRIMARY KEY (ID)
+    # INSERT INTO EmployeeDetailsSample (ID, Name, Department, Salary) VALUES (1, 'John Doe', 'HR', 50000)
+    # INSERT INTO EmployeeDetailsSample (ID, Name, Department, Salary) VALUES (2, 'Alex Henry', 'Marketing', 45000)
+    # SELECT * FROM EmployeeDetailsSample
+
+    # --W/ FOREIGN KEY--
+    # CREATE TABLE Projects (ProjectID INTEGER, EmployeeID Integer, PRIMARY KEY (ProjectID), FOREIGN KEY (EmployeeID) REFERENCES EmployeeDetailsSample(ID))
+    # INSERT INTO Projects (ProjectID, EmployeeID) VALUES (20, 1)
+    # SELECT ProjectID, EmployeeID FROM Projects
+
+    # FOREIGN KEY Violation
+    # INSERT INTO Projects (ProjectID, EmployeeID) VALUES (15, 3)
+    # PRIMARY KEY Violation
+    # INSERT INTO Projects (ProjectID, EmployeeID) VALUES (20, 2)
+
+    # --Preloaded Tables--
+    # SELECT ID, Name, Department, Salary FROM EmployeeDetails
+    # SELECT ID, Email, Phone FROM EmployeeContactInfo
+
+    # Testing Primary Key
+    # INSERT INTO EmployeeDetails (ID, Name, Department, Salary) VALUES (17, 'John Doe', 'HR', 50000)
+
+    # --Aggregate Operators--
+    # SELECT MAX(Salary) FROM EmployeeDetails (correct number = 66000.0)
+    # SELECT MIN(Salary) FROM EmployeeDetails (correct number = 48000.0)
+    # SELECT SUM(Salary) FROM EmployeeDetails (correct number = 1143000.0)
+    # SELECT AVG(Salary) FROM EmployeeDetails (correct number = 57150.0)
+    # SELECT COUNT(Name) FROM EmployeeDetails (correct number = 20)
+
+    # --WHERE and Logical Operators--
+    # SELECT ID, Name, Department FROM EmployeeDetails WHERE Department = 'Marketing'
+
+    # SELECT * FROM EmployeeDetails WHERE Salary > 55000 AND Department = 'Engineering'
+    # SELECT ID, Name, Department, Salary FROM EmployeeDetails WHERE Salary > 62000 OR Department = 'Marketing'
+    # SELECT ID, Name, Department, Salary FROM EmployeeDetails WHERE Salary > 62000 OR Department = 'Marketing' OR Name = 'Bob Johnson'
+    # SELECT ID, Name, Department, Salary FROM EmployeeDetails WHERE ID < 10 AND Salary < 58000 AND Department = 'Marketing'
+
+    # --DISTINCT--
+    # SELECT DISTINCT Department FROM EmployeeDetails
+
+    # --JOIN--
+    # SELECT EmployeeDetails.ID, EmployeeDetails.Name, EmployeeDetails.Department, EmployeeContactInfo.Email, FROM EmployeeDetails JOIN EmployeeContactInfo ON EmployeeDetails.ID = EmployeeContactInfo.ID
+    # --NATURAL JOIN--
+    # SELECT EmployeeDetails.ID, EmployeeDetails.Name, EmployeeDetails.Department, EmployeeDetails.Salary, EmployeeContactInfo.Email, EmployeeContactInfo.Phone FROM EmployeeDetails NATURAL JOIN EmployeeContactInfo
+    # SELECT EmployeeDetails.ID, EmployeeDetails.Name, EmployeeDetails.Department, EmployeeContactInfo.Email, FROM EmployeeDetails JOIN EmployeeContactInfo ON EmployeeDetails.ID = EmployeeContactInfo.ID
+
+    # --UPDATE--
+    # UPDATE EmployeeDetails SET Department = 'IT' WHERE ID = 3
+    # UPDATE EmployeeDetails SET Department = 'Engineering' WHERE Name = 'John Doe' OR Salary < 50000
+
+    # --DELETE--
+    # DELETE FROM EmployeeDetails WHERE ID > 9
+    # DELETE FROM EmployeeDetails WHERE Department = 'Engineering' AND Salary < 60000
+
+    # **PRINT**
+    # SELECT ID, Name, Department, Salary FROM EmployeeDetails
+
+    # **CLASS TABLE QUERIES**
+    # Print each table
+    # SELECT Int, Int2 FROM ii_1000
+    # SELECT Int, NumOne FROM i1_1000
+    # SELECT Int1, Int2 FROM ii_10000
+    # SELECT Int, NumOne FROM i1_10000
+
+    # SELECT Int, NumOne FROM i1_10000 WHERE Int < 5
+
+    # --MERGE SORT JOIN-- (10,000 row & 10,000 row)
+    # SELECT ii_10000.Int1, ii_10000.Int2, i1_10000.NumOne FROM ii_10000 JOIN i1_10000 ON ii_10000.Int1 = i1_10000.Int
+
+    # --NESTED LOOP JOIN-- (10,000 row & 1,000 row)
+    # SELECT ii_1000.Int, ii_1000.Int2, ii_10000.Int1 FROM ii_1000 JOIN ii_10000 ON ii_1000.Int2 = ii_10000.Int2
+
+    # --INDICES-- (10,000 row & 1,000 row)
+    # SELECT ii_1000.Int, ii_1000.Int2, ii_10000.Int1 FROM ii_1000 JOIN ii_10000 ON ii_1000.Int = ii_10000.Int1
+
+    while True:
+        query = input("Query: ")
+
+        if query.lower() == 'exit':
+            db.close()
+            print("Exiting the program.")
+            break  # Exits the loop and terminates the program
+
+        db.parse_sql(query)
@@ -9,30 +9,26 @@ db.parse_sql(state1)
 ii_1000 = []
 for i in range(1,1001):
     ii_1000.append((i,i))
-for i in ii_1000:
-    db.insert("ii_1000", i)
+db.bulk_insert("ii_1000", ii_1000)
 
 state = "CREATE TABLE i1_1000 (Int Integer, NumOne Integer, PRIMARY KEY (Int), FOREIGN KEY (Int) REFERENCES ii_1000(Int));"
 db.parse_sql(state)
 i1_1000 = []
 for i in range(1,1001):
     i1_1000.append((i,1))
-for i in i1_1000:
-    db.insert("i1_1000", i)
+db.bulk_insert("i1_1000", i1_1000)
 
 db.create_table("ii_10000", {'Int1': 'Integer','Int2': 'Integer'})
 ii_10000 = []
 for i in range(1,10001):
     ii_10000.append((i,i))
-for i in ii_10000:
-    db.insert("ii_10000", i)
+db.bulk_insert("ii_10000", ii_10000)
 
 db.create_table("i1_10000", {'Int': 'Integer','NumOne': 'Integer'})
 i1_10000 = []
 for i in range(1,10001):
     i1_10000.append((i,1))
-for i in i1_10000:
-    db.insert("i1_10000", i)
+db.bulk_insert("i1_10000", i1_10000)
 
 # Pre-made Employee Details Table
 
@@ -40,85 +36,29 @@ employee_details_create = "CREATE TABLE EmployeeDetails (ID INTEGER, Name STRING
 
 db.parse_sql(employee_details_create)
 
-detail_insert1 = "INSERT INTO EmployeeDetails (ID, Name, Department, Salary) VALUES (1, 'John Doe', 'HR', 50000)"
-
-detail_insert2 = "INSERT INTO EmployeeDetails (ID, Name, Department, Salary) VALUES (2, 'Jane Smith', 'Marketing', 48000)"
-
-detail_insert3 = "INSERT INTO EmployeeDetails (ID, Name, Department, Salary) VALUES (3, 'Bob Johnson', 'Finance', 55000)"
-
-detail_insert4 = "INSERT INTO EmployeeDetails (ID, Name, Department, Salary) VALUES (4, 'Mary Wilson', 'Engineering', 62000)"
-
-detail_insert5 = "INSERT INTO EmployeeDetails (ID, Name, Department, Salary) VALUES (5, 'David Brown', 'IT', 58000)"
-
-detail_insert6 = "INSERT INTO EmployeeDetails (ID, Name, Department, Salary) VALUES (6, 'Lisa Jackson', 'Marketing', 49000)"
-
-detail_insert7 = "INSERT INTO EmployeeDetails (ID, Name, Department, Salary) VALUES (7, 'Michael Jones', 'Finance', 56000)"
-
-detail_insert8 = "INSERT INTO EmployeeDetails (ID, Name, Department, Salary) VALUES (8, 'Susan Miller', 'Engineering', 63000)"
-
-detail_insert9 = "INSERT INTO EmployeeDetails (ID, Name, Department, Salary) VALUES (9, 'Richard Davis', 'IT', 59000)"
-
-detail_insert10 = "INSERT INTO EmployeeDetails (ID, Name, Department, Salary) VALUES (10, 'Jennifer White', 'Marketing', 50000)"
-
-detail_insert11 = "INSERT INTO EmployeeDetails (ID, Name, Department, Salary) VALUES (11, 'William Moore', 'Finance', 57000)"
-
-detail_insert12 = "INSERT INTO EmployeeDetails (ID, Name, Department, Salary) VALUES (12, 'Patricia Harris', 'Engineering', 64000)"
-
-detail_insert13 = "INSERT INTO EmployeeDetails (ID, Name, Department, Salary) VALUES (13, 'James Thomas', 'IT', 60000)"
-
-detail_insert14 = "INSERT INTO EmployeeDetails (ID, Name, Department, Salary) VALUES (14, 'Elizabeth Martin', 'Marketing', 51000)"
-
-detail_insert15 = "INSERT INTO EmployeeDetails (ID, Name, Department, Salary) VALUES (15, 'John Wilson', 'Finance', 58000)"
-
-detail_insert16 = "INSERT INTO EmployeeDetails (ID, Name, Department, Salary) VALUES (16, 'Sarah Anderson', 'Engineering', 65000)"
-
-detail_insert17 = "INSERT INTO EmployeeDetails (ID, Name, Department, Salary) VALUES (17, 'Robert Lewis', 'IT', 61000)"
-
-detail_insert18 = "INSERT INTO EmployeeDetails (ID, Name, Department, Salary) VALUES (18, 'Linda Garcia', 'Marketing', 52000)"
-
-detail_insert19 = "INSERT INTO EmployeeDetails (ID, Name, Department, Salary) VALUES (19, 'Daniel Martinez', 'Finance', 59000)"
-
-detail_insert20 = "INSERT INTO EmployeeDetails (ID, Name, Department, Salary) VALUES (20, 'Karen Hernandez', 'Engineering', 66000)"
-
-db.parse_sql(detail_insert1)
-
-db.parse_sql(detail_insert2)
-
-db.parse_sql(detail_insert3)
-
-db.parse_sql(detail_insert4)
-
-db.parse_sql(detail_insert5)
-
-db.parse_sql(detail_insert6)
-
-db.parse_sql(detail_insert7)
-
-db.parse_sql(detail_insert8)
-
-db.parse_sql(detail_insert9)
-
-db.parse_sql(detail_insert10)
-
-db.parse_sql(detail_insert11)
-
-db.parse_sql(detail_insert12)
-
-db.parse_sql(detail_insert13)
-
-db.parse_sql(detail_insert14)
-
-db.parse_sql(detail_insert15)
-
-db.parse_sql(detail_insert16)
-
-db.parse_sql(detail_insert17)
-
-db.parse_sql(detail_insert18)
-
-db.parse_sql(detail_insert19)
-
-db.parse_sql(detail_insert20)
+detail_insert = ("INSERT INTO EmployeeDetails (ID, Name, Department, Salary) VALUES "
+                 "(1, 'John Doe', 'HR', 50000), "
+                 "(2, 'Jane Smith', 'Marketing', 48000), "
+                 "(3, 'Bob Johnson', 'Finance', 55000), "
+                 "(4, 'Mary Wilson', 'Engineering', 62000), "
+                 "(5, 'David Brown', 'IT', 58000), "
+                 "(6, 'Lisa Jackson', 'Marketing', 49000), "
+                 "(7, 'Michael Jones', 'Finance', 56000), "
+                 "(8, 'Susan Miller', 'Engineering', 63000), "
+                 "(9, 'Richard Davis', 'IT', 59000), "
+                 "(10, 'Jennifer White', 'Marketing', 50000), "
+                 "(11, 'William Moore', 'Finance', 57000), "
+                 "(12, 'Patricia Harris', 'Engineering', 64000), "
+                 "(13, 'James Thomas', 'IT', 60000), "
+                 "(14, 'Elizabeth Martin', 'Marketing', 51000), "
+                 "(15, 'John Wilson', 'Finance', 58000), "
+                 "(16, 'Sarah Anderson', 'Engineering', 65000), "
+                 "(17, 'Robert Lewis', 'IT', 61000), "
+                 "(18, 'Linda Garcia', 'Marketing', 52000), "
+                 "(19, 'Daniel Martinez', 'Finance', 59000), "
+                 "(20, 'Karen Hernandez', 'Engineering', 66000)")
+
+db.parse_sql(detail_insert)
 
 
 
@@ -130,85 +70,29 @@ employee_contact_create = "CREATE TABLE EmployeeContactInfo (ID INTEGER, Email S
 
 db.parse_sql(employee_contact_create)
 
-contact_insert1 = "INSERT INTO EmployeeContactInfo (ID, Email, Phone) VALUES (1, 'john.doe@example.com', '(555) 123-4567')"
-
-contact_insert2 = "INSERT INTO EmployeeContactInfo (ID, Email, Phone) VALUES (2, 'jane.smith@example.com', '(555) 234-5678')"
-
-contact_insert3 = "INSERT INTO EmployeeContactInfo (ID, Email, Phone) VALUES (3, 'bob.johnson@example.com', '(555) 345-6789')"
-
-contact_insert4 = "INSERT INTO EmployeeContactInfo (ID, Email, Phone) VALUES (4, 'mary.wilson@example.com', '(555) 456-7890')"
-
-contact_insert5 = "INSERT INTO EmployeeContactInfo (ID, Email, Phone) VALUES (5, 'david.brown@example.com', '(555) 567-8901')"
-
-contact_insert6 = "INSERT INTO EmployeeContactInfo (ID, Email, Phone) VALUES (6, 'lisa.jackson@example.com', '(555) 678-9012')"
-
-contact_insert7 = "INSERT INTO EmployeeContactInfo (ID, Email, Phone) VALUES (7, 'michael.jones@example.com', '(555) 789-0123')"
-
-contact_insert8 = "INSERT INTO EmployeeContactInfo (ID, Email, Phone) VALUES (8, 'susan.miller@example.com', '(555) 890-1234')"
-
-contact_insert9 = "INSERT INTO EmployeeContactInfo (ID, Email, Phone) VALUES (9, 'richard.davis@example.com', '(555) 901-2345')"
-
-contact_insert10 = "INSERT INTO EmployeeContactInfo (ID, Email, Phone) VALUES (10, 'jennifer.white@example.com', '(555) 012-3456')"
-
-contact_insert11 = "INSERT INTO EmployeeContactInfo (ID, Email, Phone) VALUES (11, 'william.moore@example.com', '(555) 123-4567')"
-
-contact_insert12 = "INSERT INTO EmployeeContactInfo (ID, Email, Phone) VALUES (12, 'patricia.harris@example.com', '(555) 234-5678')"
-
-contact_insert13 = "INSERT INTO EmployeeContactInfo (ID, Email, Phone) VALUES (13, 'james.thomas@example.com', '(555) 345-6789')"
-
-contact_insert14 = "INSERT INTO EmployeeContactInfo (ID, Email, Phone) VALUES (14, 'elizabeth.martin@example.com', '(555) 456-7890')"
-
-contact_insert15 = "INSERT INTO EmployeeContactInfo (ID, Email, Phone) VALUES (15, 'john.wilson@example.com', '(555) 567-8901')"
-
-contact_insert16 = "INSERT INTO EmployeeContactInfo (ID, Email, Phone) VALUES (16, 'sarah.anderson@example.com', '(555) 678-9012')"
-
-contact_insert17 = "INSERT INTO EmployeeContactInfo (ID, Email, Phone) VALUES (17, 'robert.lewis@example.com', '(555) 789-0123')"
-
-contact_insert18 = "INSERT INTO EmployeeContactInfo (ID, Email, Phone) VALUES (18, 'linda.garcia@example.com', '(555) 890-1234')"
-
-contact_insert19 = "INSERT INTO EmployeeContactInfo (ID, Email, Phone) VALUES (19, 'daniel.martinez@example.com', '(555) 901-2345')"
-
-contact_insert20 = "INSERT INTO EmployeeContactInfo (ID, Email, Phone) VALUES (20, 'karen.hernandez@example.com', '(555) 012-3456')"
-
-db.parse_sql(contact_insert1)
-
-db.parse_sql(contact_insert2)
-
-db.parse_sql(contact_insert3)
-
-db.parse_sql(contact_insert4)
-
-db.parse_sql(contact_insert5)
-
-db.parse_sql(contact_insert6)
-
-db.parse_sql(contact_insert7)
-
-db.parse_sql(contact_insert8)
-
-db.parse_sql(contact_insert9)
-
-db.parse_sql(contact_insert10)
-
-db.parse_sql(contact_insert11)
-
-db.parse_sql(contact_insert12)
-
-db.parse_sql(contact_insert13)
-
-db.parse_sql(contact_insert14)
-
-db.parse_sql(contact_insert15)
-
-db.parse_sql(contact_insert16)
-
-db.parse_sql(contact_insert17)
-
-db.parse_sql(contact_insert18)
-
-db.parse_sql(contact_insert19)
-
-db.parse_sql(contact_insert20)
+contact_insert = ("INSERT INTO EmployeeContactInfo (ID, Email, Phone) VALUES "
+                  "(1, 'john.doe@example.com', '(555) 123-4567'), "
+                  "(2, 'jane.smith@example.com', '(555) 234-5678'), "
+                  "(3, 'bob.johnson@example.com', '(555) 345-6789'), "
+                  "(4, 'mary.wilson@example.com', '(555) 456-7890'), "
+                  "(5, 'david.brown@example.com', '(555) 567-8901'), "
+                  "(6, 'lisa.jackson@example.com', '(555) 678-9012'), "
+                  "(7, 'michael.jones@example.com', '(555) 789-0123'), "
+                  "(8, 'susan.miller@example.com', '(555) 890-1234'), "
+                  "(9, 'richard.davis@example.com', '(555) 901-2345'), "
+                  "(10, 'jennifer.white@example.com', '(555) 012-3456'), "
+                  "(11, 'william.moore@example.com', '(555) 123-4567'), "
+                  "(12, 'patricia.harris@example.com', '(555) 234-5678'), "
+                  "(13, 'james.thomas@example.com', '(555) 345-6789'), "
+                  "(14, 'elizabeth.martin@example.com', '(555) 456-7890'), "
+                  "(15, 'john.wilson@example.com', '(555) 567-8901'), "
+                  "(16, 'sarah.anderson@example.com', '(555) 678-9012'), "
+                  "(17, 'robert.lewis@example.com', '(555) 789-0123'), "
+                  "(18, 'linda.garcia@example.com', '(555) 890-1234'), "
+                  "(19, 'daniel.martinez@example.com', '(555) 901-2345'), "
+                  "(20, 'karen.hernandez@example.com', '(555) 012-3456')")
+
+db.parse_sql(contact_insert)
 
 # ****QUERIES****
 # --CREATE TABLE--
@@ -0,0 +1,332 @@
+import contextlib
+import csv
+import io
+import os
+import random
+import shutil
+import tempfile
+import time
+import tracemalloc
+from array import array
+
+from BTrees.OOBTree import OOBTree
+
+from DBMS8 import RDBMS
+
+# Benchmarks for the on-disk storage engine. Each one runs against a scratch database directory
+# that is removed afterwards. Run with: python benchmarks.py
+
+
+def load_ii_10000(db):
+    # The ii_10000 load as Pre_loaded_relations.py used to do it, one INSERT (and one commit) per row
+    db.create_table("ii_10000", {'Int1': 'Integer','Int2': 'Integer'})
+    ii_10000 = []
+    for i in range(1,10001):
+        ii_10000.append((i,i))
+    for i in ii_10000:
+        db.insert("ii_10000", i)
+
+
+def insert_throughput(async_commit_delay):
+    database_dir = tempfile.mkdtemp(prefix="dbms_bench_")
+    try:
+        db = RDBMS(database_dir, async_commit_delay=async_commit_delay)
+        start_time = time.time()
+        load_ii_10000(db)
+        db.wal.sync()
+        elapsed = time.time() - start_time
+        syncs = db.wal.syncs
+        db.close()
+    finally:
+        shutil.rmtree(database_dir, ignore_errors=True)
+    return elapsed, syncs
+
+
+def benchmark_async_commit():
+    # The asynchronous commits return before their records are durable: the gain is the fsync each
+    # commit no longer waits for, bought with the commits a crash can lose
+    print("INSERT throughput, ii_10000 (10,000 single-row inserts)")
+    for label, delay in (("fsync per commit", 0), ("async commit", 0.005)):
+        elapsed, syncs = insert_throughput(delay)
+        print(f"  {label:<18} {10000 / elapsed:>10.0f} rows/s  {elapsed:.3f} s  {syncs} fsyncs")
+
+
+def bulk_load_throughput(method, csv_path):
+    database_dir = tempfile.mkdtemp(prefix="dbms_bench_")
+    try:
+        db = RDBMS(database_dir)
+        db.create_table("ii_10000", {'Int1': 'Integer','Int2': 'Integer'})
+        start_time = time.time()
+        if method == "insert":
+            for i in range(1,10001):
+                db.insert("ii_10000", (i,i))
+        elif method == "bulk_insert":
+            db.bulk_insert("ii_10000", [(i,i) for i in range(1,10001)])
+        else:
+            db.parse_sql(f"COPY ii_10000 FROM '{csv_path}'")
+        db.wal.sync()
+        elapsed = time.time() - start_time
+        db.close()
+    finally:
+        shutil.rmtree(database_dir, ignore_errors=True)
+    return elapsed
+
+
+def benchmark_bulk_load():
+    csv_dir = tempfile.mkdtemp(prefix="dbms_bench_")
+    csv_path = os.path.join(csv_dir, "ii_10000.csv")
+    try:
+        with open(csv_path, "w", newline="") as csv_file:
+            csv.writer(csv_file).writerows((i,i) for i in range(1,10001))
+        results = [(method, bulk_load_throughput(method, csv_path)) for method in ("insert", "bulk_insert", "COPY")]
+    finally:
+        shutil.rmtree(csv_dir, ignore_errors=True)
+    print("Load throughput, ii_10000 (10,000 rows)")
+    for method, elapsed in results:
+        print(f"  {method:<18} {10000 / elapsed:>10.0f} rows/s  {elapsed:.3f} s  {results[0][1] / elapsed:.1f}x")
+
+
+JOIN_10000 = "SELECT ii_10000.Int1, ii_10000.Int2, i1_10000.NumOne FROM ii_10000 JOIN i1_10000 ON ii_10000.Int1 = i1_10000.Int"
+
+
+def index_probe_times(using):
+    # Time the 10k x 10k index join and 10,000 bare probes against an index of the given type on i1_10000.Int
+    db = RDBMS()
+    with contextlib.redirect_stdout(io.StringIO()):
+        db.create_table("ii_10000", {'Int1': 'Integer','Int2': 'Integer'})
+        db.bulk_insert("ii_10000", [(i,i) for i in range(1,10001)])
+        db.create_table("i1_10000", {'Int': 'Integer','NumOne': 'Integer'})
+        db.bulk_insert("i1_10000", [(i,1) for i in range(1,10001)])
+        db.create_index("i1_int", "i1_10000", ["Int"], using=using)
+        # The cost model would pick a hash join here, so the index nested loop is run by name
+        _, strategies = db.join_strategies("ii_10000", "i1_10000", ["Int1"], ["Int"])
+        strategy = next(strategy for strategy in strategies if strategy[2] == "index nested loop join")
+        start_time = time.time()
+        db.run_join(strategy, "ii_10000", "i1_10000", ["Int1"], ["Int"], "=", lambda row1, row2: row1 + row2)
+        join_elapsed = time.time() - start_time
+    index = db.tables["i1_10000"]["indexes"]["i1_int"]["index"]
+    keys = [(i,) for i in range(1,10001)]
+    start_time = time.time()
+    for key in keys:
+        index.get(key)
+    probe_elapsed = time.time() - start_time
+    return join_elapsed, probe_elapsed
+
+
+def benchmark_index_probes():
+    print("Index join, ii_10000 JOIN i1_10000 (10,000 probes)")
+    for using in ("btree", "hash"):
+        join_elapsed, probe_elapsed = index_probe_times(using)
+        print(f"  {using:<18} join {join_elapsed:.3f} s  probes {probe_elapsed / 10000 * 1e9:>6.0f} ns each")
+
+
+def benchmark_join_strategies():
+    # Run every strategy the cost model offers for two joins and set the time of each next to its estimated cost
+    db = RDBMS()
+    with contextlib.redirect_stdout(io.StringIO()):
+        db.create_table("ii_1000", {'Int1': 'Integer','Int2': 'Integer'})
+        db.bulk_insert("ii_1000", [(i,i) for i in range(1,1001)])
+        db.create_table("ii_100000", {'Int1': 'Integer','Int2': 'Integer'})
+        db.bulk_insert("ii_100000", [(i,i) for i in range(1,100001)])
+        db.create_index("ii_int1", "ii_100000", ["Int1"])
+        db.create_table("i1_100000", {'Int': 'Integer','NumOne': 'Integer'})
+        db.bulk_insert("i1_100000", [(i,1) for i in range(1,100001)])
+    for table1_name, column1, table2_name, column2 in (("ii_100000", "Int1", "i1_100000", "Int"),
+                                                       ("ii_1000", "Int2", "ii_100000", "Int1")):
+        _, strategies = db.join_strategies(table1_name, table2_name, [column1], [column2])
+        print(f"Join strategies, {table1_name}.{column1} = {table2_name}.{column2}")
+        for position, strategy in enumerate(strategies):
+            if strategy[0] > 10**9:
+                print(f"  {strategy[2]:<24} cost {round(strategy[0]):>12}  skipped")
+                continue
+            start_time = time.time()
+            with contextlib.redirect_stdout(io.StringIO()):
+                db.run_join(strategy, table1_name, table2_name, [column1], [column2], "=", lambda row1, row2: row1 + row2)
+            elapsed = time.time() - start_time
+            print(f"  {strategy[2]:<24} cost {round(strategy[0]):>12}  {elapsed * 1000:>8.1f} ms{'  (chosen)' if position == 0 else ''}")
+
+
+def covering_scan_time(include):
+    # Time a range query on an on-disk ii_10000 whose index on Int1 does or does not include Int2
+    database_dir = tempfile.mkdtemp(prefix="dbms_bench_")
+    try:
+        db = RDBMS(database_dir)
+        with contextlib.redirect_stdout(io.StringIO()):
+            db.create_table("ii_10000", {'Int1': 'Integer','Int2': 'Integer'})
+            db.bulk_insert("ii_10000", [(i,i) for i in range(1,10001)])
+            db.create_index("ii_int1", "ii_10000", ["Int1"], include=["Int2"] if include else None)
+            db.checkpoint()
+            elapsed = 0
+            for _ in range(10):
+                # Start each query with none of the table's pages cached
+                db.buffer_pool.discard(db.tables["ii_10000"]["data"].heap)
+                start_time = time.time()
+                db.parse_sql("SELECT Int1, Int2 FROM ii_10000 WHERE Int1 > 5000")
+                elapsed += time.time() - start_time
+            db.close()
+    finally:
+        shutil.rmtree(database_dir, ignore_errors=True)
+    return elapsed / 10
+
+
+def benchmark_covering_index():
+    print("Range query on disk, cold buffer pool, SELECT Int1, Int2 FROM ii_10000 WHERE Int1 > 5000")
+    for label, include in (("index on Int1", False), ("INCLUDE (Int2)", True)):
+        print(f"  {label:<18} {covering_scan_time(include) * 1000:>8.1f} ms")
+
+
+def bitmap_match_time(using):
+    # Time three-way AND and OR conditions over 100,000 rows with or without bitmap indexes on the columns
+    db = RDBMS()
+    departments = ["Engineering", "Sales", "Marketing", "HR"]
+    with contextlib.redirect_stdout(io.StringIO()):
+        db.create_table("staff", {'ID': 'Integer', 'Department': 'String', 'Grade': 'Integer', 'Office': 'Integer'})
+        db.bulk_insert("staff", [(i, departments[i % 4], i % 7, i % 5) for i in range(100000)])
+        if using:
+            for column in ("Department", "Grade", "Office"):
+                db.create_index(f"staff_{column}", "staff", [column], using=using)
+    conditions = [("Department", "=", "Engineering"), ("Grade", "<", 3), ("Office", "!=", 4)]
+    timings = []
+    for logical_operator in ("AND", "OR"):
+        start_time = time.time()
+        for _ in range(10):
+            db.match_rows("staff", conditions, logical_operator)
+        timings.append((time.time() - start_time) / 10)
+    return timings
+
+
+def benchmark_bitmap_index():
+    print("Three conditions over 100,000 rows (Department = ..., Grade < 3, Office != 4)")
+    for label, using in (("column scans", None), ("bitmap indexes", "bitmap")):
+        and_elapsed, or_elapsed = bitmap_match_time(using)
+        print(f"  {label:<18} AND {and_elapsed * 1000:>7.1f} ms  OR {or_elapsed * 1000:>7.1f} ms")
+
+
+def traced_build(build):
+    # (structure, bytes allocated while building it)
+    tracemalloc.start()
+    structure = build()
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return structure, allocated
+
+
+def benchmark_integer_index():
+    # The unique index on ii_100000.Int1 as an IntegerBTree against the tuple-keyed OOBTree it replaces
+    db = RDBMS()
+    with contextlib.redirect_stdout(io.StringIO()):
+        db.create_table("ii_100000", {'Int1': 'Integer','Int2': 'Integer'})
+        db.bulk_insert("ii_100000", [(i,i) for i in range(1,100001)])
+    integer_index, integer_bytes = traced_build(lambda: db.build_index("ii_100000", ["Int1"]))
+
+    def build_tuple_index():
+        index = OOBTree()
+        index.update([((key,), array('q', [row_id])) for row_id, key in enumerate(db.tables["ii_100000"]["data"].column_values("Int1"))])
+        return index
+
+    tuple_index, tuple_bytes = traced_build(build_tuple_index)
+    keys = [(i,) for i in range(1,100001)]
+    print("Unique index on ii_100000.Int1 (100,000 keys)")
+    for label, index, allocated in (("OOBTree (tuples)", tuple_index, tuple_bytes), ("IntegerBTree", integer_index, integer_bytes)):
+        start_time = time.time()
+        for key in keys:
+            index.get(key)
+        elapsed = time.time() - start_time
+        print(f"  {label:<18} {allocated / 2 ** 20:>6.1f} MiB  probes {elapsed / len(keys) * 1e9:>6.0f} ns each")
+
+
+def benchmark_index_build():
+    # CREATE INDEX on a populated million-row table: one sort against adding the rows one at a time
+    db = RDBMS()
+    keys = list(range(1000000))
+    random.Random(0).shuffle(keys)
+    with contextlib.redirect_stdout(io.StringIO()):
+        db.create_table("ii_1000000", {'Int1': 'Integer','Int2': 'Integer'})
+        db.bulk_insert("ii_1000000", [(key, key % 1000) for key in keys])
+    print("CREATE INDEX on ii_1000000 (1,000,000 rows)")
+    for column in ("Int1", "Int2"):
+        start_time = time.time()
+        index = db.build_index("ii_1000000", [column])
+        sorted_elapsed = time.time() - start_time
+        index = type(index)()
+        position = db.tables["ii_1000000"]["catalog"][column]
+        start_time = time.time()
+        for row_id, row in enumerate(db.tables["ii_1000000"]["data"].rows()):
+            db.add_index_entry(index, (row[position],), row_id)
+        insert_elapsed = time.time() - start_time
+        print(f"  {column:<18} sorted build {sorted_elapsed:.2f} s  row at a time {insert_elapsed:.2f} s")
+
+
+def zone_scan_times(database_dir):
+    # Time range scans selecting the top 1% of the ascending Int1 and of the shuffled Int2 of a 100,000-row table.
+    # One scan of each column first builds its zone map.
+    db = RDBMS(database_dir)
+    keys = list(range(1,100001))
+    random.Random(0).shuffle(keys)
+    with contextlib.redirect_stdout(io.StringIO()):
+        db.create_table("ii_100000", {'Int1': 'Integer','Int2': 'Integer'})
+        db.bulk_insert("ii_100000", [(i,key) for i, key in zip(range(1,100001), keys)])
+    timings = []
+    for column in ("Int1", "Int2"):
+        conditions = [(column, ">", 99000)]
+        db.match_rows("ii_100000", conditions)
+        start_time = time.time()
+        for _ in range(10):
+            db.match_rows("ii_100000", conditions)
+        timings.append((time.time() - start_time) / 10)
+    with contextlib.redirect_stdout(io.StringIO()):
+        db.close()
+    return timings
+
+
+def benchmark_zone_maps():
+    print("Unindexed range scan, ii_100000 WHERE ... > 99000 (1,000 rows)")
+    for storage in ("in memory", "on disk"):
+        database_dir = tempfile.mkdtemp(prefix="dbms_bench_") if storage == "on disk" else None
+        try:
+            ascending_elapsed, shuffled_elapsed = zone_scan_times(database_dir)
+        finally:
+            if database_dir:
+                shutil.rmtree(database_dir, ignore_errors=True)
+        print(f"  {storage:<18} ascending Int1 {ascending_elapsed * 1000:>7.2f} ms  shuffled Int2 {shuffled_elapsed * 1000:>7.2f} ms")
+
+
+def benchmark_selectivity():
+    # find_selectivity on ii_100000.Int1 from the kept statistics, against the set of every value it used to build.
+    # The first estimate gathers the statistics (the cold cost), which the insert after it keeps current.
+    db = RDBMS()
+    with contextlib.redirect_stdout(io.StringIO()):
+        db.create_table("ii_100000", {'Int1': 'Integer','Int2': 'Integer'})
+        db.bulk_insert("ii_100000", [(i,i) for i in range(1,100001)])
+    start_time = time.time()
+    db.find_selectivity("ii_100000", "Int1")
+    first_elapsed = time.time() - start_time
+    start_time = time.time()
+    for _ in range(1000):
+        db.find_selectivity("ii_100000", "Int1")
+    kept_elapsed = (time.time() - start_time) / 1000
+    start_time = time.time()
+    with contextlib.redirect_stdout(io.StringIO()):
+        db.insert("ii_100000", (100001, 100001))
+    insert_elapsed = time.time() - start_time
+    start_time = time.time()
+    len(set(db.tables["ii_100000"]["data"].column_values("Int1")))
+    scan_elapsed = time.time() - start_time
+    print("Selectivity estimate, ii_100000.Int1 (100,000 distinct values)")
+    print(f"  {'set of the column':<18} {scan_elapsed * 1000:>9.3f} ms")
+    print(f"  {'first estimate':<18} {first_elapsed * 1000:>9.3f} ms")
+    print(f"  {'later estimates':<18} {kept_elapsed * 1000:>9.3f} ms")
+    print(f"  {'next insert':<18} {insert_elapsed * 1000:>9.3f} ms")
+
+
+if __name__ == "__main__":
+    benchmark_async_commit()
+    benchmark_bulk_load()
+    benchmark_index_probes()
+    benchmark_join_strategies()
+    benchmark_covering_index()
+    benchmark_bitmap_index()
+    benchmark_integer_index()
+    benchmark_index_build()
+    benchmark_zone_maps()
+    benchmark_selectivity()
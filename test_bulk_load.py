@@ -0,0 +1,42 @@
+from DBMS8 import RDBMS
+
+# Malformed CSV rows are skipped with their line number, and the rest of the file still loads.
+# Run with: python -m pytest test_bulk_load.py
+
+
+def test_copy_skips_malformed_rows(tmp_path, capsys):
+    db = RDBMS()
+    db.create_table("people", {'ID': 'Integer', 'Name': 'String'})
+    db.parse_sql("CREATE UNIQUE INDEX people_id ON people (ID)")
+    csv_path = tmp_path / "people.csv"
+    lines = ["ID,Name"] + [f"{i},name{i}" for i in range(20)]
+    lines[5] = "4"
+    lines[12] = "eleven,name11"
+    csv_path.write_text("\n".join(lines) + "\n")
+    capsys.readouterr()
+
+    db.parse_sql(f"COPY people FROM '{csv_path}' HEADER")
+
+    output = capsys.readouterr().out
+    assert "Skipping row 6: Value count does not match column count." in output
+    assert "Skipping row 13: Invalid value for column ID: eleven" in output
+    assert "Copied 18 rows into people." in output
+    ids = sorted(db.tables["people"]["data"].column_values("ID"))
+    assert ids == [i for i in range(20) if i not in (4, 11)]
+    assert sorted(key for (key,) in db.tables["people"]["indexes"]["people_id"]["index"].keys()) == ids
+
+
+def test_bulk_insert_skips_malformed_rows_across_chunks(capsys):
+    db = RDBMS()
+    db.create_table("numbers", {'Int1': 'Integer', 'Int2': 'Integer'})
+    rows = [(i, i) for i in range(30)]
+    rows[4] = (4,)
+    rows[25] = ("x", 25)
+
+    loaded = db.bulk_insert("numbers", rows, chunk_rows=10)
+
+    output = capsys.readouterr().out
+    assert loaded == 28
+    assert "Skipping row 5: Value count does not match column count." in output
+    assert "Skipping row 26: Invalid value for column Int1: x" in output
+    assert len(db.tables["numbers"]["data"]) == 28